@@ -0,0 +1,178 @@
+"""
+Batch RC beam design from a table of beams, written out as a beam schedule.
+
+    python batch_beam.py beams.xlsx -o schedule.csv --workers 4
+
+Each input row is one beam. Required columns: B, D, hf, length, Sn (cm),
+BeamCondition ('Interior Beam' or 'Exterior Beam'), fc, fy (kgf/cm2),
+Mu_left_minus, Mu_left_plus, Mu_mid_minus, Mu_mid_plus, Mu_rght_minus,
+Mu_rght_plus (tf-m) and Vg_left, Vg_mid, Vg_rght (tf). Optional: id,
+CTbeam, cnstrctblty ('yes'/'no'). Beams are designed with design_beam on a
+ProcessPoolExecutor, and a line is reported as each beam finishes.
+"""
+import argparse
+import math
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor,as_completed
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from rc_beamdsgn_base import BeamDsgnSpec,design_beam
+from tracing import traced
+
+SPEC_COLUMNS=["B","D","hf","length","Sn","BeamCondition","fc","fy"]
+MOMENT_COLUMNS=["Mu_left_minus","Mu_left_plus","Mu_mid_minus","Mu_mid_plus","Mu_rght_minus","Mu_rght_plus"]
+SHEAR_COLUMNS=["Vg_left","Vg_mid","Vg_rght"]
+#鋼筋表欄位, 依 dsgn_barnum 順序 (左-, 左+, 中-, 中+, 右-, 右+)
+BAR_COLUMNS=["left_top","left_bottom","mid_top","mid_bottom","right_top","right_bottom"]
+
+
+def read_table(path):
+    ext=os.path.splitext(path)[1].lower()
+    if ext in ('.xlsx','.xls') :
+        return pd.read_excel(path)
+    return pd.read_csv(path)
+
+
+def write_table(df,path):
+    ext=os.path.splitext(path)[1].lower()
+    if ext in ('.xlsx','.xls') :
+        df.to_excel(path,index=False)
+    else :
+        df.to_csv(path,index=False)
+
+
+def get_beam_spec(row):
+    def flag(name):
+        value=row.get(name,'no')
+        return 'no' if pd.isna(value) else str(value).strip().lower()
+    return BeamDsgnSpec(B=float(row["B"]),
+                        D=float(row["D"]),
+                        hf=float(row["hf"]),
+                        length=float(row["length"]),
+                        Sn=float(row["Sn"]),
+                        BeamCondition=str(row["BeamCondition"]),
+                        fc=float(row["fc"]),
+                        fy=float(row["fy"]),
+                        Mu=tuple(float(row[col]) for col in MOMENT_COLUMNS),
+                        Vg=tuple(float(row[col]) for col in SHEAR_COLUMNS),
+                        CTbeam=flag("CTbeam"),
+                        cnstrctblty=flag("cnstrctblty"))
+
+
+@traced
+def design_schedule_row(spec):
+    """Design one beam and return its schedule entry as a dict."""
+    r=design_beam(spec)
+    n_per_row=r.barinfo[r.choose_bar][2]
+    entry={"bar":r.choose_bar}
+    for col,n in zip(BAR_COLUMNS,r.dsgn_barnum) :
+        entry[col]=str(n)+'-'+r.choose_bar
+        entry[col+"_rows"]=1 if n<=n_per_row else 2
+    entry["flexure_ratio"]=round(max(abs(Mu)/phiMn for Mu,phiMn in zip(spec.Mu,r.phiMn_all)),3)
+    entry["min_et"]=round(min(r.et_all),5)
+    entry["Ve"]=round(r.Ve,2)
+    entry["Vu_nhinge"]=round(r.Vu_nhinge,2)
+    #箍筋: 支數-號數@間距(mm)
+    entry["hinge_stirrup"]=f"{r.choose_stirrup_num[0]}-{r.choose_stirrup[0]}@{r.s_dsgn_all[0]:g}"
+    entry["mid_stirrup"]=f"{r.choose_stirrup_num[1]}-{r.choose_stirrup[1]}@{r.s_dsgn_all[1]:g}"
+    entry["development_length"]=round(r.dvlpmnt_length,1)
+    entry["steel_weight"]=round(r.bar_options[0].weight,1) if r.bar_options else math.nan
+    return entry
+
+
+def _design_task(key,spec):
+    #工作程序內執行, 單根梁失敗不中斷整批
+    try :
+        return key,design_schedule_row(spec),""
+    except Exception as e :
+        return key,{},f"{type(e).__name__}: {e}"
+
+
+def run_batch(table,workers=None,progress=None):
+    """Design every beam of a table and return the schedule table.
+
+    workers=1 runs in the calling process. Otherwise each beam is a task on
+    a ProcessPoolExecutor. progress(done, total, beam_id, error) is called
+    as each beam finishes, in completion order. A beam with a blank input
+    is not designed and gets the missing columns in the error column.
+    """
+    table=table.reset_index(drop=True)
+    if "id" not in table.columns :
+        table["id"]=table.index+1
+    tasks=[]
+    entries={}
+    errors={}
+    required=[col for col in SPEC_COLUMNS+MOMENT_COLUMNS+SHEAR_COLUMNS if col in table.columns]
+    blank=table[required].isna()
+    for key in table.index[blank.any(axis=1)] :
+        errors[key]="ValueError: missing "+", ".join(blank.columns[blank.loc[key]])
+    for key,row in table.drop(index=list(errors)).iterrows() :
+        try :
+            tasks.append((key,get_beam_spec(row)))
+        except (KeyError,TypeError,ValueError) as e :
+            errors[key]=f"{type(e).__name__}: {e}"
+    total=len(table)
+    done=0
+
+    def report(key,entry,error):
+        nonlocal done
+        done+=1
+        entries[key]=entry
+        if error :
+            errors[key]=error
+        if progress is not None :
+            progress(done,total,table.at[key,"id"],error)
+
+    for key in list(errors) :
+        report(key,{},errors[key])
+    if workers is None :
+        workers=os.cpu_count() or 1
+    if workers==1 or len(tasks)<=1 :
+        for key,spec in tasks :
+            report(*_design_task(key,spec))
+    else :
+        with ProcessPoolExecutor(max_workers=workers) as executor :
+            futures=[executor.submit(_design_task,key,spec) for key,spec in tasks]
+            for future in as_completed(futures) :
+                report(*future.result())
+
+    columns=["id"]+[col for col in SPEC_COLUMNS+MOMENT_COLUMNS+SHEAR_COLUMNS if col in table.columns]
+    schedule=table[columns].copy()
+    designed=pd.DataFrame.from_dict(entries,orient="index").reindex(schedule.index)
+    schedule=pd.concat([schedule,designed],axis=1)
+    for col in BAR_COLUMNS :
+        if col+"_rows" in schedule.columns :
+            schedule[col+"_rows"]=schedule[col+"_rows"].astype("Int64")
+    schedule["error"]=[errors.get(key,"") for key in schedule.index]
+    return schedule
+
+
+def main(argv=None):
+    parser=argparse.ArgumentParser(description="Batch RC beam design schedule")
+    parser.add_argument("input",help="CSV or Excel table of beams")
+    parser.add_argument("-o","--output",default="beam_schedule.csv",help="CSV or Excel schedule")
+    parser.add_argument("--workers",type=int,default=None,help="worker processes (default: CPU count)")
+    parser.add_argument("--quiet",action="store_true",help="do not report each beam")
+    args=parser.parse_args(argv)
+
+    table=read_table(args.input)
+    missing=[col for col in SPEC_COLUMNS+MOMENT_COLUMNS+SHEAR_COLUMNS if col not in table.columns]
+    if missing :
+        parser.error("missing columns: "+", ".join(missing))
+
+    def progress(done,total,beam_id,error):
+        status="failed: "+error if error else "ok"
+        print(f"[{done}/{total}] {beam_id} {status}",file=sys.stderr,flush=True)
+
+    schedule=run_batch(table,args.workers,None if args.quiet else progress)
+    write_table(schedule,args.output)
+    n_fail=int((schedule["error"]!="").sum())
+    print(f"{len(schedule)} beams designed, {n_fail} failed -> {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
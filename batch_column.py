@@ -0,0 +1,159 @@
+"""
+Batch RC column check from a table of sections and load cases.
+
+    python batch_column.py columns.csv -o results.csv --workers 4
+
+Each input row is one load case on one column section. Required columns:
+B, D (cm), fc, fy (kgf/cm2), bar1, bar2 (e.g. '#8(D25)'), Nx, Ny,
+stirrup_size, stirrup_num (legs or stirrup text), stirrup_span (cm),
+Pu (tf), Mux, Muy (tf-m). Optional: id, case. Rows sharing a section are
+checked together on one interaction surface, and sections are spread over
+a ProcessPoolExecutor. Rows that cannot be checked are reported in the
+error column.
+"""
+import argparse
+import math
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from beam_function import stirrup_info
+from column_function import get_column_rebar_layout
+from pmm_surface import get_pmm_surface,check_load_combinations
+from rc_columncal_base import get_column_shear_capacity
+from tracing import traced
+
+SECTION_COLUMNS=["B","D","fc","fy","bar1","bar2","Nx","Ny","stirrup_size","stirrup_num","stirrup_span"]
+LOAD_COLUMNS=["Pu","Mux","Muy"]
+
+
+def read_table(path):
+    ext=os.path.splitext(path)[1].lower()
+    if ext in ('.parquet','.pq') :
+        return pd.read_parquet(path)
+    return pd.read_csv(path)
+
+
+def write_table(df,path):
+    ext=os.path.splitext(path)[1].lower()
+    if ext in ('.parquet','.pq') :
+        df.to_parquet(path,index=False)
+    else :
+        df.to_csv(path,index=False)
+
+
+def get_stirrup_legs(value):
+    try :
+        return int(value)
+    except (TypeError,ValueError) :
+        return stirrup_info(value)
+
+
+@traced
+def check_column_section(section,loads):
+    """Check all load rows of one section. Returns one result row per load."""
+    B=float(section["B"])
+    D=float(section["D"])
+    fc=float(section["fc"])
+    fy=float(section["fy"])
+    layout=get_column_rebar_layout(B,D,section["bar1"],section["bar2"],int(section["Nx"]),int(section["Ny"]),
+                                   section["stirrup_size"])
+    surface=get_pmm_surface(B,D,fc,fy,layout)
+    result=check_load_combinations(surface,loads[LOAD_COLUMNS].to_numpy(dtype=float))
+    [phiVnx,phiVny]=get_column_shear_capacity(B,D,fc,fy,section["bar1"],section["bar2"],section["stirrup_size"],
+                                              get_stirrup_legs(section["stirrup_num"]),float(section["stirrup_span"]))
+    result["phiVnx"]=round(phiVnx,2)
+    result["phiVny"]=round(phiVny,2)
+    result["Ast"]=round(layout.Ast,2)
+    result.index=loads.index
+    return result
+
+
+def _check_chunk(tasks):
+    #tasks: [(section dict, loads DataFrame), ...]; 單一斷面失敗不中斷整批
+    parts=[]
+    for section,loads in tasks :
+        try :
+            parts.append((loads.index,check_column_section(section,loads),""))
+        except Exception as e :
+            parts.append((loads.index,None,f"{type(e).__name__}: {e}"))
+    return parts
+
+
+def run_batch(table,workers=None,chunksize=None):
+    """Check every row of a column table and return the results table.
+
+    workers=1 runs in the calling process. Otherwise sections are grouped
+    into chunks of chunksize and mapped over a ProcessPoolExecutor. A row
+    with a blank input, or whose section cannot be checked, gets its
+    reason in the error column and no ratio; the other rows are still
+    checked.
+    """
+    table=table.reset_index(drop=True)
+    if "id" not in table.columns :
+        table["id"]=table.index+1
+    if "case" not in table.columns :
+        table["case"]=""
+    errors={}
+    blank=table[SECTION_COLUMNS+LOAD_COLUMNS].isna()
+    for key in table.index[blank.any(axis=1)] :
+        errors[key]="ValueError: missing "+", ".join(blank.columns[blank.loc[key]])
+    valid=table.drop(index=list(errors))
+    tasks=[(dict(zip(SECTION_COLUMNS,key)),group) for key,group in valid.groupby(SECTION_COLUMNS,sort=False,dropna=False)]
+    if workers is None :
+        workers=os.cpu_count() or 1
+    if chunksize is None :
+        chunksize=max(1,math.ceil(len(tasks)/(4*workers)))
+    chunks=[tasks[i:i+chunksize] for i in range(0,len(tasks),chunksize)]
+    if workers==1 or len(chunks)<=1 :
+        parts=[part for chunk in chunks for part in _check_chunk(chunk)]
+    else :
+        with ProcessPoolExecutor(max_workers=workers) as executor :
+            parts=[part for chunk_result in executor.map(_check_chunk,chunks) for part in chunk_result]
+    checked=[]
+    for index,result,error in parts :
+        if error :
+            errors.update(dict.fromkeys(index,error))
+        else :
+            checked.append(result)
+    results=table[["id","case"]+SECTION_COLUMNS+LOAD_COLUMNS].copy()
+    checked=pd.concat(checked) if checked else pd.DataFrame()
+    for col in ["phiMn","phiPn","pmm_ratio","phiVnx","phiVny","Ast"] :
+        results[col]=checked[col].reindex(results.index) if col in checked else math.nan
+    #每根柱 (id) 的控制載重組合, 只看有比值的列
+    rated=results.dropna(subset=["pmm_ratio"])
+    governing=rated.groupby("id")["pmm_ratio"].idxmax()
+    results["governing"]=False
+    results.loc[governing.values,"governing"]=True
+    results["governing_case"]=results["id"].map(results.loc[governing.values].set_index("id")["case"])
+    results["max_pmm_ratio"]=results["id"].map(rated.groupby("id")["pmm_ratio"].max())
+    results["error"]=[errors.get(key,"") for key in results.index]
+    return results
+
+
+def main(argv=None):
+    parser=argparse.ArgumentParser(description="Batch RC column P-M-M check")
+    parser.add_argument("input",help="CSV or Parquet table of column sections and loads")
+    parser.add_argument("-o","--output",default="column_results.csv",help="CSV or Parquet results table")
+    parser.add_argument("--workers",type=int,default=None,help="worker processes (default: CPU count)")
+    parser.add_argument("--chunksize",type=int,default=None,help="sections per task")
+    args=parser.parse_args(argv)
+
+    table=read_table(args.input)
+    missing=[col for col in SECTION_COLUMNS+LOAD_COLUMNS if col not in table.columns]
+    if missing :
+        parser.error("missing columns: "+", ".join(missing))
+    results=run_batch(table,args.workers,args.chunksize)
+    write_table(results,args.output)
+    n_fail=int((results.loc[results["governing"],"pmm_ratio"]>1).sum())
+    n_error=int((results["error"]!="").sum())
+    print(f"{results['id'].nunique()} columns, {len(results)} load cases checked, {n_fail} over capacity, "
+          f"{n_error} failed -> {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,44 +1,55 @@
 import math
+from functools import lru_cache
+import numpy as np
 from language_manager import lang_manager
+from tracing import traced,trace_value
+from rebar_catalog import BAR_DIAMETER,BAR_AREA,find_bar_id,series_ids,bar_name
+from neutral_axis import (solve_recbeam_c,tbeam_forces,ES_STRAIN,STATUS_CS_ELASTIC,STATUS_TS_ELASTIC,
+                          STATUS_CS_IN_TENSION,STATUS_T_SHAPE)
+
+#斷面性質快取大小, 可由 set_section_cache_size 調整
+SECTION_CACHE_SIZE=1024
 
 def get_EandG_vaule(fc):
     Ec=12000*math.sqrt(fc)/1000 #tf/cm2
     ShearM=Ec/2/(1+0.25)
     return Ec,ShearM
 
+#[fy,fu, ?] unit:tf/cm2
+STEEL_MATERIALS={'A36': (2.5,4.2,4.9), 'A572': (3.3,4.9,4.9),'SN490': (3.3,4.9,4.9),'SM570M': (4.2,5.7,5.6)}
+#程式中使用的鋼筋尺寸 (rebar_catalog 的 CNS 系列)
+BAR_SIZES=tuple(bar_name(i) for i in series_ids('CNS'))
+
 def steel_material_info(keyin):
-    #[fy,fu, ?] unit:tf/cm2
-    chart={'A36': [2.5,4.2,4.9], 'A572': [3.3,4.9,4.9],'SN490': [3.3,4.9,4.9],'SM570M': [4.2,5.7,5.6]}
-    result=chart.get(keyin,'none')
+    result=STEEL_MATERIALS.get(keyin,'none')
     fy=result[0]
     fu=result[1]
     return fy,fu
 
 def rebar_info(keyin):
-    chart={'#3(D10)': 0.953, '#4(D13)': 1.27,'#5(D16)': 1.588,'#6(D19)': 1.905,
-            '#7(D22)': 2.223, '#8(D25)': 2.54,'#9(D29)': 2.865,'#10(D32)': 3.226,'#11(D36)': 3.581}
-    rebar_d=chart.get(keyin,'none')
-    if rebar_d == 'none':
+    #keyin 為鋼筋名稱或 rebar_catalog 的整數編號
+    i=keyin if isinstance(keyin,(int,np.integer)) else find_bar_id(keyin)
+    if i is None or not 0<=i<len(BAR_DIAMETER):
         return 'none', 'none'
-    Ab=math.pi*rebar_d**2/4
-    return rebar_d, Ab
+    return float(BAR_DIAMETER[i]), float(BAR_AREA[i])
+
+STIRRUP_LEGS={
+    # Chinese
+    '雙肢箍': 2,
+    '三肢箍': 3,
+    '四肢箍': 4,
+    # English
+    'Two-leg Stirrup': 2,
+    'Three-leg Stirrup': 3,
+    'Four-leg Stirrup': 4,
+    # Thai
+    'เหล็กปลอกสองขา': 2,
+    'เหล็กปลอกสามขา': 3,
+    'เหล็กปลอกสี่ขา': 4
+}
 
 def stirrup_info(keyin):
-    chart={
-        # Chinese
-        '雙肢箍': 2, 
-        '三肢箍': 3,
-        '四肢箍': 4,
-        # English
-        'Two-leg Stirrup': 2,
-        'Three-leg Stirrup': 3, 
-        'Four-leg Stirrup': 4,
-        # Thai
-        'เหล็กปลอกสองขา': 2,
-        'เหล็กปลอกสามขา': 3,
-        'เหล็กปลอกสี่ขา': 4
-    }
-    result = chart.get(keyin, 2)  # Default to 2 if not found
+    result = STIRRUP_LEGS.get(keyin, 2)  # Default to 2 if not found
     return result
 
 def get_clear_cover(keyin):
@@ -61,7 +72,7 @@ def bar_allowable_num_clicked(data,type):
         PrtctT=get_clear_cover(type)
         data.barallowtext.setText('')
         B=float(data.width.text())
-        barchart=['#3(D10)', '#4(D13)','#5(D16)','#6(D19)','#7(D22)', '#8(D25)','#9(D29)','#10(D32)','#11(D36)']
+        barchart=BAR_SIZES
         cnstrctblty=data.cnstrctblty
         BarAllowNum=[]
         for i in barchart:
@@ -86,7 +97,7 @@ def get_beta(fc):
     beta=0.85 if fc <= 280  else max(0.65,0.85-0.05/70*(fc-280))
     return beta
 
-def cal_d_eff(B,D,PrtctT,rebar_d,stirrup_d,RebarNum,cnstrctblty,type):
+def _cal_d_eff(B,D,PrtctT,rebar_d,stirrup_d,RebarNum,cnstrctblty,type):
     RebarAllowabelNumPerRow,cleardb_h=cal_bar_allowable_num(B,PrtctT,rebar_d,stirrup_d,cnstrctblty,type)
     arrange=arrange_rebar(RebarNum,RebarAllowabelNumPerRow)
     if arrange == 1 :
@@ -101,7 +112,7 @@ def cal_d_eff(B,D,PrtctT,rebar_d,stirrup_d,RebarNum,cnstrctblty,type):
         dt=d0
     return d,dt,RebarAllowabelNumPerRow
 
-def get_section_info(B,D,fc,fy,bar1,bar2,tensilebar_num,compressionbar_num,stirrup_size,PrtctT,cnstrctblty,type):
+def _get_section_info(B,D,fc,fy,bar1,bar2,tensilebar_num,compressionbar_num,stirrup_size,PrtctT,cnstrctblty,type):
     beta=get_beta(fc)
     Ec,ShearM=get_EandG_vaule(fc)
     [db_rebar1,Ab_rebar1]=rebar_info(bar1)
@@ -114,9 +125,9 @@ def get_section_info(B,D,fc,fy,bar1,bar2,tensilebar_num,compressionbar_num,stirr
     dd=D-dd0
     return beta,Ec,db_rebar1,Ab_rebar1,db_rebar2,Ab_rebar2,As,Ass,d,dt,dd,db_stirrup,Ab_stirrup,RebarAllowabelNumPerRow1,RebarAllowabelNumPerRow2
 
-def cal_effectived_beta(arrange,D,PrtctT,bard1,bard2,fc,stirrup_d,BarNum,BarAllowNumPerRow) :
-    #計算有效深度
-    if arrange[0] == lang_manager.tr('results.single_row') or BarNum[0] == 0:
+def _cal_effectived_beta(single,D,PrtctT,bard1,bard2,fc,stirrup_d,BarNum,BarAllowNumPerRow) :
+    #計算有效深度, single: 拉/壓筋是否為單排
+    if single[0] or BarNum[0] == 0:
         d=D-PrtctT-stirrup_d-bard1/2
         dt=d
     else: #僅考慮兩排的情況
@@ -128,27 +139,75 @@ def cal_effectived_beta(arrange,D,PrtctT,bard1,bard2,fc,stirrup_d,BarNum,BarAllo
         for i in range(row-1) :
             d+=BarAllowNumPerRow[0]/BarNum[0]*(d1-i*delta)
         dt=d1
-    if arrange[1] == lang_manager.tr('results.single_row') or BarNum[1] == 0:
+    if single[1] or BarNum[1] == 0:
         dd=PrtctT+stirrup_d+bard2/2
     else:
         dd1=PrtctT+stirrup_d+bard2/2
         delta=2.5+bard2
         row=int(BarNum[1]/BarAllowNumPerRow[1]+1)
-        print(row)
         dd=(BarNum[1]%BarAllowNumPerRow[1])*(dd1+(row-1)*delta)/BarNum[1]
-        print(dd)
         for i in range(row-1) :
             dd+=BarAllowNumPerRow[1]/BarNum[1]*(dd1+i*delta)
-            print(dd)
+        trace_value('cal_effectived_beta',row=row,dd=dd)
     #計算beta1值
     beta=get_beta(fc)
     return d,dt,dd,beta
 
+
+def _build_section_caches(maxsize):
+    global _d_eff_cache,_section_info_cache,_effectived_beta_cache
+    _d_eff_cache=lru_cache(maxsize=maxsize)(_cal_d_eff)
+    _section_info_cache=lru_cache(maxsize=maxsize)(_get_section_info)
+    _effectived_beta_cache=lru_cache(maxsize=maxsize)(_cal_effectived_beta)
+
+_build_section_caches(SECTION_CACHE_SIZE)
+
+
+def cal_d_eff(B,D,PrtctT,rebar_d,stirrup_d,RebarNum,cnstrctblty,type):
+    return _d_eff_cache(B,D,PrtctT,rebar_d,stirrup_d,RebarNum,cnstrctblty,type)
+
+
+@traced
+def get_section_info(B,D,fc,fy,bar1,bar2,tensilebar_num,compressionbar_num,stirrup_size,PrtctT,cnstrctblty,type):
+    return _section_info_cache(B,D,fc,fy,bar1,bar2,tensilebar_num,compressionbar_num,stirrup_size,PrtctT,cnstrctblty,type)
+
+
+@traced
+def cal_effectived_beta(arrange,D,PrtctT,bard1,bard2,fc,stirrup_d,BarNum,BarAllowNumPerRow) :
+    #arrange 為翻譯後的文字, 先轉成單排與否, 快取才不受語言影響
+    single_row=lang_manager.tr('results.single_row')
+    single=(arrange[0]==single_row,arrange[1]==single_row)
+    return _effectived_beta_cache(single,D,PrtctT,bard1,bard2,fc,stirrup_d,tuple(BarNum),tuple(BarAllowNumPerRow))
+
+
+def section_cache_info():
+    """Hit/miss statistics of the section-property caches, by function name."""
+    return {'get_section_info':_section_info_cache.cache_info(),
+            'cal_d_eff':_d_eff_cache.cache_info(),
+            'cal_effectived_beta':_effectived_beta_cache.cache_info()}
+
+
+def clear_section_cache():
+    _section_info_cache.cache_clear()
+    _d_eff_cache.cache_clear()
+    _effectived_beta_cache.cache_clear()
+
+
+def set_section_cache_size(maxsize):
+    """Resize the section-property caches (None for unbounded). Clears them."""
+    _build_section_caches(maxsize)
+
+def get_phi(et):
+    """Strength reduction factor of the net tensile strain et; et may be an array."""
+    et=np.asarray(et,dtype=float)
+    phi=np.where(et>=0.002,np.minimum(0.9,0.65+0.25/0.003*(et-0.002)),0.65)
+    return float(phi) if phi.ndim==0 else phi
+
 def cal_phi(c,d,dt):
     #計算phi值
     es=0.003/c*(d-c)
     et=0.003/c*(dt-c)
-    phi=min(0.9,0.65+0.25/0.003*(et-0.002)) if et>=0.002 else 0.65
+    phi=get_phi(et)
     if et>=0.005 :
         result1=lang_manager.tr('results.tension_control')
     elif et>=0.002 :
@@ -161,6 +220,7 @@ def cal_phi(c,d,dt):
         result2=lang_manager.tr('results.strain_not_satisfies')
     return es,et,result1,result2,phi
 
+@traced
 def cal_shear_strngth(stirrup_d,stirrup_num,stirrup_span,fc,fy,B,d) :
     #無軸壓
     Vc=0.53*fc**0.5*B*d/1000 #tf
@@ -199,25 +259,39 @@ def check_stirrup_span_limit(Vu,Vc,fc,fy,B,d,Av) :
     return s_max, s_max1, s_max2
 
 #////////////////// For   矩形梁///////////////////////////
-def cal_recbeam_Mn(dd,fc,beta,B,d,fy,Ass,As) :
-    cy=3*dd
+def steel_state_text(status,tbeam=False) :
+    #neutral_axis 狀態碼轉為顯示文字, 只在輸出時呼叫
+    if status & (STATUS_CS_ELASTIC|STATUS_CS_IN_TENSION) : #壓筋不降伏
+        text=lang_manager.tr('results.compression_not_yielding')
+    elif status & STATUS_TS_ELASTIC :
+        text=lang_manager.tr('results.compression_yielding_tension_not_yielding')
+    else :
+        text=lang_manager.tr('results.compression_yielding_tension_yielding')
+    if tbeam :
+        shape='results.compression_area_t_shape' if status & STATUS_T_SHAPE else 'results.compression_area_rectangular'
+        text=lang_manager.tr(shape)+'\n'+text
+    return text
+
+
+@traced
+def cal_recbeam_Mn_status(dd,fc,beta,B,d,fy,Ass,As) :
+    #中性軸深度由 neutral_axis.solve_recbeam_c 依應變諧和求解, 回傳狀態碼而非文字
+    cy=ES_STRAIN*dd/(ES_STRAIN-fy) if fy<ES_STRAIN else math.inf #壓筋恰降伏時的中性軸深度
     Asy=0.85*fc*beta*cy*B/fy+Ass*(fy-0.85*fc)/fy #壓筋降伏時對應的拉力鋼筋量
-    if As >=Asy : #壓筋降伏
-        a=(As*fy-Ass*(fy-0.85*fc))/(0.85*fc*B)
-        c=a/beta
-        Cc=0.85*fc*beta*B*c
-        Cs=Ass*(fy-0.85*fc)
-        es=0.003/c*(d-c)
-        result0=lang_manager.tr('results.compression_yielding_tension_yielding') if es > 0.002 else lang_manager.tr('results.compression_yielding_tension_not_yielding')
-    else: #壓筋不降伏
-        result0=lang_manager.tr('results.compression_not_yielding')
-        c=max(math2(0.85*fc*beta*B,(6120-0.85*fc)*Ass-As*fy,-6120*dd*Ass))
-        a=beta*c
-        fs=6120/c*(c-dd)
-        Cc=0.85*fc*beta*B*c
-        Cs=Ass*(fs-0.85*fc)
+    [c,fs,fst,status]=solve_recbeam_c(dd,fc,beta,B,d,fy,Ass,As)
+    if status<0 :
+        raise ValueError('cal_recbeam_Mn: no neutral axis (status '+str(int(status))+')')
+    c=float(c)
+    a=beta*c
+    Cc=0.85*fc*beta*B*c
+    Cs=Ass*(float(fs)-0.85*fc)
     Mn=(Cc*(d-0.5*a)+Cs*(d-dd))/100000
-    return Asy,result0,c,Cc,Cs,Mn
+    return Asy,int(status),c,Cc,Cs,Mn
+
+
+def cal_recbeam_Mn(dd,fc,beta,B,d,fy,Ass,As) :
+    [Asy,status,c,Cc,Cs,Mn]=cal_recbeam_Mn_status(dd,fc,beta,B,d,fy,Ass,As)
+    return Asy,steel_state_text(status),c,Cc,Cs,Mn
 
 
 
@@ -239,56 +313,23 @@ def cal_effective_width(BeamCondition,B,Sn,hf,length) :
     return be
 
 #計算彎矩強度
-def cal_tbeam_Mn(dd,beta,hf,fc,fy,B,d,be,Ass,As) :
-    #計算臨界斷面的拉力鋼筋量(c=hf的情況下拉筋需降伏的臨界鋼筋量)
-    Ccritical=hf/beta
-    fsscritical=6120/Ccritical*(Ccritical-dd)
-    Ascritical=0.85*fc/fy*be*hf+Ass*(fsscritical-0.85*fc)/fc
-    cy=3*dd
+@traced
+def cal_tbeam_Mn_status(dd,beta,hf,fc,fy,B,d,be,Ass,As) :
+    #中性軸深度由 neutral_axis.solve_tbeam_c 依應變諧和求解, 回傳狀態碼而非文字
+    cy=ES_STRAIN*dd/(ES_STRAIN-fy) if fy<ES_STRAIN else math.inf #壓筋恰降伏時的中性軸深度
     if beta*cy>hf :
         Asy=0.85*fc/fy*(hf*be+B*(beta*cy-hf))+Ass*(fy-0.85*fc)/fy #壓筋降伏時對應的拉力鋼筋量
     else :
-        Asy=0.85*fc*beta*cy*B/fy+Ass*(fy-0.85*fc)/fy #壓筋降伏時對應的拉力鋼筋量
-    if As >=Asy : #壓筋降伏
-        if As > Ascritical : #T型
-            Ac=(As*fy-Ass*(fy-0.85*fc))/(0.85*fc)
-            a=(Ac-hf*be+hf*B)/B
-            c=a/beta
-            Cc=0.85*fc*Ac
-            Cs=Ass*(fy-0.85*fc)
-            es=0.003/c*(d-c)
-            if es > 0.002 :
-                result0=lang_manager.tr('results.compression_area_t_shape') + '\n' + lang_manager.tr('results.compression_yielding_tension_yielding')
-            else:
-                result0=lang_manager.tr('results.compression_area_t_shape') + '\n' + lang_manager.tr('results.compression_yielding_tension_not_yielding')
-        else : #矩形
-            a=(As*fy-Ass*(fy-0.85*fc))/(0.85*fc*be)
-            c=a/beta
-            Cc=0.85*fc*beta*be*c
-            Cs=Ass*(fy-0.85*fc)
-            es=0.003/c*(d-c)
-            if es > 0.002 :
-                result0=lang_manager.tr('results.compression_area_rectangular') + '\n' + lang_manager.tr('results.compression_yielding_tension_yielding')
-            else:
-                result0=lang_manager.tr('results.compression_area_rectangular') + '\n' + lang_manager.tr('results.compression_yielding_tension_not_yielding')
-    else: #壓筋不降伏
-        if As > Ascritical : #T型 :
-            result0=lang_manager.tr('results.compression_area_t_shape') + '\n' + lang_manager.tr('results.compression_not_yielding')
-            c=max(math2(0.85*fc*beta*B,(6120-0.85*fc)*Ass-As*fy+0.85*fc*(be-B)*hf,-6120*dd*Ass))
-            a=beta*c
-            fs=6120/c*(c-dd)
-            Ac=be*hf+(a-hf)*B
-            Cc=0.85*fc*Ac
-            Cs=Ass*(fs-0.85*fc)
-        else : #矩形
-            result0=lang_manager.tr('results.compression_area_rectangular') + '\n' + lang_manager.tr('results.compression_not_yielding')
-            c=max(math2(0.85*fc*beta*be,(6120-0.85*fc)*Ass-As*fy,-6120*dd*Ass))
-            a=beta*c
-            fs=6120/c*(c-dd)
-            Cc=0.85*fc*beta*be*c
-            Cs=Ass*(fs-0.85*fc)
-    Mn=(Cc*(d-0.5*a)+Cs*(d-dd))/100000
-    return Asy,result0,c,Cc,Cs,Mn
+        Asy=0.85*fc*beta*cy*be/fy+Ass*(fy-0.85*fc)/fy #壓筋降伏時對應的拉力鋼筋量
+    [c,Cc,Cs,Mn,status]=tbeam_forces(dd,fc,beta,B,d,fy,Ass,As,be,hf)
+    if status<0 :
+        raise ValueError('cal_tbeam_Mn: no neutral axis (status '+str(int(status))+')')
+    return Asy,int(status),float(c),float(Cc),float(Cs),float(Mn)
+
+
+def cal_tbeam_Mn(dd,beta,hf,fc,fy,B,d,be,Ass,As) :
+    [Asy,status,c,Cc,Cs,Mn]=cal_tbeam_Mn_status(dd,beta,hf,fc,fy,B,d,be,Ass,As)
+    return Asy,steel_state_text(status,tbeam=True),c,Cc,Cs,Mn
 
 
 
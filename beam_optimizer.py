@@ -0,0 +1,146 @@
+"""
+Minimum-steel flexural reinforcement search for the beam designer.
+
+A beam has three sections (left, mid, right), each with top bars resisting
+the negative moment and bottom bars resisting the positive moment. The bars
+on the opposite face act as compression steel, as in CheckMratio. One bar
+size is used for the whole beam, because the drawing widget and the detail
+output take a single bar size.
+
+For every candidate bar size the search picks, section by section, the
+(top, bottom) pair with the least steel satisfying
+
+    phiMn >= Mu at both faces, et >= 0.004, at most two rows,
+    As >= As_min, positive steel at the ends >= half the negative steel,
+    every location >= 1/4 of the largest end negative steel.
+
+Capacities are those of CheckMratio (cal_effectived_beta + cal_recbeam_Mn).
+Steel stresses are limited to +-fy, so Mn <= (As+As')*(fy+0.85*fc)*d,
+which bounds the bars of every section before a bar size is evaluated; a
+size whose bound is dominated by a design already found is skipped. The result is the Pareto set of steel
+weight against bar count.
+"""
+import math
+from dataclasses import dataclass
+import numpy as np
+from beam_sweep import recbeam_Mn_grid,phi_grid,beta_grid
+from tracing import traced
+
+#鋼筋單位重 (kg/cm3)
+STEEL_DENSITY=0.00785
+ET_MIN=0.004
+MIN_BARS=2
+CANDIDATE_BARS=('#5','#6','#7','#8','#9','#10','#11')
+
+
+@dataclass(frozen=True)
+class BeamBarOption:
+    """One flexural design. Lists run (left-, left+, mid-, mid+, right-, right+)."""
+    bar: str
+    dsgn_barnum: tuple
+    rows: tuple
+    phiMn: tuple
+    et: tuple
+    weight: float #kg
+    n_bars: int
+
+
+def two_row_depth(D,PrtctT,stirrup_d,bard,n,n_per_row):
+    """Distance from the compression face to the bar centroid (cal_effectived_beta)."""
+    d1=D-PrtctT-stirrup_d-bard/2
+    delta=2.5+bard
+    npr=np.maximum(n_per_row,1)
+    double=(n>n_per_row)&(n>0)
+    return np.where(double,((n-npr)*(d1-delta)+npr*d1)/np.maximum(n,1),d1),d1
+
+
+def check_bar_grid(B,D,fc,fy,bard,barA,n_per_row,n_t,n_c,stirrup_d=1.27,PrtctT=4):
+    """phiMn (tf-m) and et for n_t tension and n_c compression bars, on arrays."""
+    [d,dt]=two_row_depth(D,PrtctT,stirrup_d,bard,n_t,n_per_row)
+    [dd_from_bottom,dd1]=two_row_depth(D,PrtctT,stirrup_d,bard,n_c,n_per_row)
+    dd=D-dd_from_bottom
+    beta=beta_grid(fc)
+    [Asy,c,Cc,Cs,Mn]=recbeam_Mn_grid(dd,fc,beta,B,d,fy,n_c*barA,n_t*barA)
+    [es,et,phi]=phi_grid(c,d,dt)
+    return phi*Mn,et
+
+
+def _best_section(B,D,fc,fy,bard,barA,n_per_row,Mu_minus,Mu_plus,n_lo,end):
+    #回傳 (top, bottom) 最少鋼筋量的組合, 或 None
+    n=np.arange(n_lo,2*n_per_row+1)
+    if n.shape[0]==0 :
+        return None
+    top=n[:,None]
+    bottom=n[None,:]
+    [phiMn_neg,et_neg]=check_bar_grid(B,D,fc,fy,bard,barA,n_per_row,top,bottom)
+    [phiMn_pos,et_pos]=check_bar_grid(B,D,fc,fy,bard,barA,n_per_row,bottom,top)
+    ok=(phiMn_neg>=Mu_minus)&(phiMn_pos>=Mu_plus)&(et_neg>=ET_MIN)&(et_pos>=ET_MIN)
+    if end :
+        ok&=2*bottom>=top
+    if not ok.any() :
+        return None
+    total=np.where(ok,top+bottom,np.iinfo(np.int64).max)
+    #鋼筋總數相同時取較大彎矩餘裕
+    margin=np.minimum(phiMn_neg-Mu_minus,phiMn_pos-Mu_plus)
+    order=np.lexsort((-margin.ravel(),total.ravel()))
+    [i,j]=np.unravel_index(order[0],total.shape)
+    return (int(n[i]),int(n[j]),float(phiMn_neg[i,j]),float(phiMn_pos[i,j]),float(et_neg[i,j]),float(et_pos[i,j]))
+
+
+def design_bars(B,D,fc,fy,Mu,barinfo,bar,As_min,length):
+    """Least-steel design with one bar size, or None if no layout works."""
+    [bard,barA,n_per_row]=barinfo[bar][:3]
+    if n_per_row<=0 :
+        return None
+    n_min=max(MIN_BARS,math.ceil(As_min/barA-1e-9))
+    n_lo=n_min
+    while True :
+        sections=[_best_section(B,D,fc,fy,bard,barA,n_per_row,Mu[2*k],Mu[2*k+1],n_lo,k!=1) for k in range(3)]
+        if any(s is None for s in sections) :
+            return None
+        #耐震梁: 各位置鋼筋量不小於兩端負彎矩鋼筋量的 1/4
+        n_seismic=max(n_min,math.ceil(max(sections[0][0],sections[2][0])/4))
+        if n_seismic<=n_lo :
+            break
+        n_lo=n_seismic
+    dsgn_barnum=tuple(n for s in sections for n in s[:2])
+    return BeamBarOption(bar=bar,
+                         dsgn_barnum=dsgn_barnum,
+                         rows=tuple(1 if n<=n_per_row else 2 for n in dsgn_barnum),
+                         phiMn=tuple(m for s in sections for m in s[2:4]),
+                         et=tuple(e for s in sections for e in s[4:6]),
+                         weight=sum(dsgn_barnum)*barA*length/3*STEEL_DENSITY,
+                         n_bars=sum(dsgn_barnum))
+
+
+def _lower_bound(B,D,fc,fy,Mu,barinfo,bar,As_min,length):
+    #Mn <= (As+As')*(fy+0.85*fc)*d, d 取單排最大值
+    [bard,barA,n_per_row]=barinfo[bar][:3]
+    d1=D-4-1.27-bard/2
+    n_loc=max(MIN_BARS,math.ceil(As_min/barA-1e-9))
+    n=[max(2*n_loc,math.ceil(max(Mu[2*k],Mu[2*k+1])*100000/(0.9*(fy+0.85*fc)*d1*barA)-1e-9)) for k in range(3)]
+    return sum(n)*barA*length/3*STEEL_DENSITY,sum(n)
+
+
+@traced
+def optimize_beam_bars(B,D,fc,fy,Mu,barinfo,As_min,length,bars=CANDIDATE_BARS):
+    """Pareto set of single-size designs, lightest first.
+
+    Mu is (left-, left+, mid-, mid+, right-, right+) in tf-m, barinfo is
+    the BarDsgn table and length (cm) weights the steel of each location
+    over a third of the span. Returns a list of BeamBarOption, empty when
+    no bar size works.
+    """
+    Mu=[abs(M) for M in Mu]
+    found=[]
+    for bar in sorted(bars,key=lambda b: barinfo[b][1]) :
+        [weight_lb,n_lb]=_lower_bound(B,D,fc,fy,Mu,barinfo,bar,As_min,length)
+        if any(o.weight<=weight_lb and o.n_bars<=n_lb for o in found) :
+            continue
+        option=design_bars(B,D,fc,fy,Mu,barinfo,bar,As_min,length)
+        if option is not None :
+            found.append(option)
+    pareto=[o for o in found
+            if not any((p.weight<=o.weight and p.n_bars<=o.n_bars) and (p.weight<o.weight or p.n_bars<o.n_bars)
+                       for p in found)]
+    return sorted(pareto,key=lambda o: (o.weight,o.n_bars))
@@ -0,0 +1,139 @@
+"""
+Vectorized design-space sweep of rectangular beams.
+
+sweep_recbeam evaluates the rectangular-beam check (cal_d_eff,
+cal_recbeam_Mn, cal_phi, cal_shear_strngth and cal_bar_allowable_num) on
+the full grid of
+
+    B x D x fc x fy x bar size x bar count x compression bar count
+      x stirrup size x stirrup spacing
+
+with NumPy broadcasting, and returns one record per grid point:
+
+    result = sweep_recbeam(B=[30, 35, 40], D=np.arange(50, 85, 5),
+                           fc=280, fy=4200)
+    ok = result[result["constructable"] & (result["phiMn"] >= 30)]
+    lightest = ok[np.argmin(ok["As"])]
+
+Compression bars use the same size as the tension bars. Bar and stirrup
+sizes are names or rebar_catalog ids; the records store indices into the
+bar_sizes / stirrup_sizes arguments.
+"""
+import numpy as np
+from beam_function import get_clear_cover,get_phi,BAR_SIZES
+from rebar_catalog import BAR_DIAMETER,BAR_AREA,bar_ids
+from neutral_axis import recbeam_forces,tbeam_forces,ES_STRAIN
+
+STIRRUP_SIZES=('#3(D10)','#4(D13)')
+
+SWEEP_DTYPE=np.dtype([("B","f8"),("D","f8"),("fc","f8"),("fy","f8"),
+                      ("bar","i1"),("bar_num","i2"),("comp_num","i2"),
+                      ("stirrup","i1"),("stirrup_span","f8"),
+                      ("As","f8"),("Ass","f8"),("d","f8"),("dt","f8"),("dd","f8"),
+                      ("c","f8"),("Mn","f8"),("phi","f8"),("phiMn","f8"),("et","f8"),
+                      ("phiVn","f8"),("n_per_row","i2"),("rows","i2"),("constructable","?")])
+
+
+def bar_allowable_num_grid(B,PrtctT,rebar_d,stirrup_d,cnstrctblty):
+    """cal_bar_allowable_num(..., 'Beam') on arrays. Returns n_per_row, cleardb_h."""
+    cleardb_h=np.maximum(2.5,rebar_d)
+    if cnstrctblty=='yes' :
+        cleardb_h=1.5*cleardb_h
+    n_per_row=np.maximum(0,np.floor((B-PrtctT*2-stirrup_d*2-rebar_d)/(rebar_d+cleardb_h))+1)
+    return n_per_row,cleardb_h
+
+
+def d_eff_grid(D,PrtctT,rebar_d,stirrup_d,n,n_per_row,cleardb_h):
+    """cal_d_eff on arrays. Returns d, dt, rows and whether the bars fit in two rows."""
+    d0=D-PrtctT-stirrup_d-rebar_d/2
+    npr=np.maximum(n_per_row,1)
+    rows=np.where(n<=n_per_row,1,np.ceil(n/npr))
+    fits=(n<=n_per_row)|((n_per_row>0)&(rows<=2))
+    k=rows-1
+    #第 k+1 排放剩下的鋼筋, 前 k 排各 n_per_row 支
+    total=(n-k*n_per_row)*(d0-k*(cleardb_h+rebar_d))+n_per_row*(k*d0-cleardb_h*k*(k-1)/2)
+    d=np.where(rows>1,total/np.maximum(n,1),d0)
+    return d,d0,rows,fits
+
+
+def recbeam_Mn_grid(dd,fc,beta,B,d,fy,Ass,As):
+    """cal_recbeam_Mn on arrays. Returns Asy, c, Cc, Cs, Mn (kgf, tf-m); NaN where there is no solution."""
+    cy=np.where(fy<ES_STRAIN,ES_STRAIN*dd/np.maximum(ES_STRAIN-fy,1e-12),np.inf)
+    Asy=0.85*fc*beta*cy*B/fy+Ass*(fy-0.85*fc)/fy
+    [c,Cc,Cs,Mn,status]=recbeam_forces(dd,fc,beta,B,d,fy,Ass,As)
+    return Asy,c,Cc,Cs,Mn
+
+
+def phi_grid(c,d,dt):
+    """cal_phi on arrays. Returns es, et, phi."""
+    es=0.003/c*(d-c)
+    et=0.003/c*(dt-c)
+    return es,et,get_phi(et)
+
+
+def effective_width_grid(interior,B,Sn,hf,length):
+    """cal_effective_width on arrays; interior is True for interior beams."""
+    return np.where(interior,np.minimum(np.minimum(length/4,B+Sn),B+16*hf),
+                    np.minimum(np.minimum(B+length/12,B+Sn/2),B+6*hf))
+
+
+def tbeam_phiMn_grid(dd,fc,beta,B,d,dt,fy,Ass,As,be,hf):
+    """cal_tbeam_Mn and cal_phi on arrays. Returns phiMn (tf-m), c, et and the
+    neutral_axis status (STATUS_T_SHAPE etc., negative on error)."""
+    [c,Cc,Cs,Mn,status]=tbeam_forces(dd,fc,beta,B,d,fy,Ass,As,be,hf)
+    with np.errstate(divide='ignore',invalid='ignore') :
+        [es,et,phi]=phi_grid(c,d,dt)
+    return phi*Mn,c,et,status
+
+
+def beta_grid(fc):
+    return np.where(fc<=280,0.85,np.maximum(0.65,0.85-0.05/70*(fc-280)))
+
+
+def sweep_recbeam(B,D,fc,fy,bar_sizes=BAR_SIZES,bar_nums=range(2,21),comp_nums=(0,),
+                  stirrup_sizes=STIRRUP_SIZES,stirrup_spans=(10,15,20),stirrup_num=2,cnstrctblty='no'):
+    """Evaluate every combination of the given axes. Returns a SWEEP_DTYPE array.
+
+    Scalars are accepted for any axis. Units follow the scalar functions
+    (cm, kgf/cm2, tf-m, tf). constructable is False where the bars need
+    more than two rows or a row holds no bar. Values are still computed
+    there, for charts.
+    """
+    axes=[np.atleast_1d(np.asarray(a,dtype=float)) for a in (B,D,fc,fy)]
+    bar_id=bar_ids(bar_sizes)
+    bar_d=BAR_DIAMETER[bar_id]
+    bar_A=BAR_AREA[bar_id]
+    stirrup_id=bar_ids(stirrup_sizes)
+    stirrup_d=BAR_DIAMETER[stirrup_id]
+    stirrup_A=BAR_AREA[stirrup_id]
+    axes+=[np.arange(bar_d.shape[0]),np.atleast_1d(np.asarray(bar_nums,dtype=float)),
+           np.atleast_1d(np.asarray(comp_nums,dtype=float)),np.arange(stirrup_d.shape[0]),
+           np.atleast_1d(np.asarray(stirrup_spans,dtype=float))]
+    grid=np.ix_(*axes)
+    [B,D,fc,fy,bar,n,n_comp,stirrup,s]=grid
+    db=bar_d[bar]
+    ds=stirrup_d[stirrup]
+    PrtctT=get_clear_cover('Beam')
+    Ab=bar_A[bar]
+    As=n*Ab
+    Ass=n_comp*Ab
+    beta=beta_grid(fc)
+
+    [n_per_row,cleardb_h]=bar_allowable_num_grid(B,PrtctT,db,ds,cnstrctblty)
+    [d,dt,rows,fits]=d_eff_grid(D,PrtctT,db,ds,n,n_per_row,cleardb_h)
+    [dd0,ddt,rows_comp,fits_comp]=d_eff_grid(D,PrtctT,db,ds,n_comp,n_per_row,cleardb_h)
+    dd=D-dd0
+    [Asy,c,Cc,Cs,Mn]=recbeam_Mn_grid(dd,fc,beta,B,d,fy,Ass,As)
+    [es,et,phi]=phi_grid(c,d,dt)
+    Vc=0.53*np.sqrt(fc)*B*d/1000
+    Av=stirrup_num*stirrup_A[stirrup]
+    phiVn=0.75*(Vc+Av/s*fy*d/1000)
+
+    shape=np.broadcast_shapes(*(g.shape for g in grid))
+    out=np.empty(int(np.prod(shape)),dtype=SWEEP_DTYPE)
+    fields={"B":B,"D":D,"fc":fc,"fy":fy,"bar":bar,"bar_num":n,"comp_num":n_comp,"stirrup":stirrup,
+            "stirrup_span":s,"As":As,"Ass":Ass,"d":d,"dt":dt,"dd":dd,"c":c,"Mn":Mn,"phi":phi,"phiMn":phi*Mn,
+            "et":et,"phiVn":phiVn,"n_per_row":n_per_row,"rows":rows,"constructable":fits&fits_comp}
+    for name,value in fields.items() :
+        out[name]=np.broadcast_to(value,shape).ravel()
+    return out
@@ -0,0 +1,243 @@
+"""
+Timing benchmarks of the calculation engines, with a regression check
+against a stored baseline.
+
+    python benchmark.py --save-baseline             record benchmark_baseline.json
+    python benchmark.py                             compare, exit 1 on regression
+    python benchmark.py --threshold 10 -k column    10 % limit, column cases only
+
+Every engine is timed on a representative section and on a worst case:
+cal_recbeam_Mn, cal_tbeam_Mn, the beam design behind
+beam_dsgn_button_clicked (design_beam + format_beam_dsgn_result, without
+widgets), the minimum-steel bar search optimize_beam_bars,
+find_interaction_point, get_mm_diagram and check_column.
+
+Each sample calls the function `number` times. The best of `repeat`
+samples, per call, is the figure stored and compared, because it is the
+least disturbed by other load on the machine. The section caches are
+cleared before every sample, so cached engines are timed cold. A case
+regresses when best_ms > baseline best_ms * (1 + threshold/100). Baselines
+are machine specific and are not kept in the repository.
+
+No widgets are created, and Qt and matplotlib are set to their offscreen
+backends, so the benchmarks run on a Linux box without a display.
+"""
+import argparse
+import fnmatch
+import json
+import os
+import platform
+import sys
+import time
+from dataclasses import dataclass
+
+os.environ.setdefault('QT_QPA_PLATFORM','offscreen')
+os.environ.setdefault('MPLBACKEND','Agg')
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+from beam_function import (get_section_info,cal_recbeam_Mn,cal_tbeam_Mn,cal_effective_width,get_clear_cover,
+                           clear_section_cache)
+from beam_optimizer import optimize_beam_bars
+from column_function import (get_column_section_info,get_column_rebar_layout,get_theta,get_alpha,build_column_ord,
+                             cal_d_max,find_interaction_point,get_mm_diagram)
+from rc_beamdsgn_base import BeamDsgnSpec,BarDsgn,design_beam,format_beam_dsgn_result
+from rc_columncal_base import ColumnSpec,check_column
+
+DEFAULT_BASELINE='benchmark_baseline.json'
+DEFAULT_THRESHOLD=25.0 #%
+DEFAULT_REPEAT=5
+
+
+@dataclass(frozen=True)
+class Benchmark:
+    name: str
+    func: object #無引數的可呼叫物件
+    number: int=1 #每次取樣的呼叫次數
+
+
+def _beam_section(B,D,fc,fy,bar1,bar2,n1,n2):
+    [beta,Ec,bard1,Ab1,bard2,Ab2,As,Ass,d,dt,dd,db_stirrup,Ab_stirrup,n_row1,n_row2]=get_section_info(
+        B,D,fc,fy,bar1,bar2,n1,n2,'#4(D13)',get_clear_cover('Beam'),'no','Beam')
+    return beta,As,Ass,d,dd
+
+
+def recbeam_case(B,D,fc,fy,bar1,bar2,n1,n2):
+    [beta,As,Ass,d,dd]=_beam_section(B,D,fc,fy,bar1,bar2,n1,n2)
+    return lambda: cal_recbeam_Mn(dd,fc,beta,B,d,fy,Ass,As)
+
+
+def tbeam_case(B,D,hf,length,Sn,BeamCondition,fc,fy,bar1,bar2,n1,n2):
+    [beta,As,Ass,d,dd]=_beam_section(B,D,fc,fy,bar1,bar2,n1,n2)
+    be=cal_effective_width(BeamCondition,B,Sn,hf,length)
+    return lambda: cal_tbeam_Mn(dd,beta,hf,fc,fy,B,d,be,Ass,As)
+
+
+def beam_design_case(spec):
+    return lambda: format_beam_dsgn_result(design_beam(spec))
+
+
+def bar_optimizer_case(B,D,fc,fy,Mu,length,cnstrctblty='no'):
+    As_min=max(0.8*fc**0.5/fy*B*D,14/fy*B*D)
+    barinfo=BarDsgn(B,cnstrctblty,10)[1]
+    return lambda: optimize_beam_bars(B,D,fc,fy,Mu,barinfo,As_min,length)
+
+
+def _column_section(spec):
+    [beta,Ec]=get_column_section_info(spec.B,spec.D,spec.fc,spec.fy,spec.bar1,spec.bar2,spec.stirrup_size)[:2]
+    rebar_layout=get_column_rebar_layout(spec.B,spec.D,spec.bar1,spec.bar2,spec.Nx,spec.Ny,spec.stirrup_size)
+    alpha=get_alpha(spec.B,spec.D,rebar_layout,get_theta(spec.Mux,spec.Muy),spec.Es,Ec)
+    return beta,rebar_layout,alpha,build_column_ord(spec.B,spec.D)
+
+
+def interaction_point_case(spec,c_ratio):
+    [beta,rebar_layout,alpha,concrete_df]=_column_section(spec)
+    d_max=cal_d_max(concrete_df,alpha)
+    c=c_ratio*d_max
+    return lambda: find_interaction_point(spec.B,spec.D,concrete_df,alpha,beta,c,d_max,spec.fc,rebar_layout,
+                                          spec.Es,spec.fy)
+
+
+def mm_diagram_case(spec):
+    [beta,rebar_layout,alpha,concrete_df]=_column_section(spec)
+    Ast=rebar_layout.Ast
+    Pno=round((0.85*spec.fc*(spec.B*spec.D-Ast)+Ast*spec.fy)/1000,1)
+    Pnt=round(-Ast*spec.fy/1000,2)
+    return lambda: get_mm_diagram(spec.Pu,Pno,Pnt,spec.B,spec.D,spec.fc,spec.fy,spec.Es,beta,concrete_df,rebar_layout)
+
+
+def column_check_case(spec):
+    return lambda: check_column(spec)
+
+
+#代表性斷面及最差情況 (雙排、壓筋未降伏、T形中性軸、多根柱筋、接近純壓)
+TYPICAL_COLUMN=ColumnSpec(B=50,D=60,fc=280,fy=4200,bar1='#8(D25)',bar2='#8(D25)',Nx=4,Ny=5,
+                          stirrup_size='#4(D13)',stirrup_num=2,stirrup_span=15,Pu=150,Mux=20,Muy=10)
+WORST_COLUMN=ColumnSpec(B=100,D=120,fc=420,fy=4200,bar1='#11(D36)',bar2='#10(D32)',Nx=10,Ny=12,
+                        stirrup_size='#4(D13)',stirrup_num=4,stirrup_span=10,Pu=2500,Mux=150,Muy=140)
+
+
+def default_benchmarks():
+    return [
+        Benchmark('recbeam_Mn/typical',recbeam_case(30,60,280,4200,'#8(D25)','#6(D19)',4,2),number=200),
+        Benchmark('recbeam_Mn/worst',recbeam_case(30,50,280,2800,'#10(D32)','#10(D32)',6,4),number=200),
+        Benchmark('tbeam_Mn/typical',tbeam_case(30,60,12,600,270,'Interior Beam',280,4200,'#8(D25)','#6(D19)',4,2),
+                  number=200),
+        Benchmark('tbeam_Mn/worst',tbeam_case(30,70,8,900,400,'Exterior Beam',210,4200,'#11(D36)','#4(D13)',6,2),
+                  number=200),
+        Benchmark('beam_design/typical',beam_design_case(BeamDsgnSpec(B=40,D=70,hf=15,length=700,Sn=300,
+                  BeamCondition='Interior Beam',fc=280,fy=4200,Mu=(40,20,5,25,45,22),Vg=(15,3,16)))),
+        Benchmark('beam_design/worst',beam_design_case(BeamDsgnSpec(B=30,D=60,hf=12,length=900,Sn=400,
+                  BeamCondition='Exterior Beam',fc=210,fy=4200,Mu=(70,35,12,40,75,38),Vg=(28,6,30),
+                  CTbeam='yes',cnstrctblty='yes'))),
+        Benchmark('bar_optimizer/typical',bar_optimizer_case(40,70,280,4200,(40,20,5,25,45,22),700),number=10),
+        Benchmark('bar_optimizer/worst',bar_optimizer_case(30,60,210,4200,(70,35,12,40,75,38),900,'yes'),number=10),
+        Benchmark('interaction_point/typical',interaction_point_case(TYPICAL_COLUMN,0.5),number=50),
+        Benchmark('interaction_point/worst',interaction_point_case(WORST_COLUMN,0.05),number=50),
+        Benchmark('mm_diagram/typical',mm_diagram_case(TYPICAL_COLUMN)),
+        Benchmark('mm_diagram/worst',mm_diagram_case(WORST_COLUMN)),
+        Benchmark('column_check/typical',column_check_case(TYPICAL_COLUMN)),
+        Benchmark('column_check/worst',column_check_case(WORST_COLUMN)),
+    ]
+
+
+def time_benchmark(bench,repeat=DEFAULT_REPEAT):
+    """Best and median time per call (ms) of a benchmark over repeat samples."""
+    samples=[]
+    for _ in range(repeat) :
+        clear_section_cache()
+        start=time.perf_counter()
+        for _ in range(bench.number) :
+            bench.func()
+        samples.append((time.perf_counter()-start)*1000/bench.number)
+    return {'best_ms':min(samples),'median_ms':float(np.median(samples)),'number':bench.number,'repeat':repeat}
+
+
+def run_benchmarks(benchmarks=None,pattern=None,repeat=DEFAULT_REPEAT,progress=None):
+    """Time the benchmarks whose names match the glob pattern. Returns the result document."""
+    if benchmarks is None :
+        benchmarks=default_benchmarks()
+    results={}
+    for bench in benchmarks :
+        if pattern and not fnmatch.fnmatch(bench.name,pattern) and pattern not in bench.name :
+            continue
+        bench.func() #暖機, 排除首次匯入與配置
+        results[bench.name]=time_benchmark(bench,repeat)
+        if progress is not None :
+            progress(bench.name,results[bench.name])
+    return {'meta':{'time':time.strftime('%Y-%m-%dT%H:%M:%S'),'python':platform.python_version(),
+                    'numpy':np.__version__,'machine':platform.machine(),'processor':platform.processor(),
+                    'node':platform.node()},
+            'results':results}
+
+
+def compare_results(results,baseline,threshold=DEFAULT_THRESHOLD):
+    """Cases slower than the baseline by more than threshold percent,
+    as (name, baseline ms, ms, change %). Cases missing from either side are ignored."""
+    regressions=[]
+    for name,current in results['results'].items() :
+        base=baseline['results'].get(name)
+        if base is None :
+            continue
+        change=(current['best_ms']/base['best_ms']-1)*100
+        if change>threshold :
+            regressions.append((name,base['best_ms'],current['best_ms'],change))
+    return regressions
+
+
+def save_results(results,path):
+    with open(path,'w',encoding='utf-8') as f :
+        json.dump(results,f,indent=2)
+
+
+def load_results(path):
+    with open(path,encoding='utf-8') as f :
+        return json.load(f)
+
+
+def main(argv=None):
+    parser=argparse.ArgumentParser(description="Benchmark the RC calculation engines")
+    parser.add_argument("-k","--pattern",default=None,help="run only cases matching this name or glob")
+    parser.add_argument("--repeat",type=int,default=DEFAULT_REPEAT,help="samples per case")
+    parser.add_argument("-o","--output",default=None,help="write this run's results as JSON")
+    parser.add_argument("--baseline",default=DEFAULT_BASELINE,help="baseline JSON to compare against")
+    parser.add_argument("--threshold",type=float,default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown versus the baseline, in percent")
+    parser.add_argument("--save-baseline",action="store_true",help="store this run as the baseline")
+    args=parser.parse_args(argv)
+
+    baseline=None
+    if not args.save_baseline and os.path.exists(args.baseline) :
+        baseline=load_results(args.baseline)
+
+    def progress(name,result):
+        line=f"{name:28s} {result['best_ms']:10.3f} ms  (median {result['median_ms']:.3f})"
+        base=baseline['results'].get(name) if baseline else None
+        if base :
+            line+=f"  {(result['best_ms']/base['best_ms']-1)*100:+6.1f} %"
+        print(line,flush=True)
+
+    results=run_benchmarks(pattern=args.pattern,repeat=args.repeat,progress=progress)
+    if not results['results'] :
+        parser.error("no benchmark matches "+repr(args.pattern))
+    if args.output :
+        save_results(results,args.output)
+    if args.save_baseline :
+        save_results(results,args.baseline)
+        print(f"baseline saved to {args.baseline}")
+        return 0
+    if baseline is None :
+        print(f"no baseline at {args.baseline}; run with --save-baseline to create one")
+        return 0
+    regressions=compare_results(results,baseline,args.threshold)
+    for name,base_ms,ms,change in regressions :
+        print(f"REGRESSION {name}: {base_ms:.3f} ms -> {ms:.3f} ms ({change:+.1f} %)")
+    if regressions :
+        return 1
+    print(f"no regression beyond {args.threshold:g} %")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
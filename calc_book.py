@@ -0,0 +1,294 @@
+"""
+Calculation book: the checks of many beams and columns as one indexed PDF.
+
+    python calc_book.py --beams beams.csv --columns columns.csv -o book.pdf --workers 4
+
+beams: one row per rectangular beam, with the RecBeamSpec fields B, D (cm),
+fc, fy (kgf/cm2), bar1, bar2, tensilebar_num, compressionbar_num,
+stirrup_size, stirrup_num (legs or stirrup text), stirrup_span (cm),
+Mux (tf-m) and Vuy (tf). columns: one row per column, with the ColumnSpec
+fields B, D, fc, fy, bar1, bar2, Nx, Ny, stirrup_size, stirrup_num,
+stirrup_span, Pu (tf), Mux and Muy (tf-m). Both tables take an optional
+id column.
+
+Each member is checked and drawn in a worker process. A beam gets the three
+create_pdf_page_* pages of the report window. A column gets one page with
+its data, the P-M curve and the Mx-My contour. The worker writes the pages
+with PdfPages, closes each figure as soon as it is saved, and returns the
+PDF bytes. The main process appends the members to the output file in
+input order with PdfMerger. Only a bounded number of members is in flight,
+so memory does not grow with the size of the book. The table of contents
+(member, check ratio, status, page) is drawn last and placed in front of
+the members. Every member also gets a bookmark.
+"""
+import argparse
+import io
+import math
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+os.environ.setdefault('QT_QPA_PLATFORM','offscreen')
+os.environ.setdefault('MPLBACKEND','Agg')
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd
+
+from batch_beam import read_table
+from batch_column import get_stirrup_legs
+from pdf_merge import PdfMerger
+from rc_columncal_base import ColumnSpec,check_column
+from rc_recbeamcal_base import RecBeamSpec
+from report_pages import PAGE_BUILDERS,PDF_DPI,init_worker
+
+BEAM_COLUMNS=["B","D","fc","fy","bar1","bar2","tensilebar_num","compressionbar_num","stirrup_size","stirrup_num",
+              "stirrup_span","Mux","Vuy"]
+COLUMN_COLUMNS=["B","D","fc","fy","bar1","bar2","Nx","Ny","stirrup_size","stirrup_num","stirrup_span","Pu","Mux",
+                "Muy"]
+STIRRUP_LABELS={2:'เหล็กปลอกสองขา',3:'เหล็กปลอกสามขา',4:'เหล็กปลอกสี่ขา'}
+KIND_LABELS={'beam':'คาน','column':'เสา'}
+TOC_ROWS=36 #每頁目錄列數
+BOOK_INFO={'title': 'รายการคำนวณโครงสร้าง RC ตามมาตรฐาน ACI 318',
+           'author': 'RC Beam Analysis Program',
+           'creator': 'RC Beam Analysis Program v.1.0'}
+
+
+def beam_member(row):
+    """(RecBeamSpec, stirrup text) of a beam table row."""
+    legs=get_stirrup_legs(row["stirrup_num"])
+    label=row["stirrup_num"] if isinstance(row["stirrup_num"],str) else STIRRUP_LABELS.get(legs,f"{legs} ขา")
+    spec=RecBeamSpec(B=float(row["B"]),D=float(row["D"]),fc=float(row["fc"]),fy=float(row["fy"]),
+                     bar1=str(row["bar1"]),bar2=str(row["bar2"]),tensilebar_num=int(row["tensilebar_num"]),
+                     compressionbar_num=int(row["compressionbar_num"]),stirrup_size=str(row["stirrup_size"]),
+                     stirrup_num=legs,stirrup_span=float(row["stirrup_span"]),Mux=float(row["Mux"]),
+                     Vuy=float(row["Vuy"]))
+    return spec,label
+
+
+def column_member(row):
+    return ColumnSpec(B=float(row["B"]),D=float(row["D"]),fc=float(row["fc"]),fy=float(row["fy"]),
+                      bar1=str(row["bar1"]),bar2=str(row["bar2"]),Nx=int(row["Nx"]),Ny=int(row["Ny"]),
+                      stirrup_size=str(row["stirrup_size"]),stirrup_num=get_stirrup_legs(row["stirrup_num"]),
+                      stirrup_span=float(row["stirrup_span"]),Pu=float(row["Pu"]),Mux=float(row["Mux"]),
+                      Muy=float(row["Muy"]))
+
+
+def read_members(table,kind,columns,prefix):
+    """[(kind, id, row dict), ...] of a member table."""
+    missing=[col for col in columns if col not in table.columns]
+    if missing :
+        raise ValueError(f"{kind} table is missing columns: "+", ".join(missing))
+    table=table.reset_index(drop=True)
+    ids=table["id"] if "id" in table.columns else pd.Series([f"{prefix}{i+1}" for i in table.index])
+    return [(kind,str(member_id),dict(row)) for member_id,(_,row) in zip(ids,table[columns].iterrows())]
+
+
+def create_column_page(member_id,result,font_used):
+    """A4 page of one column check: data, P-M curve and Mx-My contour."""
+    import matplotlib.pyplot as plt
+    spec=result.spec
+    fig=plt.figure(figsize=(8.27,11.69))
+    fig.suptitle(f'รายงานการตรวจสอบเสา RC ตามมาตรฐาน ACI 318 - {member_id}',fontsize=16,fontweight='bold',y=0.97,
+                 fontfamily=font_used)
+    plt.subplots_adjust(left=0.1,right=0.92,top=0.90,bottom=0.06,hspace=0.35)
+    ax1=plt.subplot(3,1,1)
+    ax1.axis('off')
+    ok=result.pmm_ratio<=1
+    text=f"""ขนาดหน้าตัดเสา: B = {spec.B:g} ซม.   D = {spec.D:g} ซม.
+คุณสมบัติวัสดุ: f'c = {spec.fc:g} กก./ตร.ซม.   fy = {spec.fy:g} กก./ตร.ซม.
+เหล็กเสริม: มุม {spec.bar1}  ด้าน {spec.bar2}  Nx = {spec.Nx}  Ny = {spec.Ny}  (Ast = {result.Ast:.2f} ตร.ซม.)
+เหล็กปลอก: {spec.stirrup_size} {spec.stirrup_num} ขา ระยะ {spec.stirrup_span:g} ซม.
+แรงกระทำ: Pu = {spec.Pu:g} ตัน   Mux = {spec.Mux:g} ตัน-เมตร   Muy = {spec.Muy:g} ตัน-เมตร
+
+Pno = {result.Pno:.1f} ตัน   ϕPn,max = {result.phi_Pnmax:.1f} ตัน   Pnt = {result.Pnt:.1f} ตัน
+θ = {result.theta:.1f}°   α = {result.alpha:.1f}°   ϕVnx = {result.phiVnx:.2f} ตัน   ϕVny = {result.phiVny:.2f} ตัน
+PMM ratio = {result.pmm_ratio:.3f}   {'ผ่าน' if ok else 'ไม่ผ่าน'}"""
+    ax1.text(0.0,0.95,text,transform=ax1.transAxes,fontsize=11,verticalalignment='top',fontfamily=font_used,
+             bbox=dict(boxstyle="round,pad=0.4",facecolor="lightgreen" if ok else "mistyrose",alpha=0.7))
+
+    #與 menu_controller.draw_pmm / draw_mm 相同的圖
+    pm=result.interaction_diagram
+    ax2=plt.subplot(3,1,2)
+    ax2.plot(pm['Mn'],pm['Pn'],linestyle='--',color='orange',label='Mn - Pn')
+    ax2.plot(pm['phiMn'],pm['phiPn'],color='navy',label='ϕMn - ϕPn')
+    ax2.plot([0,result.Mu,result.capacity_point[0]],[0,spec.Pu,result.capacity_point[1]],color='gray',linestyle='--')
+    ax2.plot([result.Mu],[spec.Pu],'ro',label='Mu - Pu')
+    ax2.set_xlabel('ϕMn (ตัน-เมตร)',fontfamily=font_used)
+    ax2.set_ylabel('ϕPn (ตัน)',fontfamily=font_used)
+    ax2.set_title(f'แผนภาพปฏิสัมพันธ์ P-M (θ = {result.theta:.1f}°)',fontsize=13,fontweight='bold',fontfamily=font_used)
+    ax2.axis([0,None,None,None])
+    ax2.grid(True,alpha=0.3)
+    ax2.legend(prop={'family':font_used})
+
+    mm=result.mm_diagram
+    ax3=plt.subplot(3,1,3)
+    ax3.plot(mm['phi']*mm['Mnx'],mm['phi']*abs(mm['Mny']),color='darkgreen',label='ϕMnx - ϕMny')
+    ax3.plot([spec.Mux],[spec.Muy],'ro',label='Mux - Muy')
+    ax3.set_xlabel('ϕMnx (ตัน-เมตร)',fontfamily=font_used)
+    ax3.set_ylabel('ϕMny (ตัน-เมตร)',fontfamily=font_used)
+    ax3.set_title(f'แผนภาพ Mx-My ที่ Pu = {spec.Pu:g} ตัน',fontsize=13,fontweight='bold',fontfamily=font_used)
+    ax3.axis([0,None,0,None])
+    ax3.grid(True,alpha=0.3)
+    ax3.legend(prop={'family':font_used})
+    return fig
+
+
+def check_member(kind,row):
+    """Check one member. Returns (page builders, summary) where each builder draws one figure."""
+    from demo_improved_gui import ImprovedRCBeamCalculator,beam_report_results
+    if kind=='beam' :
+        [spec,stirrup_label]=beam_member(row)
+        results=beam_report_results(spec,stirrup_label)
+        ratio=max(spec.Mux/results['phiMn'] if results['phiMn'] else math.inf,
+                  spec.Vuy/results['phiVn'] if results['phiVn'] else math.inf)
+        ok=results['moment_adequate'] and results['shear_adequate']
+        builders=[lambda font,name=name: getattr(ImprovedRCBeamCalculator,name)(results,font) for name in PAGE_BUILDERS]
+    else :
+        result=check_column(column_member(row))
+        ratio=result.pmm_ratio
+        ok=ratio<=1
+        builders=[lambda font: create_column_page(row.get('id',''),result,font)]
+    return builders,{'ratio':round(float(ratio),3),'ok':bool(ok)}
+
+
+def render_member(kind,member_id,row,dpi=PDF_DPI):
+    """Worker: check one member and return (summary, PDF bytes of its pages)."""
+    import matplotlib.pyplot as plt
+    from matplotlib.backends.backend_pdf import PdfPages
+    from demo_improved_gui import setup_font_for_pdf
+    [builders,summary]=check_member(kind,dict(row,id=member_id))
+    font_used=setup_font_for_pdf()
+    buffer=io.BytesIO()
+    with PdfPages(buffer) as pdf :
+        for build in builders :
+            fig=build(font_used)
+            try :
+                pdf.savefig(fig,bbox_inches='tight',dpi=dpi)
+            finally :
+                plt.close(fig)
+    return summary,buffer.getvalue()
+
+
+def toc_page_count(n_members):
+    return max(1,math.ceil(n_members/TOC_ROWS))
+
+
+def render_toc(entries):
+    """Worker: PDF bytes of the table of contents. entries: [(id, kind, summary or None, page or None), ...]."""
+    import matplotlib.pyplot as plt
+    from matplotlib.backends.backend_pdf import PdfPages
+    from demo_improved_gui import setup_font_for_pdf
+    font_used=setup_font_for_pdf()
+    buffer=io.BytesIO()
+    n_pages=toc_page_count(len(entries))
+    with PdfPages(buffer) as pdf :
+        for page in range(n_pages) :
+            fig=plt.figure(figsize=(8.27,11.69))
+            fig.suptitle(f'สารบัญ ({page+1}/{n_pages})',fontsize=16,fontweight='bold',y=0.97,fontfamily=font_used)
+            ax=fig.add_axes([0.08,0.05,0.84,0.87])
+            ax.axis('off')
+            rows=[]
+            colors=[]
+            for i,(member_id,kind,summary,first_page) in enumerate(entries[page*TOC_ROWS:(page+1)*TOC_ROWS]) :
+                if summary is None :
+                    rows.append([str(page*TOC_ROWS+i+1),member_id,KIND_LABELS[kind],'-','ข้อผิดพลาด','-'])
+                    colors.append('#fff3cd')
+                    continue
+                status='ผ่าน' if summary['ok'] else 'ไม่ผ่าน'
+                rows.append([str(page*TOC_ROWS+i+1),member_id,KIND_LABELS[kind],f"{summary['ratio']:.3f}",status,
+                             str(first_page)])
+                colors.append('white' if summary['ok'] else '#f8d7da')
+            table=ax.table(cellText=rows,colLabels=['ลำดับ','ชิ้นส่วน','ชนิด','อัตราส่วน','ผล','หน้า'],
+                           cellColours=[[c]*6 for c in colors],colWidths=[0.1,0.3,0.12,0.16,0.16,0.1],
+                           loc='upper center',cellLoc='center')
+            table.auto_set_font_size(False)
+            table.set_fontsize(10)
+            for cell in table.get_celld().values() :
+                cell.get_text().set_fontfamily(font_used)
+                cell.set_height(0.024)
+            pdf.savefig(fig)
+            plt.close(fig)
+    return buffer.getvalue()
+
+
+def build_book(members,output,workers=None,dpi=PDF_DPI,progress=None):
+    """Check and draw every member into one PDF at output. Returns the TOC entries.
+
+    At most 2*workers members are in flight, and finished members are
+    written in input order. progress(index, kind, id, summary or exception),
+    if given, is called as each member is written.
+    """
+    workers=workers or os.cpu_count() or 1
+    n_toc=toc_page_count(len(members))
+    entries=[]
+    page_count=n_toc
+    with open(output,'wb') as f, ProcessPoolExecutor(max_workers=workers,initializer=init_worker,
+                                                      mp_context=multiprocessing.get_context('spawn')) as executor :
+        merger=PdfMerger(f,BOOK_INFO)
+        futures={}
+        next_submit=0
+        for index in range(len(members)) :
+            while next_submit<len(members) and next_submit<index+2*workers :
+                [kind,member_id,row]=members[next_submit]
+                futures[next_submit]=executor.submit(render_member,kind,member_id,row,dpi)
+                next_submit+=1
+            [kind,member_id,row]=members[index]
+            future=futures.pop(index)
+            try :
+                [summary,data]=future.result()
+            except Exception as e :
+                entries.append((member_id,kind,None,None))
+                if progress is not None :
+                    progress(index,kind,member_id,e)
+                continue
+            pages=merger.append(data)
+            merger.add_outline(f"{KIND_LABELS[kind]} {member_id}",pages[0])
+            entries.append((member_id,kind,summary,page_count+1))
+            page_count+=len(pages)
+            if progress is not None :
+                progress(index,kind,member_id,summary)
+        toc=merger.append(executor.submit(render_toc,entries).result(),first=True)
+        merger.add_outline('สารบัญ',toc[0],first=True)
+        merger.close()
+    return entries
+
+
+def main(argv=None):
+    parser=argparse.ArgumentParser(description="Calculation book of RC beams and columns as one PDF")
+    parser.add_argument("--beams",default=None,help="CSV or Excel table of rectangular beams")
+    parser.add_argument("--columns",default=None,help="CSV or Excel table of columns")
+    parser.add_argument("-o","--output",default="calc_book.pdf",help="PDF file to write")
+    parser.add_argument("--workers",type=int,default=None,help="worker processes (default: CPU count)")
+    parser.add_argument("--dpi",type=int,default=PDF_DPI,help="resolution of raster parts of the pages")
+    args=parser.parse_args(argv)
+    if not args.beams and not args.columns :
+        parser.error("give --beams and/or --columns")
+
+    members=[]
+    try :
+        if args.beams :
+            members+=read_members(read_table(args.beams),'beam',BEAM_COLUMNS,'B')
+        if args.columns :
+            members+=read_members(read_table(args.columns),'column',COLUMN_COLUMNS,'C')
+    except ValueError as e :
+        parser.error(str(e))
+    if not members :
+        parser.error("no members in the input tables")
+
+    def progress(index,kind,member_id,summary):
+        if isinstance(summary,Exception) :
+            line=f"ERROR {type(summary).__name__}: {summary}"
+        else :
+            line=f"ratio {summary['ratio']:.3f} {'OK' if summary['ok'] else 'NG'}"
+        print(f"[{index+1}/{len(members)}] {kind} {member_id}: {line}",flush=True)
+
+    entries=build_book(members,args.output,args.workers,args.dpi,progress)
+    n_fail=sum(1 for entry in entries if entry[2] is not None and not entry[2]['ok'])
+    n_error=sum(1 for entry in entries if entry[2] is None)
+    print(f"{len(entries)} members, {n_fail} over capacity, {n_error} failed -> {args.output}")
+    return 1 if n_error else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
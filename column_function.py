@@ -2,7 +2,7 @@ from cmath import atan
 import numpy as np
 import pandas as pd
 import math
-from beam_function import get_beta, get_EandG_vaule,rebar_info,cal_d_eff
+from beam_function import get_beta, get_EandG_vaule,rebar_info,cal_d_eff,get_clear_cover,get_phi
 
 def get_column_section_info(B,D,fc,fy,bar1,bar2,stirrup_size):
     beta=get_beta(fc)
@@ -13,129 +13,231 @@ def get_column_section_info(B,D,fc,fy,bar1,bar2,stirrup_size):
     return beta,Ec,db_rebar1,Ab_rebar1,db_rebar2,Ab_rebar2,db_stirrup,Ab_stirrup
 
 
-def get_rebar_df(B,D,cover,Nx,Ny,Ab_rebar1,Ab_rebar2):
-    layers=[ i+1 for i in range((Nx+Ny)*2-4)]
-    df=pd.DataFrame(columns=["x0","y0","Ab","x0^2Ab","y0^2Ab","y_alpha","yy_alpha","epsilon","fs","FsandT"],index=layers)
+class RebarLayout:
+    """Column bar layout stored as contiguous float64 arrays (cm, cm2)."""
+    __slots__=('x0','y0','Ab','x0_sq_Ab','y0_sq_Ab')
+
+    def __init__(self,x0,y0,Ab):
+        self.x0=np.ascontiguousarray(x0,dtype=np.float64)
+        self.y0=np.ascontiguousarray(y0,dtype=np.float64)
+        self.Ab=np.ascontiguousarray(Ab,dtype=np.float64)
+        self.x0_sq_Ab=self.x0**2*self.Ab
+        self.y0_sq_Ab=self.y0**2*self.Ab
+
+    def __len__(self):
+        return self.x0.shape[0]
+
+    @property
+    def Ast(self):
+        return float(self.Ab.sum())
+
+    def key(self):
+        #可雜湊的配筋描述, 供快取使用
+        return (tuple(self.x0.tolist()),tuple(self.y0.tolist()),tuple(self.Ab.tolist()))
+
+    @classmethod
+    def from_key(cls,key):
+        return cls(*key)
+
+    @classmethod
+    def from_dataframe(cls,df):
+        return cls(df["x0"].to_numpy(dtype=float),df["y0"].to_numpy(dtype=float),df["Ab"].to_numpy(dtype=float))
+
+    def to_dataframe(self):
+        #給 DataFrameModel 表格顯示用, 欄位與 get_rebar_df 相同
+        layers=[ i+1 for i in range(len(self))]
+        df=pd.DataFrame(columns=["x0","y0","Ab","x0^2Ab","y0^2Ab","y_alpha","yy_alpha","epsilon","fs","FsandT"],index=layers)
+        df["x0"]=self.x0
+        df["y0"]=self.y0
+        df["Ab"]=self.Ab
+        df["x0^2Ab"]=self.x0_sq_Ab
+        df["y0^2Ab"]=self.y0_sq_Ab
+        return df
+
+def as_rebar_layout(rebar):
+    return rebar if isinstance(rebar,RebarLayout) else RebarLayout.from_dataframe(rebar)
+
+def get_rebar_layout(B,D,cover,Nx,Ny,Ab_rebar1,Ab_rebar2):
     span_x=(B-2*cover)/(Nx-1)
     span_y=(D-2*cover)/(Ny-1)
-    x_ord=[cover-B/2+span_x*i for i in range(Nx)]
-    y_ord=[cover-D/2+span_y*(i+1) for i in range(Ny-2)]
-    ord=[]
-    Ab=[]
-    for i in [cover-D/2,D/2-cover]:
-        for j in x_ord :
-            ord.append([j,i])
-            Ab.append(Ab_rebar1)
-    for i in [cover-B/2,B/2-cover]:
-        for j in y_ord:
-            ord.append([i,j])
-            Ab.append(Ab_rebar2)
-    for i in range(len(ord)) :
-        df.loc[i+1,'x0']=ord[i][0]
-        df.loc[i+1,'y0']=ord[i][1]
-        df.loc[i+1,'Ab']=Ab[i]
-    df["x0^2Ab"]=df["x0"]**2*df["Ab"]
-    df["y0^2Ab"]=df["y0"]**2*df["Ab"]
-    return df
+    x_ord=cover-B/2+span_x*np.arange(Nx)
+    y_ord=cover-D/2+span_y*np.arange(1,Ny-1)
+    x0=np.concatenate([x_ord,x_ord,np.full(Ny-2,cover-B/2),np.full(Ny-2,B/2-cover)])
+    y0=np.concatenate([np.full(Nx,cover-D/2),np.full(Nx,D/2-cover),y_ord,y_ord])
+    Ab=np.concatenate([np.full(2*Nx,Ab_rebar1,dtype=float),np.full(2*(Ny-2),Ab_rebar2,dtype=float)])
+    return RebarLayout(x0,y0,Ab)
+
+def get_column_rebar_layout(B,D,bar1,bar2,Nx,Ny,stirrup_size):
+    #與 column_cal_button_clicked 相同的保護層與配筋
+    [db_rebar1,Ab_rebar1]=rebar_info(bar1)
+    [db_rebar2,Ab_rebar2]=rebar_info(bar2)
+    [db_stirrup,Ab_stirrup]=rebar_info(stirrup_size)
+    cover=get_clear_cover('Column')+db_stirrup+db_rebar1
+    return get_rebar_layout(B,D,cover,Nx,Ny,Ab_rebar1,Ab_rebar2)
+
+def get_rebar_df(B,D,cover,Nx,Ny,Ab_rebar1,Ab_rebar2):
+    return get_rebar_layout(B,D,cover,Nx,Ny,Ab_rebar1,Ab_rebar2).to_dataframe()
     
 def get_theta(Mux,Muy):
     theta=np.degrees(math.atan2(Muy,Mux))
     return theta
 
-def get_alpha(B,D,df,theta,Es,Ec):
-    Ix=B*D**3/12+sum(df['y0^2Ab'])*Es/Ec
-    Iy=D*B**3/12+sum(df['x0^2Ab'])*Es/Ec
+def get_alpha(B,D,rebar,theta,Es,Ec):
+    rebar=as_rebar_layout(rebar)
+    Ix=B*D**3/12+rebar.y0_sq_Ab.sum()*Es/Ec
+    Iy=D*B**3/12+rebar.x0_sq_Ab.sum()*Es/Ec
     # print('Ix=',Ix,'Iy',Iy)
     alpha=math.degrees(math.atan2(Ix/Iy*math.tan(math.radians(theta)),1))
     return alpha
 
 def build_column_ord(B,D):
-    layers=['p1','p2','p3','p4','np1','np2']
-    df=pd.DataFrame([[-B/2,D/2],[-B/2,-D/2],[B/2,-D/2],[B/2,D/2],[None,None],[None,None]],columns=["x0","y0"],index=layers)
+    #斷面頂點 (逆時針)
+    layers=['p1','p2','p3','p4']
+    df=pd.DataFrame([[-B/2,D/2],[-B/2,-D/2],[B/2,-D/2],[B/2,D/2]],columns=["x0","y0"],index=layers)
     return df
 
-def find_intersection(B,D,alpha,n):
-    m=math.tan(math.radians(alpha))
-    if math.radians(alpha)==0:
-        point=[[B,D],[B,D],[-B/2,-m*B/2+n],[B/2,m*B/2+n]]
-    elif math.radians(alpha)==90:
-        point=[[(-D/2-n)/m,-D/2],[(D/2-n)/m,D/2],[B,D],[B,D]]
-    else :
-        point=[[(-D/2-n)/m,-D/2],[(D/2-n)/m,D/2],[-B/2,-m*B/2+n],[B/2,m*B/2+n]]
-    intersection=[]
-    record=[]
-    j=1
-    # print("point=",point)
-    for i in point:
-        if i[0]>=-B/2 and i[0]<=B/2 and i[1]>=-D/2 and i[1]<=D/2:
-            intersection.append(i)
-            record.append(j)
-        j+=1
-    # print('intersection=',intersection)
-    intersection.sort()
-    # print("record=",record)
-    if {1,2}.issubset(record) :
-        stress_block_shape=['np1','np2','p1','p2']
-    elif {2,3}.issubset(record) :
-        stress_block_shape=['np1','np2','p1']
-    elif {3,4}.issubset(record) :
-        stress_block_shape=['np1','np2','p4','p1']       
-    elif {1,4}.issubset(record) :
-        stress_block_shape=['np1','np2','p4','p1','p2']  
-    else :
-        stress_block_shape=['p1','p2','p3','p4']
-    return intersection,  stress_block_shape
+def get_section_vertices(concrete_df):
+    if isinstance(concrete_df,pd.DataFrame):
+        return concrete_df[["x0","y0"]].to_numpy(dtype=float)
+    return np.asarray(concrete_df,dtype=float)
+
+def cal_d_max(concrete_df,alpha):
+    #最外受壓纖維至中性軸方向形心軸距離的兩倍
+    vertices=get_section_vertices(concrete_df)
+    proj=vertices[:,1]*math.cos(math.radians(alpha))-vertices[:,0]*math.sin(math.radians(alpha))
+    return 2*proj.max()
+
+def clip_compression_zone(vertices,alpha,offset):
+    """Area and centroid of a convex polygon cut by the neutral-axis line.
+
+    The part kept is y*cos(alpha) - x*sin(alpha) >= offset. offset may be an
+    array, in which case area, xc and yc are arrays of the same length.
+    Each edge is clipped to the half-plane and the cut is closed along the
+    line, so any convex section and any angle go through the same path.
+    """
+    vertices=np.asarray(vertices,dtype=float)
+    offset=np.atleast_1d(np.asarray(offset,dtype=float))[:,None]
+    P=vertices[None,:,:]
+    Q=np.roll(vertices,-1,axis=0)[None,:,:]
+    proj=vertices[:,1]*math.cos(math.radians(alpha))-vertices[:,0]*math.sin(math.radians(alpha))
+    sP=proj[None,:]-offset
+    sQ=np.roll(proj,-1)[None,:]-offset
+    inP=sP>=0
+    inQ=sQ>=0
+    denom=sP-sQ
+    lam=np.divide(sP,denom,out=np.zeros_like(sP),where=denom!=0)[:,:,None]
+    X=P+lam*(Q-P)
+    exit_mask=(inP&~inQ)[:,:,None]
+    entry_mask=(~inP&inQ)[:,:,None]
+    start=np.where(inP[:,:,None],P,X)
+    end=np.where(inQ[:,:,None],Q,X)
+    valid=(inP|inQ)[:,:,None]
+    start=np.where(valid,start,0.0)
+    end=np.where(valid,end,0.0)
+    #沿中性軸由出點回到入點封閉多邊形
+    E=(exit_mask*X).sum(axis=1)
+    N=(entry_mask*X).sum(axis=1)
+    cross=start[:,:,0]*end[:,:,1]-end[:,:,0]*start[:,:,1]
+    cross_close=E[:,0]*N[:,1]-N[:,0]*E[:,1]
+    area2=cross.sum(axis=1)+cross_close
+    cx6=((start[:,:,0]+end[:,:,0])*cross).sum(axis=1)+(E[:,0]+N[:,0])*cross_close
+    cy6=((start[:,:,1]+end[:,:,1])*cross).sum(axis=1)+(E[:,1]+N[:,1])*cross_close
+    safe=np.where(area2!=0,area2,1.0)
+    xc=np.where(area2!=0,cx6/(3*safe),0.0)
+    yc=np.where(area2!=0,cy6/(3*safe),0.0)
+    return np.abs(area2)/2,xc,yc
+
+def cal_Cc_batch(concrete_df,alpha,d_max,c,beta,fc):
+    c=np.atleast_1d(np.asarray(c,dtype=float))
+    Area_comp,xc,yc=clip_compression_zone(get_section_vertices(concrete_df),alpha,d_max/2-beta*c)
+    Cc=np.where(c>0,0.85*fc*Area_comp/1000,0.0) #tf
+    Mnx_rc=Cc*yc/100 #tf-m
+    Mny_rc=Cc*xc/100 #tf-m
+    return Cc,Mnx_rc,Mny_rc
 
 #迭代 C畫出互制曲線
-def find_interaction_point(B,D,concrete_df,alpha,beta,c,d_max,fc,rebar_df,Es,fy):
-    d_max=2*cal_distance_from_point_to_line(concrete_df.loc['p1','x0'],concrete_df.loc['p1','y0'],math.tan(math.radians(alpha)),-1,0)
-    delta=((d_max/2-c)+(1-beta)*c)/math.cos(math.radians(alpha))
-    intersection,  stress_block_shape=find_intersection(B,D,alpha,delta)
-    try:
-        concrete_df.loc['np1']=intersection[0]
-        concrete_df.loc['np2']=intersection[1]
-    except:
-        pass
-    # print( stress_block_shape)
-    points_ord=[[concrete_df.loc[i,'x0'],concrete_df.loc[i,'y0']] for i in  stress_block_shape]
-    # print(points_ord)
-    [Cc,Mnx_rc,Mny_rc]=cal_Cc(points_ord,fc,c)
-    [rebar_df,Fs,Mnx_s,Mny_s]=cal_Fs_T(rebar_df,alpha,d_max,c,beta,Es,fc,fy)
+def find_interaction_points(B,D,concrete_df,alpha,beta,c,fc,rebar_layout,Es,fy):
+    rebar=as_rebar_layout(rebar_layout)
+    d_max=cal_d_max(concrete_df,alpha)
+    [Cc,Mnx_rc,Mny_rc]=cal_Cc_batch(concrete_df,alpha,d_max,c,beta,fc)
+    [epsilon,fs,FsandT,Fs,Mnx_s,Mny_s]=cal_Fs_T_batch(rebar.x0,rebar.y0,rebar.Ab,alpha,d_max,c,beta,Es,fc,fy)
     Pn=Cc+Fs
     Mnx=Mnx_rc+Mnx_s
     Mny=Mny_rc+Mny_s
-    phi=get_phi(abs(rebar_df["epsilon"].min()))
-    # print(rebar_df)
-    # print(np.degrees(math.atan2(Mny,Mnx)))
-    return round(Pn,2), round(Mnx,2), round(Mny,2), round(phi,2)
-
-def cal_Cc(points_ord,fc,c):
-    if c<=0 :
-        Cc=0
-        Mnx_rc=0
-        Mny_rc=0
-    else :
-        Area_comp= cal_area(np.array(points_ord))
-        xc,yc=cal_centroid(np.array(points_ord))
-        Cc=0.85*fc*Area_comp/1000 #tf
-        Mnx_rc=Cc*yc/100 #tf-m
-        Mny_rc=Cc*xc/100 #tf-m
+    et=np.abs(epsilon.min(axis=0))
+    phi=get_phi(et)
+    return Pn,Mnx,Mny,phi
 
-    return Cc,Mnx_rc,Mny_rc
+def find_interaction_curve(B,D,concrete_df,alpha,beta,fc,rebar_layout,Es,fy,tol=0.01,n_init=5,max_eval=200,
+                           progress=None):
+    """Sample the interaction curve with adaptive neutral-axis depths.
+
+    Starts from n_init depths between 0.05*min(B,D) and 2*max(B,D) and
+    bisects every interval whose midpoint lies further than tol from the
+    chord of its end points, on both the (Mn, Pn) and the (phiMn, phiPn)
+    curves. Distances are measured after scaling Pn by the Pn range and Mn
+    by the largest Mn, so tol is a fraction of the curve size. Each pass is
+    one find_interaction_points call.
+
+    Returns c, Pn, Mnx, Mny, phi sorted by c, and the number of
+    interaction-point evaluations used. progress, if given, is called with
+    the running evaluation count after every pass.
+    """
+    c=np.linspace(0.05*min(B,D),2*max(B,D),n_init)
+    [Pn,Mnx,Mny,phi]=find_interaction_points(B,D,concrete_df,alpha,beta,c,fc,rebar_layout,Es,fy)
+    n_eval=c.shape[0]
+    if progress is not None :
+        progress(n_eval)
+    todo=np.ones(c.shape[0]-1,dtype=bool)
+    while todo.any() and n_eval<max_eval:
+        idx=np.nonzero(todo)[0][:max_eval-n_eval]
+        c_mid=(c[idx]+c[idx+1])/2
+        [Pn_mid,Mnx_mid,Mny_mid,phi_mid]=find_interaction_points(B,D,concrete_df,alpha,beta,c_mid,fc,rebar_layout,Es,fy)
+        n_eval+=c_mid.shape[0]
+        if progress is not None :
+            progress(n_eval)
+        Mn=np.hypot(Mnx,Mny)
+        Mn_mid=np.hypot(Mnx_mid,Mny_mid)
+        P_scale=max(Pn.max()-Pn.min(),1e-9)
+        M_scale=max(Mn.max(),Mn_mid.max(),1e-9)
+        error_n=_chord_deviation(Mn[idx]/M_scale,Pn[idx]/P_scale,Mn[idx+1]/M_scale,Pn[idx+1]/P_scale,
+                                 Mn_mid/M_scale,Pn_mid/P_scale)
+        error_phi=_chord_deviation(phi[idx]*Mn[idx]/M_scale,phi[idx]*Pn[idx]/P_scale,
+                                   phi[idx+1]*Mn[idx+1]/M_scale,phi[idx+1]*Pn[idx+1]/P_scale,
+                                   phi_mid*Mn_mid/M_scale,phi_mid*Pn_mid/P_scale)
+        refine=np.maximum(error_n,error_phi)>tol
+        c=np.insert(c,idx+1,c_mid)
+        Pn=np.insert(Pn,idx+1,Pn_mid)
+        Mnx=np.insert(Mnx,idx+1,Mnx_mid)
+        Mny=np.insert(Mny,idx+1,Mny_mid)
+        phi=np.insert(phi,idx+1,phi_mid)
+        #插入後左端點的新位置, 兩個子區間都需再檢查
+        left=idx+np.arange(idx.shape[0])
+        todo=np.zeros(c.shape[0]-1,dtype=bool)
+        todo[left]=refine
+        todo[left+1]=refine
+    return c,Pn,Mnx,Mny,phi,n_eval
+
+def _chord_deviation(x0,y0,x1,y1,x,y):
+    #點 (x,y) 到線段 (x0,y0)-(x1,y1) 的距離
+    dx=x1-x0
+    dy=y1-y0
+    L2=dx*dx+dy*dy
+    t=np.clip(np.divide((x-x0)*dx+(y-y0)*dy,L2,out=np.zeros_like(L2),where=L2>0),0,1)
+    return np.hypot(x-x0-t*dx,y-y0-t*dy)
+
+def find_interaction_point(B,D,concrete_df,alpha,beta,c,d_max,fc,rebar_layout,Es,fy):
+    [Pn,Mnx,Mny,phi]=find_interaction_points(B,D,concrete_df,alpha,beta,c,fc,rebar_layout,Es,fy)
+    return round(Pn[0],2), round(Mnx[0],2), round(Mny[0],2), round(phi[0],2)
 
 def cal_Fs_T(df,alpha,d_max,c,beta,Es,fc,fy):
+    [epsilon,fs,FsandT,Fs,Mnx_s,Mny_s]=cal_Fs_T_batch(df["x0"].to_numpy(dtype=float),df["y0"].to_numpy(dtype=float),
+                                                      df["Ab"].to_numpy(dtype=float),alpha,d_max,c,beta,Es,fc,fy)
     df["y_alpha"]=df["y0"]*math.cos(math.radians(alpha))-df["x0"]*math.sin(math.radians(alpha))
     df["yy_alpha"]=d_max/2-df["y_alpha"]
-    df["epsilon"]=0.003*(1-df["yy_alpha"]/c)
-    #///計算鋼筋拉壓力(Fs&T) 並扣除重複計算混凝土壓力
-    for i in range(df.shape[0]):
-        fs=min(fy,Es*abs(df.loc[i+1,"epsilon"]))*np.sign(df.loc[i+1,"epsilon"]) #kgf/cm2
-        df.loc[i+1,"fs"]=round(fs,0)
-        Fs=df.loc[i+1,"Ab"]*fs/1000 #tf
-        if df.loc[i+1,"yy_alpha"]<beta*c :
-            df.loc[i+1,"FsandT"]=round(Fs-0.85*fc*df.loc[i+1,"Ab"]/1000,2)
-        else :
-            df.loc[i+1,"FsandT"]=round(Fs,2)
+    df["epsilon"]=epsilon[:,0]
+    df["fs"]=np.round(fs[:,0],0)
+    df["FsandT"]=np.round(FsandT[:,0],2)
     df["Mnx_s"]=df["FsandT"]*df["y0"]/100 #tf-m
     df["Mny_s"]=df["FsandT"]*df["x0"]/100 #tf-m
     Fs=df["FsandT"].sum()
@@ -144,6 +246,34 @@ def cal_Fs_T(df,alpha,d_max,c,beta,Es,fc,fy):
 
     return df,Fs,Mnx_s,Mny_s
 
+def cal_Fs_T_batch(x0,y0,Ab,alpha,d_max,c,beta,Es,fc,fy):
+    """Steel forces for every bar and every neutral-axis depth in one pass.
+
+    x0, y0, Ab are per-bar arrays (n_bars,), c is a scalar or an array of
+    trial depths (n_c,). epsilon, fs (kgf/cm2) and FsandT (tf) are returned
+    as (n_bars, n_c) arrays, Fs (tf), Mnx_s and Mny_s (tf-m) as (n_c,).
+
+    Nothing is rounded here. cal_Fs_T rounds fs to 1 kgf/cm2 and FsandT to
+    0.01 tf per bar, so its totals differ from these by at most
+    n_bars*0.005 tf for Fs and n_bars*0.005*max(|x0|,|y0|)/100 tf-m for the
+    moments.
+    """
+    x0=np.asarray(x0,dtype=float)[:,None]
+    y0=np.asarray(y0,dtype=float)[:,None]
+    Ab=np.asarray(Ab,dtype=float)[:,None]
+    c=np.atleast_1d(np.asarray(c,dtype=float))[None,:]
+    y_alpha=y0*math.cos(math.radians(alpha))-x0*math.sin(math.radians(alpha))
+    yy_alpha=d_max/2-y_alpha
+    with np.errstate(divide='ignore',invalid='ignore'):
+        epsilon=0.003*(1-yy_alpha/c)
+    #///計算鋼筋拉壓力(Fs&T) 並扣除重複計算混凝土壓力
+    fs=np.minimum(fy,Es*np.abs(epsilon))*np.sign(epsilon) #kgf/cm2
+    FsandT=Ab*fs/1000-np.where(yy_alpha<beta*c,0.85*fc*Ab/1000,0.0) #tf
+    Fs=FsandT.sum(axis=0)
+    Mnx_s=(FsandT*y0).sum(axis=0)/100 #tf-m
+    Mny_s=(FsandT*x0).sum(axis=0)/100 #tf-m
+    return epsilon,fs,FsandT,Fs,Mnx_s,Mny_s
+
 def modify_interaction_diagram(interaction_diagram,Pno,phi_Pnmax) :
     interaction_diagram.loc[interaction_diagram.shape[0]]=[None,0.65,Pno,0,0,0]
     interaction_diagram["Mn"]=round((interaction_diagram["Mnx"]**2+interaction_diagram["Mny"]**2)**0.5,2)
@@ -153,10 +283,6 @@ def modify_interaction_diagram(interaction_diagram,Pno,phi_Pnmax) :
     interaction_diagram["phiMn"]=round(interaction_diagram["phi"]*interaction_diagram["Mn"],2)
     return interaction_diagram
 
-def get_phi(et):
-    phi=min(0.9,0.65+0.25/0.003*(et-0.002)) if et>=0.002 else 0.65
-    return phi
-
 def get_section_info(B,D,fc,fy,bar1,bar2,stirrup_size,PrtctT,cnstrctblty):
     beta=get_beta(fc)
     Ec,ShearM=get_EandG_vaule(fc)
@@ -192,50 +318,151 @@ def cal_distance_from_point_to_line(x0,y0,a,b,c):
     return distance
 
 def get_pmmratio(interaction_diagram,Pu,Mu):
-    demand=math.sqrt(Pu**2+Mu**2)
-    angle=get_theta(Mu,Pu)
-    for i in range(interaction_diagram.shape[0]) :
-        angle2=get_theta(interaction_diagram.loc[i,'phiMn'],interaction_diagram.loc[i,'phiPn'])
-        if angle2>=angle :
-            points=[interaction_diagram.loc[i-1,['phiMn','phiPn']],interaction_diagram.loc[i,['phiMn','phiPn']]]
-            break
-    x=np.linspace(points[0].iloc[0],points[1].iloc[0],20)
-    y=np.linspace(points[0].iloc[1],points[1].iloc[1],20)
-    # m_total=[ get_theta(x[i],y[i])-angle for i in range(len(x))]
-    n=90
-    for i in range(len(x)) :
-        m=abs(get_theta(x[i],y[i])-angle)
-        if m<n:
-            n=m
-            answer=[x[i],y[i]]
-    capacity=math.sqrt(answer[0]**2+answer[1]**2)
-    pmm_ratio=round(demand/capacity,3)
-    return answer,pmm_ratio
-
-
-def get_mm_diagram(Pu,Pno,Pnt,B,D,fc,fy,Es,beta,concrete_df,rebar_df):
-    mm_diagram=pd.DataFrame(columns=["alpha","c","phi","Pn","Mnx","Mny","iter"])
+    [capacity_Mn,capacity_Pn,pmm_ratio]=get_pmmratio_batch(interaction_diagram['phiMn'].to_numpy(dtype=float),
+                                                           interaction_diagram['phiPn'].to_numpy(dtype=float),Pu,Mu)
+    answer=[float(capacity_Mn[0]),float(capacity_Pn[0])]
+    return answer,round(float(pmm_ratio[0]),3)
+
+def get_pmmratio_batch(phiMn,phiPn,Pu,Mu):
+    """Capacity points and PMM ratios of many demands on one (phiMn, phiPn) polyline.
+
+    The ray from the origin through each (Mu, Pu) demand is intersected
+    exactly with every segment of the polyline and the nearest hit is the
+    capacity point. A demand whose ray misses the polyline is measured
+    against the vertex closest to it in angle. A zero demand has ratio 0.
+    Returns capacity_Mn, capacity_Pn and pmm_ratio arrays (unrounded).
+    """
+    x=np.asarray(phiMn,dtype=float)
+    y=np.asarray(phiPn,dtype=float)
+    Pu=np.atleast_1d(np.asarray(Pu,dtype=float))
+    Mu=np.atleast_1d(np.asarray(Mu,dtype=float))
+    demand=np.hypot(Mu,Pu)
+    safe=np.where(demand>0,demand,1.0)
+    ux=np.where(demand>0,Mu/safe,1.0)[:,None]
+    uy=np.where(demand>0,Pu/safe,0.0)[:,None]
+    ax=x[None,:-1]
+    ay=y[None,:-1]
+    ex=np.diff(x)[None,:]
+    ey=np.diff(y)[None,:]
+    denom=ux*ey-uy*ex
+    ok=denom!=0
+    safe_denom=np.where(ok,denom,1.0)
+    t=(ax*ey-ay*ex)/safe_denom
+    s=(ax*uy-ay*ux)/safe_denom
+    hit=ok&(s>=0)&(s<=1)&(t>0)
+    t=np.where(hit,t,np.inf).min(axis=1)
+    #射線未與曲線相交時取角度最接近的頂點
+    miss=~np.isfinite(t)
+    if miss.any() :
+        angle=np.arctan2(y,x)[None,:]
+        target=np.arctan2(uy[miss],ux[miss])
+        k=np.abs((angle-target+np.pi)%(2*np.pi)-np.pi).argmin(axis=1)
+        t[miss]=np.hypot(x[k],y[k])
+    capacity_Mn=t*ux[:,0]
+    capacity_Pn=t*uy[:,0]
+    with np.errstate(divide='ignore'):
+        pmm_ratio=np.where(demand>0,demand/t,0.0)
+    return capacity_Mn,capacity_Pn,pmm_ratio
+
+
+def get_mm_diagram(Pu,Pno,Pnt,B,D,fc,fy,Es,beta,concrete_df,rebar_layout,ptol=0.01,progress=None):
+    """MM contour at Pu, solving Pn(c)=Pu for each neutral-axis angle.
+
+    Each angle is solved with brent_root. From the second angle on, the
+    bracket search starts from the c found for the previous angle. The
+    "iter" column counts interaction-point evaluations for that angle and
+    "error" is the relative residual |Pn-Pu|/max(|Pu|,100). Angles where Pu
+    is outside the section's Pn range keep the nearest end of the bracket.
+    progress, if given, is called with the running evaluation count after
+    every interaction point.
+    """
+    rebar_layout=as_rebar_layout(rebar_layout)
+    mm_diagram=pd.DataFrame(columns=["alpha","c","phi","Pn","Mnx","Mny","iter","error"])
     alpha=np.linspace(0,90,21)
+    Pu_scale=max(abs(Pu),100)
+    c_lo=0.001*min(B,D)
+    c_hi=2*max(B,D)
+    c_prev=None
+    n_total=0
     for i in range(len(alpha)):
-        d_max=2*cal_distance_from_point_to_line(concrete_df.loc['p1','x0'],concrete_df.loc['p1','y0'],math.tan(math.radians(alpha[i])),-1,0)
-        left_pointer=0
-        right_pointer=2*max(B,D)
-        error=1
-        num=0
-        while error > 0.05 :
-            mid=(left_pointer+right_pointer)/2
-            [Pn,Mnx,Mny,phi]=find_interaction_point(B,D,concrete_df,alpha[i],beta,mid,d_max,fc,rebar_df,Es,fy)
-            # print(left_pointer,right_pointer,'mid=',mid,'Pn=',Pn)
-            if abs(Pu)<=100:
-                error=abs((Pn-Pu)/100)
-            else :
-                error=abs((Pn-Pu)/Pu)
-            if Pn<Pu :
-                left_pointer=mid
-            elif  Pn>Pu :
-                right_pointer=mid
-            num+=1
-            if num>15:
-                break
-        mm_diagram.loc[i]=[alpha[i],mid,phi,Pn,Mnx,Mny,num]
+        evaluated={}
+        def residual(c):
+            nonlocal n_total
+            [Pn,Mnx,Mny,phi]=find_interaction_points(B,D,concrete_df,alpha[i],beta,c,fc,rebar_layout,Es,fy)
+            evaluated[c]=[round(Pn[0],2),round(Mnx[0],2),round(Mny[0],2),round(phi[0],2)]
+            n_total+=1
+            if progress is not None :
+                progress(n_total)
+            return Pn[0]-Pu
+        if c_prev is None :
+            [a,b,fa,fb,num]=[c_lo,c_hi,residual(c_lo),residual(c_hi),2]
+        else :
+            [a,b,fa,fb,num]=bracket_root(residual,c_prev,c_lo,c_hi,0.05*(c_hi-c_lo))
+        if fa*fb<=0 :
+            [c,fc_root,n_iter]=brent_root(residual,a,b,fa,fb,ptol*Pu_scale)
+            num+=n_iter
+        else :
+            #Pu 超出此角度的 Pn 範圍
+            c=a if abs(fa)<abs(fb) else b
+        [Pn,Mnx,Mny,phi]=evaluated[c]
+        mm_diagram.loc[i]=[alpha[i],c,phi,Pn,Mnx,Mny,num,round(abs(Pn-Pu)/Pu_scale,4)]
+        c_prev=c
     return mm_diagram
+
+def bracket_root(func,x0,lo,hi,step):
+    #由 x0 往函數變號方向以倍增步長尋找包夾區間
+    f0=func(x0)
+    num=1
+    if f0==0 :
+        return x0,x0,f0,f0,num
+    direction=1 if f0<0 else -1
+    while True :
+        x1=min(hi,max(lo,x0+direction*step))
+        f1=func(x1)
+        num+=1
+        if f0*f1<=0 or x1 in (lo,hi) :
+            break
+        x0,f0=x1,f1
+        step*=2
+    if x1<x0 :
+        return x1,x0,f1,f0,num
+    return x0,x1,f0,f1,num
+
+def brent_root(func,a,b,fa,fb,ftol,xtol=1e-6,maxiter=50):
+    """Brent's method for func(x)=0 on a bracket [a, b] with fa*fb <= 0.
+
+    Stops when |func(x)| <= ftol or the bracket is narrower than xtol.
+    Returns the root, its function value and the number of evaluations.
+    """
+    if abs(fa)<abs(fb) :
+        a,b,fa,fb=b,a,fb,fa
+    c,fc_=a,fa
+    d=c
+    mflag=True
+    num=0
+    while abs(fb)>ftol and abs(b-a)>xtol and num<maxiter :
+        if fa!=fc_ and fb!=fc_ :
+            #反二次插值
+            s=(a*fb*fc_/((fa-fb)*(fa-fc_))+b*fa*fc_/((fb-fa)*(fb-fc_))+c*fa*fb/((fc_-fa)*(fc_-fb)))
+        else :
+            #割線法
+            s=b-fb*(b-a)/(fb-fa)
+        if (not (min((3*a+b)/4,b)<s<max((3*a+b)/4,b)) or
+                (mflag and abs(s-b)>=abs(b-c)/2) or
+                (not mflag and abs(s-b)>=abs(c-d)/2) or
+                (mflag and abs(b-c)<xtol) or
+                (not mflag and abs(c-d)<xtol)) :
+            s=(a+b)/2
+            mflag=True
+        else :
+            mflag=False
+        fs=func(s)
+        num+=1
+        d,c,fc_=c,b,fb
+        if fa*fs<0 :
+            b,fb=s,fs
+        else :
+            a,fa=s,fs
+        if abs(fa)<abs(fb) :
+            a,b,fa,fb=b,a,fb,fa
+    return b,fb,num
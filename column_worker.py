@@ -0,0 +1,34 @@
+from PyQt5 import QtCore
+from rc_columncal_base import check_column,CalculationCancelled
+
+
+class ColumnCalWorker(QtCore.QThread):
+  """Runs check_column off the GUI thread.
+
+  progressed carries the number of interaction points computed so far,
+  failed the exception raised by the check. requestInterruption() stops
+  the check at the next interaction point.
+  """
+  progressed=QtCore.pyqtSignal(int)
+  succeeded=QtCore.pyqtSignal(object)
+  failed=QtCore.pyqtSignal(object)
+  cancelled=QtCore.pyqtSignal()
+
+  def __init__(self,spec,parent=None):
+    super(ColumnCalWorker,self).__init__(parent)
+    self.spec=spec
+
+  def report(self,n_points):
+    if self.isInterruptionRequested():
+      raise CalculationCancelled()
+    self.progressed.emit(n_points)
+
+  def run(self):
+    try :
+      result=check_column(self.spec,progress=self.report)
+    except CalculationCancelled :
+      self.cancelled.emit()
+    except Exception as e:
+      self.failed.emit(e)
+    else :
+      self.succeeded.emit(result)
@@ -8,6 +8,8 @@ Demo script สำหรับทดสอบ GUI ใหม่
 import sys
 import os
 import json
+import time
+import hashlib
 from datetime import datetime
 from PyQt5 import QtWidgets, QtCore, QtGui
 from PyQt5.QtCore import QTimer, QPropertyAnimation, QEasingCurve
@@ -92,17 +94,86 @@ except ImportError as e:
 # เพิ่ม path สำหรับ import modules
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+from tracing import traced, trace_value, report_exception
+from report_pages import PAGE_BUILDERS, PDF_DPI, PDF_INFO, RenderCancelled, render_report_pdf
+
 try:
-    from ui_rc_recbeamcal_improved import Ui_RcRecBeamCalImproved, ModernInputValidator
-    from language_manager import lang_manager
+    # โมดูลคำนวณก่อน เพื่อให้ใช้ beam_report_results/หน้า PDF ได้แม้ไม่มีไฟล์ UI
     from beam_function import (get_section_info, cal_recbeam_Mn, cal_phi, cal_shear_strngth, 
                               check_stirrup_span_limit, rebar_info, stirrup_info, get_clear_cover)
-    from rc_recbeamcal_base import recbeam_cal_button_clicked
+    from rc_recbeamcal_base import recbeam_cal_button_clicked, RecBeamSpec, check_recbeam
+    from ui_rc_recbeamcal_improved import Ui_RcRecBeamCalImproved, ModernInputValidator
+    from language_manager import lang_manager
+    from input_validation import ValidationScheduler
 except ImportError as e:
     print(f"ไม่สามารถ import module ได้: {e}")
     print("กรุณาตรวจสอบว่าไฟล์ที่จำเป็นอยู่ในโฟลเดอร์เดียวกัน")
 
 
+def beam_report_results(spec, stirrup_type, d=None, Tu=0.0):
+    """ผลการคำนวณคานสี่เหลี่ยมสำหรับแท็บผลลัพธ์และรายงาน PDF
+    
+    spec เป็น RecBeamSpec (ซม.) stirrup_type คือข้อความชนิดเหล็กปลอกที่แสดงในรายงาน
+    d (ซม.) คือความลึกที่แสดงในแบบฟอร์ม ถ้าไม่ระบุใช้ความลึกประสิทธิผลจาก get_section_info
+    """
+    B, D, fc, fy = spec.B, spec.D, spec.fc, spec.fy
+    main_rebar_size, comp_rebar_size = spec.bar1, spec.bar2
+    main_rebar_num, comp_rebar_num = spec.tensilebar_num, spec.compressionbar_num
+    stirrup_size, stirrup_spacing = spec.stirrup_size, spec.stirrup_span
+    Mu, Vu = spec.Mux, spec.Vuy
+    
+    # Get material and section properties using original functions
+    PrtctT = get_clear_cover('Beam')  # cm
+    
+    [beta, Ec, db_rebar1, Ab_rebar1, db_rebar2, Ab_rebar2, As, Ass, d_eff, dt, dd, 
+     db_stirrup, Ab_stirrup, RebarAllowNumPerRow1, RebarAllowNumPerRow2] = get_section_info(
+        B, D, fc, fy, main_rebar_size, comp_rebar_size, main_rebar_num, 
+        comp_rebar_num, stirrup_size, PrtctT, 'no', "Beam"
+    )
+    
+    # Calculate moment strength using original function
+    [Asy, result0, c, Cc, Cs, Mn] = cal_recbeam_Mn(dd, fc, beta, B, d_eff, fy, Ass, As)
+    [es, et, result1, result2, phi] = cal_phi(c, d_eff, dt)
+    
+    # Calculate shear strength using original function
+    [Av, Vc, phiVn] = cal_shear_strngth(db_stirrup, spec.stirrup_num, stirrup_spacing, fc, fy, B, d_eff)
+    [s_max, s_max1, s_max2] = check_stirrup_span_limit(Vu, Vc, fc, fy, B, d_eff, Av)
+    
+    if d is None:
+        d = d_eff
+    
+    # Compile results
+    results = {
+        # Input parameters - ใช้ค่าที่ผู้ใช้กรอกโดยตรง
+        'B': B*10, 'D': D*10, 'd': d*10, 'fc': fc, 'fy': fy,  # ใช้ค่าจริงที่กรอก
+        'main_rebar': main_rebar_size, 'main_num': main_rebar_num,
+        'comp_rebar': comp_rebar_size, 'comp_num': comp_rebar_num,
+        'stirrup': stirrup_size, 'stirrup_type': stirrup_type, 
+        'stirrup_spacing': stirrup_spacing*10,
+        'Mu': Mu, 'Vu': Vu, 'Tu': Tu,  # เปลี่ยนจาก Mu*10 เป็น Mu เพื่อใช้หน่วย tf ตรง ๆ
+        
+        # Calculated values - ใช้ค่าที่คำนวณได้จากฟังก์ชัน
+        'As': As, 'Ass': Ass, 'Asy': Asy,
+        'c': c, 'beta': beta, 'phi': phi,
+        'Cc': Cc, 'Cs': Cs, 'Mn': Mn, 'phiMn': phi*Mn,
+        'es': es, 'et': et, 'result0': result0, 'result1': result1, 'result2': result2,
+        'Av': Av, 'Vc': Vc, 'phiVn': phiVn, 's_max': s_max[0] if s_max[0] != 'no need for stirrup' else 'ไม่จำเป็นใช้เหล็กปลอก',
+        's_max1': s_max1, 's_max2': s_max2,  # เพิ่มค่าเงื่อนไขแยก
+        
+        # Effective depth from calculation for technical purposes
+        'd_eff': d_eff*10,  # เพิ่มค่า d_eff สำหรับการคำนวณภายใน
+        # ลบ beam_length เพราะไม่ใช้แล้ว
+        
+        # Check results
+        'moment_adequate': phi*Mn >= Mu,
+        'shear_adequate': phiVn >= Vu,
+        'moment_ratio': (phi*Mn) / Mu if Mu > 0 else float('inf'),
+        'shear_ratio': phiVn / Vu if Vu > 0 else float('inf'),
+        'spacing_adequate': stirrup_spacing*10 <= (s_max[0] if isinstance(s_max[0], (int, float)) else 600)
+    }
+    return results
+
+
 class ImprovedRCBeamCalculator(QtWidgets.QMainWindow):
     """
     คลาสหลักสำหรับเครื่องคำนวณคาน RC แบบปรับปรุง
@@ -112,6 +183,9 @@ class ImprovedRCBeamCalculator(QtWidgets.QMainWindow):
         super().__init__()
         self.ui = Ui_RcRecBeamCalImproved()
         self.ui.setupUi(self)
+        self.last_results = None
+        # รายงาน/แผนภาพที่สร้างแล้ว: kind -> (hash ของ last_results, ผลลัพธ์)
+        self.report_cache = {}
         self.setup_connections()
         self.setup_validators()
         self.load_sample_data()
@@ -135,24 +209,20 @@ class ImprovedRCBeamCalculator(QtWidgets.QMainWindow):
             (screen.height() - size.height()) // 2
         )
     
+    def effective_depth(self, depth, cover, main_rebar_text, stirrup_text):
+        """d = D - cover - stirrup_diameter - main_diameter/2 (มม.)"""
+        main_diameter = self.extract_rebar_diameter(main_rebar_text)
+        stirrup_diameter = self.extract_rebar_diameter(stirrup_text)
+        return float(depth) - float(cover) - stirrup_diameter - (main_diameter / 2)
+    
     def calculate_effective_depth(self):
         """คำนวณความลึกมีประสิทธิภาพอัตโนมัติตามหลักวิศวกรรม"""
         try:
             # ดึงค่าจาก UI
-            depth = float(self.ui.depth.text())
-            cover = float(self.ui.cover.text())
-            
-            # ดึงขนาดเหล็กรับแรงดึง
-            main_rebar_text = self.ui.main_rebar_size.currentText()
-            main_diameter = self.extract_rebar_diameter(main_rebar_text)
-            
-            # ดึงขนาดเหล็กปลอก
-            stirrup_text = self.ui.stirrup_size.currentText()
-            stirrup_diameter = self.extract_rebar_diameter(stirrup_text)
-            
-            # คำนวณความลึกมีประสิทธิภาพ
-            # d = D - cover - stirrup_diameter - main_diameter/2
-            effective_depth = depth - cover - stirrup_diameter - (main_diameter / 2)
+            effective_depth = self.effective_depth(
+                self.ui.depth.text(), self.ui.cover.text(),
+                self.ui.main_rebar_size.currentText(), self.ui.stirrup_size.currentText()
+            )
             
             # อัปเดต UI display
             self.ui.d_display.setText(f"{effective_depth:.0f} มม.")
@@ -173,27 +243,50 @@ class ImprovedRCBeamCalculator(QtWidgets.QMainWindow):
         self.ui.btn_export_pdf.clicked.connect(self.export_pdf)
         self.ui.btn_save.clicked.connect(self.save_data)
         
-        # Connect input validation
-        input_widgets = [
-            self.ui.width, self.ui.depth, self.ui.cover,  # ลบ self.ui.d เพราะคำนวณอัตโนมัติ
-            self.ui.fc, self.ui.fy, self.ui.main_rebar_num, self.ui.comp_rebar_num,
-            self.ui.stirrup_spacing, self.ui.moment, self.ui.shear
-        ]
+        # สร้างเนื้อหาแท็บเมื่อแท็บถูกแสดง
+        self.ui.tab_widget.currentChanged.connect(self.on_tab_changed)
         
-        for widget in input_widgets:
-            widget.textChanged.connect(self.validate_inputs)
-            widget.textChanged.connect(self.calculate_effective_depth)  # เพิ่มการคำนวณอัตโนมัติ
-            
-        # Connect combobox changes for effective depth calculation
-        combo_widgets = [self.ui.main_rebar_size, self.ui.stirrup_size]
-        for widget in combo_widgets:
-            widget.currentTextChanged.connect(self.calculate_effective_depth)
+        # Connect input validation - ตรวจสอบหลังหยุดพิมพ์ เฉพาะช่องที่ค่าเปลี่ยน
+        self.validation = ValidationScheduler(parent=self)
+        input_fields = {
+            'width': float, 'depth': float, 'cover': float,  # ลบ self.ui.d เพราะคำนวณอัตโนมัติ
+            'fc': float, 'fy': float, 'main_rebar_num': int, 'comp_rebar_num': int,
+            'stirrup_spacing': float, 'moment': float, 'shear': float
+        }
+        for name, parse in input_fields.items():
+            widget = getattr(self.ui, name)
+            self.validation.add_field(name, widget.text, parse)
+            self.validation.connect_field(name, widget.textChanged)
             
         # Connect combo box changes
-        self.ui.main_rebar_size.currentTextChanged.connect(self.validate_inputs)
-        self.ui.comp_rebar_size.currentTextChanged.connect(self.validate_inputs)
-        self.ui.stirrup_size.currentTextChanged.connect(self.validate_inputs)
-        self.ui.stirrup_type.currentTextChanged.connect(self.validate_inputs)
+        for name in ['main_rebar_size', 'comp_rebar_size', 'stirrup_size', 'stirrup_type']:
+            widget = getattr(self.ui, name)
+            self.validation.add_field(name, widget.currentText, str)
+            self.validation.connect_field(name, widget.currentTextChanged)
+        
+        # Checks in the order their messages are reported
+        validator = ModernInputValidator
+        self.validation.add_check('width', ['width'],
+            lambda w: validator.validate_positive_number(w, min_value=100, max_value=2000))
+        self.validation.add_check('depth', ['depth'],
+            lambda h: validator.validate_positive_number(h, min_value=200, max_value=2000))
+        # ลบการ validate effective depth เพราะคำนวณอัตโนมัติ
+        self.validation.add_check('cover', ['cover'],
+            lambda c: validator.validate_positive_number(c, min_value=20, max_value=100))
+        # ลบการ validate ความยาวคาน - ตามที่ผู้ใช้ร้องขอ
+        self.validation.add_check('materials', ['fc', 'fy'], validator.validate_material_properties)
+        self.validation.add_check('reinforcement', ['main_rebar_num', 'comp_rebar_num', 'stirrup_spacing'],
+                                  validator.validate_reinforcement)
+        self.validation.add_check('loading', ['moment', 'shear'], validator.validate_loading)
+        self.validation.add_check('dimensions', ['width', 'depth', 'cover', 'main_rebar_size', 'stirrup_size'],
+                                  self.check_beam_dimensions)
+        
+        self.validation.fieldsChanged.connect(self.on_fields_changed)
+        self.validation.validated.connect(self.show_validation_result)
+        
+        # Live what-if mode
+        self.validation.validated.connect(self.update_live_results)
+        self.ui.chk_live.toggled.connect(self.on_live_mode_toggled)
     
     def setup_validators(self):
         """ตั้งค่า input validators"""
@@ -239,86 +332,89 @@ class ImprovedRCBeamCalculator(QtWidgets.QMainWindow):
         self.ui.shear.setText(sample_data['shear'])
         # ลบการตั้งค่า torsion แล้ว
         
-        # คำนวณ effective depth อัตโนมัติหลังจากโหลดข้อมูล
-        self.calculate_effective_depth()
+        # ตรวจสอบและคำนวณ effective depth ทันทีหลังจากโหลดข้อมูล
+        self.validate_inputs()
     
     def validate_inputs(self):
-        """ตรวจสอบความถูกต้องของข้อมูลที่ป้อน"""
+        """ตรวจสอบความถูกต้องของข้อมูลที่ป้อนทันที (ไม่รอ debounce)"""
+        return self.validation.flush()
+    
+    def check_beam_dimensions(self, width, depth, cover, main_rebar_size, stirrup_size):
+        """Validate beam dimension relationships with the automatic effective depth"""
+        results = self.validation.results
+        if not all(results.get(name, (False, ""))[0] for name in ['width', 'depth', 'cover']):
+            return False, ""
+        # ใช้ effective depth ที่คำนวณอัตโนมัติ
+        d_calculated = self.effective_depth(depth, cover, main_rebar_size, stirrup_size)
+        return ModernInputValidator.validate_beam_dimensions(width, depth, d_calculated, cover)
+    
+    def on_fields_changed(self, names):
+        """คำนวณ effective depth ใหม่เฉพาะเมื่อค่าที่เกี่ยวข้องเปลี่ยน"""
+        if names & {'depth', 'cover', 'main_rebar_size', 'stirrup_size'}:
+            self.calculate_effective_depth()
+    
+    def show_validation_result(self, all_valid, error_msg):
+        """Enable calculate button only if all validations pass"""
+        self.ui.btn_calculate.setEnabled(all_valid)
+        
+        # Update status bar
+        if all_valid:
+            self.ui.statusbar.showMessage("ข้อมูลถูกต้อง - พร้อมคำนวณ", 2000)
+        elif error_msg:
+            self.ui.statusbar.showMessage(f"ข้อผิดพลาด: {error_msg}")
+    
+    def on_live_mode_toggled(self, checked):
+        """เปิดโหมดคำนวณสดแล้วคำนวณทันทีด้วยข้อมูลปัจจุบัน"""
+        if checked:
+            # validated ถูกส่งครั้งเดียว และเรียก update_live_results ให้เอง
+            self.validation.revalidate()
+    
+    def clear_live_labels(self):
+        """แสดง "-" แทนค่าที่ไม่ตรงกับข้อมูลปัจจุบัน"""
+        for label in self.ui.live_labels.values():
+            label.setText("-")
+    
+    def show_capacity_values(self, phiMn, Mu, phiVn, Vu, c, et):
+        """อัปเดตเฉพาะตัวเลขผลลัพธ์ (ไม่สร้างแผนภาพหรือรายงาน)"""
+        labels = self.ui.live_labels
+        labels['phiMn'].setText(f"{phiMn:.2f}")
+        labels['moment_ratio'].setText(f"{Mu / phiMn:.3f}" if phiMn > 0 else "-")
+        labels['phiVn'].setText(f"{phiVn:.2f}")
+        labels['shear_ratio'].setText(f"{Vu / phiVn:.3f}" if phiVn > 0 else "-")
+        labels['c'].setText(f"{c:.2f}")
+        labels['et'].setText(f"{et:.5f}")
+    
+    @traced
+    def update_live_results(self, all_valid=True, error_msg=""):
+        """Capacity check from the cached input values, for live mode"""
+        if not all_valid:
+            self.clear_live_labels()
+            return
+        if not self.ui.chk_live.isChecked():
+            return
+        start = time.perf_counter()
+        value = self.validation.value
         try:
-            # Validate dimensions
-            width_valid, width_msg = ModernInputValidator.validate_positive_number(
-                self.ui.width.text(), min_value=100, max_value=2000
-            )
-            
-            depth_valid, depth_msg = ModernInputValidator.validate_positive_number(
-                self.ui.depth.text(), min_value=200, max_value=2000
-            )
-            
-            # ลบการ validate effective depth เพราะคำนวณอัตโนมัติ
-            d_valid = True  # ไม่ต้องตรวจสอบเพราะคำนวณอัตโนมัติ
-            d_msg = ""
-            
-            cover_valid, cover_msg = ModernInputValidator.validate_positive_number(
-                self.ui.cover.text(), min_value=20, max_value=100
-            )
-            
-            # ลบการ validate ความยาวคาน - ตามที่ผู้ใช้ร้องขอ
-            
-            # Validate materials
-            mat_valid, mat_msg = ModernInputValidator.validate_material_properties(
-                self.ui.fc.text(), self.ui.fy.text()
-            )
-            
-            # Validate reinforcement
-            rebar_valid, rebar_msg = ModernInputValidator.validate_reinforcement(
-                self.ui.main_rebar_num.text(), self.ui.comp_rebar_num.text(), 
-                self.ui.stirrup_spacing.text()
-            )
-            
-            # Validate loading
-            load_valid, load_msg = ModernInputValidator.validate_loading(
-                self.ui.moment.text(), self.ui.shear.text()
-            )
-            
-            # Validate beam dimension relationships
-            if width_valid and depth_valid and d_valid and cover_valid:
-                # ใช้ effective depth ที่คำนวณอัตโนมัติ
-                d_calculated = self.calculate_effective_depth()
-                dim_valid, dim_msg = ModernInputValidator.validate_beam_dimensions(
-                    self.ui.width.text(), self.ui.depth.text(), 
-                    str(d_calculated), self.ui.cover.text()
-                )
-            else:
-                dim_valid = False
-                dim_msg = ""
-            
-            # Enable calculate button only if all validations pass
-            all_valid = all([width_valid, depth_valid, d_valid, cover_valid,
-                           mat_valid, rebar_valid, load_valid, dim_valid])
-            self.ui.btn_calculate.setEnabled(all_valid)
-            
-            # Update status bar
-            if all_valid:
-                self.ui.statusbar.showMessage("ข้อมูลถูกต้อง - พร้อมคำนวณ", 2000)
-            else:
-                error_msgs = [msg for valid, msg in [
-                    (width_valid, width_msg), (depth_valid, depth_msg), (d_valid, d_msg),
-                    (cover_valid, cover_msg), (mat_valid, mat_msg), 
-                    (rebar_valid, rebar_msg), (load_valid, load_msg), (dim_valid, dim_msg)
-                ] if not valid and msg]
-                
-                if error_msgs:
-                    self.ui.statusbar.showMessage(f"ข้อผิดพลาด: {error_msgs[0]}")
-                    
+            spec = RecBeamSpec(B=value('width') / 10, D=value('depth') / 10,  # mm to cm
+                               fc=value('fc'), fy=value('fy'),
+                               bar1=value('main_rebar_size'), bar2=value('comp_rebar_size'),
+                               tensilebar_num=value('main_rebar_num'), compressionbar_num=value('comp_rebar_num'),
+                               stirrup_size=value('stirrup_size'), stirrup_num=stirrup_info(value('stirrup_type')),
+                               stirrup_span=value('stirrup_spacing') / 10,  # mm to cm
+                               Mux=value('moment'), Vuy=value('shear'))
+            result = check_recbeam(spec)
         except Exception as e:
-            self.ui.statusbar.showMessage(f"เกิดข้อผิดพลาดในการตรวจสอบ: {str(e)}")
+            self.clear_live_labels()
+            report_exception('update_live_results', e)
+            return
+        self.show_capacity_values(result.phiMn, spec.Mux, result.phiVn, spec.Vuy, result.c, result.et)
+        elapsed = (time.perf_counter() - start) * 1000
+        self.ui.statusbar.showMessage(f"คำนวณสด {elapsed:.1f} ms - กดปุ่มคำนวณเพื่อสร้างแผนภาพและรายงาน", 2000)
     
+    @traced
     def calculate_beam(self):
         """คำนวณคาน RC ใช้ฟังก์ชันจากไฟล์เดิม"""
         try:
-            # ตรวจสอบข้อมูลที่ได้รับจาก UI
-            print("=== ตรวจสอบข้อมูลที่ได้รับจาก UI ===")
-            
             # Get input values - use ksc units directly (no conversion needed)
             B = float(self.ui.width.text()) / 10   # mm to cm
             D = float(self.ui.depth.text()) / 10   # mm to cm
@@ -326,8 +422,6 @@ class ImprovedRCBeamCalculator(QtWidgets.QMainWindow):
             # ลบ L = float(self.ui.length.text()) - ไม่ใช้ความยาวคานแล้ว
             fc = float(self.ui.fc.text())          # ksc (already in correct units)
             fy = float(self.ui.fy.text())          # ksc (already in correct units)
-            print(f"มิติคาน: B={B*10:.0f} มม., D={D*10:.0f} มม., d={d*10:.0f} มม. (คำนวณอัตโนมัติ)")
-            print(f"กำลังวัสดุ: fc={fc:.1f} ksc, fy={fy:.1f} ksc")
             
             # Reinforcement details
             main_rebar_size = self.ui.main_rebar_size.currentText()
@@ -337,82 +431,70 @@ class ImprovedRCBeamCalculator(QtWidgets.QMainWindow):
             stirrup_size = self.ui.stirrup_size.currentText()
             stirrup_type = self.ui.stirrup_type.currentText()
             stirrup_spacing = float(self.ui.stirrup_spacing.text()) / 10  # mm to cm
-            print(f"เหล็กหลัก: {main_rebar_size} x{main_rebar_num}, เหล็กอัด: {comp_rebar_size} x{comp_rebar_num}")
-            print(f"เหล็กปลอก: {stirrup_size} {stirrup_type} @{stirrup_spacing*10:.0f} มม.")
             
             # Loading (use tf units directly - no conversion needed)
             Mu = float(self.ui.moment.text())      # tf-m (already in correct units)
             Vu = float(self.ui.shear.text())       # tf (already in correct units) 
             Tu = 0.0  # ลบช่องกรอก torsion แล้ว ตั้งค่าเป็น 0
-            print(f"แรงกระทำ: Mu={Mu:.2f} tf-m, Vu={Vu:.2f} tf, Tu={Tu:.2f} tf-m")
-            
-            # Get material and section properties using original functions
-            PrtctT = get_clear_cover('Beam')  # cm
-            stirrup_num = stirrup_info(stirrup_type)
-            
-            [beta, Ec, db_rebar1, Ab_rebar1, db_rebar2, Ab_rebar2, As, Ass, d_eff, dt, dd, 
-             db_stirrup, Ab_stirrup, RebarAllowNumPerRow1, RebarAllowNumPerRow2] = get_section_info(
-                B, D, fc, fy, main_rebar_size, comp_rebar_size, main_rebar_num, 
-                comp_rebar_num, stirrup_size, PrtctT, 'no', "Beam"
-            )
-            
-            # Calculate moment strength using original function
-            [Asy, result0, c, Cc, Cs, Mn] = cal_recbeam_Mn(dd, fc, beta, B, d_eff, fy, Ass, As)
-            [es, et, result1, result2, phi] = cal_phi(c, d_eff, dt)
-            
-            # Calculate shear strength using original function
-            [Av, Vc, phiVn] = cal_shear_strngth(db_stirrup, stirrup_num, stirrup_spacing, fc, fy, B, d_eff)
-            [s_max, s_max1, s_max2] = check_stirrup_span_limit(Vu, Vc, fc, fy, B, d_eff, Av)
-            
-            # Compile results
-            results = {
-                # Input parameters - ใช้ค่าที่ผู้ใช้กรอกโดยตรง
-                'B': B*10, 'D': D*10, 'd': d*10, 'fc': fc, 'fy': fy,  # ใช้ค่าจริงที่กรอก
-                'main_rebar': main_rebar_size, 'main_num': main_rebar_num,
-                'comp_rebar': comp_rebar_size, 'comp_num': comp_rebar_num,
-                'stirrup': stirrup_size, 'stirrup_type': stirrup_type, 
-                'stirrup_spacing': stirrup_spacing*10,
-                'Mu': Mu, 'Vu': Vu, 'Tu': Tu,  # เปลี่ยนจาก Mu*10 เป็น Mu เพื่อใช้หน่วย tf ตรง ๆ
-                
-                # Calculated values - ใช้ค่าที่คำนวณได้จากฟังก์ชัน
-                'As': As, 'Ass': Ass, 'Asy': Asy,
-                'c': c, 'beta': beta, 'phi': phi,
-                'Cc': Cc, 'Cs': Cs, 'Mn': Mn, 'phiMn': phi*Mn,
-                'es': es, 'et': et, 'result0': result0, 'result1': result1, 'result2': result2,
-                'Av': Av, 'Vc': Vc, 'phiVn': phiVn, 's_max': s_max[0] if s_max[0] != 'no need for stirrup' else 'ไม่จำเป็นใช้เหล็กปลอก',
-                's_max1': s_max1, 's_max2': s_max2,  # เพิ่มค่าเงื่อนไขแยก
-                
-                # Effective depth from calculation for technical purposes
-                'd_eff': d_eff*10,  # เพิ่มค่า d_eff สำหรับการคำนวณภายใน
-                # ลบ beam_length เพราะไม่ใช้แล้ว
-                
-                # Check results
-                'moment_adequate': phi*Mn >= Mu,
-                'shear_adequate': phiVn >= Vu,
-                'moment_ratio': (phi*Mn) / Mu if Mu > 0 else float('inf'),
-                'shear_ratio': phiVn / Vu if Vu > 0 else float('inf'),
-                'spacing_adequate': stirrup_spacing*10 <= (s_max[0] if isinstance(s_max[0], (int, float)) else 600)
-            }
+            # บันทึกข้อมูลนำเข้าลง trace log เมื่อเปิด RC_TRACE_VALUES (ดู tracing.py)
+            trace_value('calculate_beam', B=B, D=D, d=d, fc=fc, fy=fy,
+                        main_rebar=main_rebar_size, main_num=main_rebar_num,
+                        comp_rebar=comp_rebar_size, comp_num=comp_rebar_num,
+                        stirrup=stirrup_size, stirrup_type=stirrup_type, stirrup_spacing=stirrup_spacing,
+                        Mu=Mu, Vu=Vu, Tu=Tu)
+            
+            spec = RecBeamSpec(B=B, D=D, fc=fc, fy=fy, bar1=main_rebar_size, bar2=comp_rebar_size,
+                               tensilebar_num=main_rebar_num, compressionbar_num=comp_rebar_num,
+                               stirrup_size=stirrup_size, stirrup_num=stirrup_info(stirrup_type),
+                               stirrup_span=stirrup_spacing, Mux=Mu, Vuy=Vu)
+            results = beam_report_results(spec, stirrup_type, d, Tu)
             
             # Store results for PDF export
             self.last_results = results
-            
-            # Display results with detailed formulas
-            self.display_detailed_results(results)
-            
-            # Generate section diagram
-            self.generate_section_diagram(results)
+            self.show_capacity_values(results['phiMn'], Mu, results['phiVn'], Vu, results['c'], results['et'])
             
             # Update status
             self.ui.statusbar.showMessage("คำนวณเสร็จสิ้น", 3000)
             
-            # Switch to results tab
+            # Switch to results tab - แผนภาพและรายงานสร้างเมื่อเปิดแท็บนั้น
             self.ui.tab_widget.setCurrentIndex(0)
+            self.on_tab_changed(self.ui.tab_widget.currentIndex())
             
         except Exception as e:
             QMessageBox.critical(self, "ข้อผิดพลาด", f"เกิดข้อผิดพลาดในการคำนวณ:\n{str(e)}")
-            import traceback
-            print(traceback.format_exc())
+            report_exception('calculate_beam', e)
+    
+    def results_key(self, results):
+        """Hash of a results dict, used to memoize report artefacts"""
+        text = json.dumps(results, sort_keys=True, default=repr)
+        return hashlib.sha1(text.encode('utf-8')).hexdigest()
+    
+    def cached_artifact(self, kind, build):
+        """build(last_results) once per distinct result; later calls reuse the stored value
+
+        Only successful builds are kept: if build raises or returns None the
+        next call builds again.
+        """
+        key = self.results_key(self.last_results)
+        cached = self.report_cache.get(kind)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        value = build(self.last_results)
+        if value is not None:
+            self.report_cache[kind] = (key, value)
+        return value
+    
+    def on_tab_changed(self, index):
+        """แสดงผลลัพธ์ แผนภาพ หรือรายงานของแท็บที่เปิด (ไม่วาดซ้ำถ้าผลลัพธ์เดิม)"""
+        if self.last_results is None:
+            return
+        builders = {
+            0: self.display_detailed_results,   # ผลลัพธ์การคำนวณ
+            1: self.generate_section_diagram,   # แผนภาพ
+            2: self.display_markdown_report     # รายงาน
+        }
+        if index in builders:
+            self.cached_artifact(('tab', index), builders[index])
     
     def perform_beam_calculation(self, b, h, d, fc, fy, Mu):
         """ดำเนินการคำนวณคาน (Simplified ACI 318)"""
@@ -588,10 +670,13 @@ class ImprovedRCBeamCalculator(QtWidgets.QMainWindow):
 """
         # Display in results tab
         self.ui.results_text.setText(results_text)
-        
-        # Generate Markdown report with LaTeX equations
+        return True
+    
+    def display_markdown_report(self, results):
+        """Generate Markdown report with LaTeX equations for the report tab"""
         markdown_report = self.generate_markdown_report(results)
         self.ui.report_text.setHtml(markdown_report)
+        return True
     
     def generate_markdown_report(self, results):
         """สร้างรายงานรูปแบบ Markdown แบบมีรูปแบบสวยงาม"""
@@ -1223,9 +1308,7 @@ class ImprovedRCBeamCalculator(QtWidgets.QMainWindow):
             self.report_figure = fig
             
         except Exception as e:
-            print(f"Error generating detailed report: {e}")
-            import traceback
-            print(traceback.format_exc())
+            report_exception('generate_detailed_report', e)
             
     def draw_beam_section(self, ax, results):
         """วาดแผนภาพหน้าตัดคาน"""
@@ -1536,11 +1619,10 @@ class ImprovedRCBeamCalculator(QtWidgets.QMainWindow):
                         child.widget().deleteLater()
                 
                 layout.addWidget(canvas)
+                return True
             
         except Exception as e:
-            print(f"Error generating section diagram: {e}")
-            import traceback
-            print(traceback.format_exc())
+            report_exception('generate_section_diagram', e)
             
             # Show error message in widget
             if hasattr(self.ui, 'plot_widget'):
@@ -1583,11 +1665,16 @@ class ImprovedRCBeamCalculator(QtWidgets.QMainWindow):
             self.ui.stirrup_type.setCurrentText('เหล็กปลอกสองขา')
             
             # Reset effective depth display
+            self.validate_inputs()
             self.ui.d_display.setText("จะคำนวณจากความสูง - ระยะหุ้ม - ขนาดเหล็ก")
             
             # Clear output areas
             self.ui.results_text.clear()
             self.ui.report_text.clear()
+            self.clear_live_labels()
+            # ผลลัพธ์ที่วาดไว้ถูกล้างแล้ว คำนวณครั้งต่อไปต้องสร้างใหม่แม้ข้อมูลเหมือนเดิม
+            self.last_results = None
+            self.report_cache.clear()
             
             self.ui.statusbar.showMessage("ล้างข้อมูลเรียบร้อย", 2000)
     
@@ -1701,7 +1788,6 @@ class ImprovedRCBeamCalculator(QtWidgets.QMainWindow):
                 return
                 
             import os
-            from matplotlib.backends.backend_pdf import PdfPages
             
             # เลือกที่ตั้งไฟล์
             default_name = f"RC_Beam_Report_Enhanced_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
@@ -1710,52 +1796,75 @@ class ImprovedRCBeamCalculator(QtWidgets.QMainWindow):
             )
             
             if file_path:
-                # สร้าง multi-page PDF
-                with PdfPages(file_path) as pdf:
-                    try:
-                        # หน้าที่ 1: ข้อมูลพื้นฐานและแผนภาพคาน
-                        fig1 = self.create_pdf_page_1(self.last_results, setup_font_for_pdf())
-                        if fig1:
-                            pdf.savefig(fig1, bbox_inches='tight', dpi=300)
-                            plt.close(fig1)
-                        
-                        # หน้าที่ 2: การคำนวณโมเมนต์และแรงเฉือน  
-                        fig2 = self.create_pdf_page_2(self.last_results, setup_font_for_pdf())
-                        if fig2:
-                            pdf.savefig(fig2, bbox_inches='tight', dpi=300)
-                            plt.close(fig2)
-                        
-                        # หน้าที่ 3: ผลการตรวจสอบและสรุป
-                        fig3 = self.create_pdf_page_3(self.last_results, setup_font_for_pdf())
-                        if fig3:
-                            pdf.savefig(fig3, bbox_inches='tight', dpi=300)
-                            plt.close(fig3)
-                        
-                        # เก็บข้อมูล metadata
-                        d = pdf.infodict()
-                        d['Title'] = 'รายงานการคำนวณคาน RC ตามมาตรฐาน ACI 318'
-                        d['Author'] = 'RC Beam Analysis Program'
-                        d['Subject'] = 'การวิเคราะห์และออกแบบคาน RC'
-                        d['Keywords'] = 'RC Beam, ACI 318, Concrete Design'
-                        d['Creator'] = 'RC Beam Analysis Program v.1.0'
-                        d['Producer'] = 'Enhanced PDF Generator'
-                        
-                    except Exception as e:
-                        print(f"Error generating PDF pages: {e}")
-                        # Fallback to single page PDF
-                        pdf_fig = self.create_a4_report_figure(self.last_results)
-                        if pdf_fig:
-                            pdf.savefig(pdf_fig, bbox_inches='tight', dpi=300)
-                            plt.close(pdf_fig)
+                # ส่งออกซ้ำด้วยผลลัพธ์เดิมใช้ไฟล์ที่สร้างไว้แล้ว
+                try:
+                    pdf_bytes = self.cached_artifact('pdf', self.render_pdf_report)
+                except RenderCancelled:
+                    self.ui.statusbar.showMessage("ยกเลิกการส่งออก PDF", 3000)
+                    return
+                with open(file_path, 'wb') as f:
+                    f.write(pdf_bytes)
                 
                 QMessageBox.information(self, "สำเร็จ", f"บันทึกรายงาน PDF คุณภาพสูงแบบหลายหน้าเรียบร้อย\n{file_path}")
                 self.ui.statusbar.showMessage(f"ส่งออก Enhanced PDF: {os.path.basename(file_path)}", 3000)
             
         except Exception as e:
             QMessageBox.critical(self, "ข้อผิดพลาด", f"ไม่สามารถส่งออก PDF ได้:\n{str(e)}")
-            print(f"PDF export error: {e}")
-            import traceback
-            print(traceback.format_exc())
+            report_exception('export_pdf', e)
+    
+    def render_pdf_report(self, results):
+        """สร้างรายงาน PDF หลายหน้า คืนค่าเป็น bytes (วาดแต่ละหน้าพร้อมกันใน worker process)"""
+        progress = QtWidgets.QProgressDialog("กำลังสร้างรายงาน PDF...", "ยกเลิก", 0, len(PAGE_BUILDERS), self)
+        progress.setWindowTitle("ส่งออก PDF")
+        progress.setWindowModality(QtCore.Qt.WindowModal)
+        progress.setMinimumDuration(0)
+        
+        def report_progress(done, total):
+            progress.setValue(done)
+            QtWidgets.QApplication.processEvents()
+            if progress.wasCanceled():
+                raise RenderCancelled()
+        
+        try:
+            return render_report_pdf(results, progress=report_progress)
+        except RenderCancelled:
+            raise
+        except Exception as e:
+            # worker ล้มเหลว ใช้การวาดทีละหน้าแบบเดิม
+            report_exception('render_pdf_report', e)
+            return self.render_pdf_report_serial(results)
+        finally:
+            progress.close()
+    
+    def render_pdf_report_serial(self, results):
+        """สร้างรายงาน PDF หลายหน้าทีละหน้าในโปรเซสหลัก คืนค่าเป็น bytes"""
+        import io
+        from matplotlib.backends.backend_pdf import PdfPages
+        
+        buffer = io.BytesIO()
+        # สร้าง multi-page PDF
+        with PdfPages(buffer) as pdf:
+            try:
+                for builder in PAGE_BUILDERS:
+                    fig = getattr(self, builder)(results, setup_font_for_pdf())
+                    if fig:
+                        pdf.savefig(fig, bbox_inches='tight', dpi=PDF_DPI)
+                        plt.close(fig)
+                
+                # เก็บข้อมูล metadata
+                d = pdf.infodict()
+                for key, value in PDF_INFO.items():
+                    d[key.capitalize()] = value
+                
+            except Exception as e:
+                report_exception('render_pdf_report_serial', e)
+                # Fallback to single page PDF
+                pdf_fig = self.create_a4_report_figure(results)
+                if pdf_fig:
+                    pdf.savefig(pdf_fig, bbox_inches='tight', dpi=PDF_DPI)
+                    plt.close(pdf_fig)
+        
+        return buffer.getvalue()
     
     def create_pdf_report_figure(self, results):
         """สร้าง figure ใหม่สำหรับ PDF export"""
@@ -1920,7 +2029,8 @@ class ImprovedRCBeamCalculator(QtWidgets.QMainWindow):
             print(f"Error creating A4 report figure: {e}")
             return None
     
-    def create_pdf_page_1(self, results, font_used):
+    @staticmethod
+    def create_pdf_page_1(results, font_used):
         """สร้างหน้าที่ 1: ข้อมูลพื้นฐานและแผนภาพคาน"""
         try:
             # สร้าง figure ขนาด A4 แนวตั้ง
@@ -1963,7 +2073,7 @@ class ImprovedRCBeamCalculator(QtWidgets.QMainWindow):
             
             # 2. แผนภาพหน้าตัดคาน (ขนาดใหญ่และชัดเจน แต่ไม่ซ้อนทับข้อมูล)
             ax2 = plt.subplot(3, 1, 2)
-            self.draw_detailed_beam_section_for_pdf(ax2, results, font_used)
+            ImprovedRCBeamCalculator.draw_detailed_beam_section_for_pdf(ax2, results, font_used)
             ax2.set_title('แผนภาพหน้าตัดคาน', 
                          fontsize=14, fontweight='bold', fontfamily=font_used, pad=15)
             
@@ -1999,7 +2109,8 @@ class ImprovedRCBeamCalculator(QtWidgets.QMainWindow):
             print(f"Error creating PDF page 1: {e}")
             return None
     
-    def draw_detailed_beam_section_for_pdf(self, ax, results, font_used):
+    @staticmethod
+    def draw_detailed_beam_section_for_pdf(ax, results, font_used):
         """วาดแผนภาพหน้าตัดคานแบบละเอียดสำหรับ PDF"""
         try:
             # ข้อมูลมิติ
@@ -2132,7 +2243,8 @@ class ImprovedRCBeamCalculator(QtWidgets.QMainWindow):
         except Exception as e:
             print(f"Error drawing beam section: {e}")
     
-    def create_pdf_page_2(self, results, font_used):
+    @staticmethod
+    def create_pdf_page_2(results, font_used):
         """สร้างหน้าที่ 2: การคำนวณโมเมนต์และแรงเฉือน"""
         try:
             # สร้าง figure ขนาด A4 แนวตั้ง
@@ -2207,7 +2319,8 @@ class ImprovedRCBeamCalculator(QtWidgets.QMainWindow):
             print(f"Error creating PDF page 2: {e}")
             return None
     
-    def create_pdf_page_3(self, results, font_used):
+    @staticmethod
+    def create_pdf_page_3(results, font_used):
         """สร้างหน้าที่ 3: ผลการตรวจสอบความปลอดภัยและสรุป"""
         try:
             # สร้าง figure ขนาด A4 แนวตั้ง
@@ -2563,9 +2676,7 @@ class ImprovedRCBeamCalculator(QtWidgets.QMainWindow):
             return fig
             
         except Exception as e:
-            print(f"Error creating PDF figure: {e}")
-            import traceback
-            print(traceback.format_exc())
+            report_exception('create_corrected_pdf_report_figure', e)
             return None
         """สร้าง figure ใหม่สำหรับ PDF export พร้อมแก้ไขปัญหาภาษา"""
         try:
@@ -0,0 +1,122 @@
+"""
+Debounced, incremental validation of form inputs.
+
+Fields are registered with a reader (returns the widget text) and a
+parser; checks are registered with the fields they depend on. Editing a
+field only marks it dirty and restarts a single-shot timer, so a burst of
+keystrokes costs one validation pass after the typing pauses. On that pass
+only the dirty fields are read and parsed, and only the checks that depend
+on a field whose text actually changed are re-run. Other check results and
+every parsed value stay cached.
+
+Checks receive the parsed values of their fields in order. A field that
+does not parse is passed as its raw text, so ModernInputValidator style
+checks report their own message for it.
+"""
+from PyQt5 import QtCore
+
+DEFAULT_DELAY_MS=250
+
+
+class ValidationScheduler(QtCore.QObject):
+    """Coalesces field edits and re-validates what changed.
+
+    fieldsChanged carries the set of field names whose text changed since
+    the last pass. validated carries (all checks pass, first error message).
+    Both are emitted only when something changed.
+    """
+    fieldsChanged=QtCore.pyqtSignal(object)
+    validated=QtCore.pyqtSignal(bool,str)
+
+    def __init__(self,delay_ms=DEFAULT_DELAY_MS,parent=None):
+        super(ValidationScheduler,self).__init__(parent)
+        self.timer=QtCore.QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(delay_ms)
+        self.timer.timeout.connect(self.flush)
+        self.fields={} #name -> (reader, parser)
+        self.checks={} #name -> (field names, func), 依加入順序回報錯誤
+        self.texts={}
+        self.values={}
+        self.results={}
+        self.dirty=set()
+
+    def add_field(self,name,read,parse=float):
+        self.fields[name]=(read,parse)
+
+    def add_check(self,name,fields,func):
+        self.checks[name]=(tuple(fields),func)
+        self.results.pop(name,None)
+
+    def connect_field(self,name,signal):
+        """Schedule validation of a field whenever signal fires."""
+        signal.connect(lambda *args: self.schedule(name))
+
+    def schedule(self,name):
+        self.dirty.add(name)
+        self.timer.start()
+
+    def value(self,name):
+        """Cached parsed value of a field, None if it did not parse."""
+        return self.values.get(name)
+
+    def is_pending(self):
+        return self.timer.isActive()
+
+    def _read(self,names):
+        changed=set()
+        for name in names :
+            [read,parse]=self.fields[name]
+            text=read()
+            if name in self.texts and self.texts[name]==text :
+                continue
+            self.texts[name]=text
+            try :
+                self.values[name]=parse(text)
+            except (ValueError,TypeError) :
+                self.values[name]=None
+            changed.add(name)
+        return changed
+
+    def _run_check(self,name):
+        [fields,func]=self.checks[name]
+        args=[self.texts[f] if self.values[f] is None else self.values[f] for f in fields]
+        try :
+            return func(*args)
+        except Exception as e :
+            return False,str(e)
+
+    def status(self):
+        """(all checks pass, first error message) from the cached results."""
+        errors=[msg for valid,msg in self.results.values() if not valid]
+        return not errors and len(self.results)==len(self.checks),next((msg for msg in errors if msg),"")
+
+    def _flush(self):
+        """Run the pending validation. Returns whether validated was emitted."""
+        self.timer.stop()
+        #尚未讀取過的欄位一併讀取
+        names=(self.dirty|set(self.fields).difference(self.texts))&set(self.fields)
+        self.dirty.clear()
+        changed=self._read(names)
+        stale=[name for name,(fields,func) in self.checks.items() if name not in self.results or changed.intersection(fields)]
+        for name in stale :
+            self.results[name]=self._run_check(name)
+        #依檢核加入順序排列結果
+        self.results={name: self.results[name] for name in self.checks}
+        if changed :
+            self.fieldsChanged.emit(changed)
+        if changed or stale :
+            self.validated.emit(*self.status())
+            return True
+        return False
+
+    def flush(self):
+        """Run the pending validation now. Returns status()."""
+        self._flush()
+        return self.status()
+
+    def revalidate(self):
+        """Like flush(), but validated is emitted exactly once even if nothing changed."""
+        if not self._flush() :
+            self.validated.emit(*self.status())
+        return self.status()
@@ -7,10 +7,12 @@ from rc_tbeamcal_base import tbeam_cal_button_clicked
 from ui_rc_beamdsgn import Ui_RcBeamDsgn
 from rc_beamdsgn_base import beam_dsgn_button_clicked
 from ui_rc_columncal import Ui_RcColumnCal
-from rc_columncal_base import column_cal_button_clicked
+from rc_columncal_base import read_column_spec,show_column_result
+from column_worker import ColumnCalWorker
 from beam_function import bar_allowable_num_clicked
 from  dataframe_model import  DataFrameModel
 from language_manager import lang_manager
+from tracing import report_exception
 
 class MenuController(QtWidgets.QMainWindow):
   # signal=QtCore.pyqtSignal(list)
@@ -178,11 +180,83 @@ class W5Controller(Ui_RcColumnCal,W2Controller,QtWidgets.QMainWindow):
     self.barallowbutton.clicked.connect(lambda:bar_allowable_num_clicked(self,'Column'))
     self.PicChangeButton.clicked.connect(self.picchangeclicked)
     self.signal.connect(self.aa)
+    self.worker=None
+    self.stopped_workers=[] #已取消但尚未結束的執行緒
+    self.cancelbutton=QtWidgets.QPushButton(self.centralwidget)
+    self.cancelbutton.setGeometry(QtCore.QRect(600, 320, 81, 41))
+    self.cancelbutton.setStyleSheet("background-color: rgb(255, 170, 0);")
+    self.cancelbutton.setText(lang_manager.tr("common.cancel", "Cancel"))
+    self.cancelbutton.setEnabled(False)
+    self.cancelbutton.clicked.connect(self.cancelbutton_clicked)
 
   def calbutton_clicked(self):
+    #再次按下時取消執行中的計算並重新開始
+    self.stop_worker()
+    try :
+      spec=read_column_spec(self)
+    except Exception :
+      self.textBrowser.setText(lang_manager.tr('results.please_input_parameters'))
+      return
+    bar_allowable_num_clicked(self,'Column')
     self.textBrowser.setText('running.......')
-    QtWidgets.QApplication.processEvents()
-    column_cal_button_clicked(self)
+    self.worker=ColumnCalWorker(spec,self)
+    self.worker.progressed.connect(self.worker_progressed)
+    self.worker.succeeded.connect(self.worker_succeeded)
+    self.worker.failed.connect(self.worker_failed)
+    self.worker.cancelled.connect(self.worker_cancelled)
+    self.worker.finished.connect(self.worker_finished)
+    self.worker.finished.connect(self.worker.deleteLater)
+    self.cancelbutton.setEnabled(True)
+    self.worker.start()
+
+  def cancelbutton_clicked(self):
+    self.stop_worker()
+    self.textBrowser.setText(lang_manager.tr('common.cancelled', 'Cancelled'))
+
+  def stop_worker(self):
+    if self.worker is None :
+      return
+    worker=self.worker
+    self.worker=None
+    #舊的計算結果不再顯示, 執行緒在下一個互制點結束
+    for sig in (worker.progressed,worker.succeeded,worker.failed,worker.cancelled):
+      sig.disconnect()
+    worker.requestInterruption()
+    if worker.isRunning():
+      self.stopped_workers.append(worker)
+    self.cancelbutton.setEnabled(False)
+
+  def closeEvent(self,event):
+    #視窗關閉時 (可能結束程式) 先停止並等待所有計算執行緒
+    self.stop_worker()
+    for worker in self.stopped_workers:
+      worker.requestInterruption()
+      worker.wait()
+    self.stopped_workers=[]
+    super(W5Controller,self).closeEvent(event)
+
+  def worker_progressed(self,n_points):
+    self.textBrowser.setText('running....... '+str(n_points)+' P-M points')
+
+  def worker_succeeded(self,result):
+    try :
+      show_column_result(self,result)
+    except Exception as e:
+      self.worker_failed(e)
+
+  def worker_failed(self,error):
+    self.textBrowser.setText(lang_manager.tr('results.please_input_parameters'))
+    report_exception('column_calculation',error)
+
+  def worker_cancelled(self):
+    self.textBrowser.setText(lang_manager.tr('common.cancelled', 'Cancelled'))
+
+  def worker_finished(self):
+    if self.sender() is self.worker :
+      self.worker=None
+      self.cancelbutton.setEnabled(False)
+    elif self.sender() in self.stopped_workers :
+      self.stopped_workers.remove(self.sender())
 
   def aa(self,result):
     self.result=result
@@ -0,0 +1,126 @@
+"""
+Vectorized neutral-axis solve for rectangular and T sections with tension
+and compression steel.
+
+solve_tbeam_c finds the neutral-axis depth c from force equilibrium with
+strain compatibility (ecu = 0.003, Es = 2040000 kgf/cm2):
+
+    0.85*fc*Ac(beta*c) + Ass*(fs' - 0.85*fc) = As*fs
+    Ac(a) = be*a (a <= hf),  be*hf + B*(a-hf) (a > hf)
+    fs' = Es*0.003*(c-dd)/c,  fs = Es*0.003*(d-c)/c,  both limited to +-fy
+
+solve_recbeam_c is the same solve with be = B. The residual is increasing
+in c, so it has one root. The stress limits and the flange depth split c
+into at most six intervals. The residual is evaluated at the breakpoints
+to find the interval of the root. On that interval the equation is a
+quadratic with a fixed form, and it is solved with the cancellation-free
+root formula. Everything is elementwise, with no Python loop or branch per
+section, and any input may be an array.
+
+status holds the steel states (STATUS_* flags) or a negative error code;
+c is NaN wherever status < 0.
+"""
+import numpy as np
+
+ES_STRAIN=6120 #Es*0.003 (kgf/cm2)
+
+#鋼筋狀態旗標
+STATUS_CS_ELASTIC=1 #壓筋未降伏
+STATUS_TS_ELASTIC=2 #拉筋未降伏
+STATUS_CS_IN_TENSION=4 #壓筋位於中性軸下方
+STATUS_T_SHAPE=8 #壓力區深入腹板 (T形)
+#錯誤代碼
+ERROR_INPUT=-1 #尺寸或材料參數不合理 (<=0 或 NaN)
+ERROR_NO_STEEL=-2 #無鋼筋, 無中性軸解
+
+
+def _stress(strain_stress,fy):
+    return np.clip(strain_stress,-fy,fy)
+
+
+def _concrete_area(a,B,be,hf):
+    return be*np.minimum(a,hf)+B*np.maximum(a-hf,0)
+
+
+def _residual(c,dd,fc,beta,B,d,fy,Ass,As,be,hf):
+    c=np.maximum(c,1e-12)
+    fs_c=_stress(ES_STRAIN*(c-dd)/c,fy)
+    fs_t=_stress(ES_STRAIN*(d-c)/c,fy)
+    return 0.85*fc*_concrete_area(beta*c,B,be,hf)+Ass*(fs_c-0.85*fc)-As*fs_t
+
+
+def solve_tbeam_c(dd,fc,beta,B,d,fy,Ass,As,be,hf):
+    """Neutral-axis depth of a T section on arrays. Returns c, fs' (compression
+    steel), fs (tension steel) and status, broadcast to a common shape."""
+    [dd,fc,beta,B,d,fy,Ass,As,be,hf]=np.broadcast_arrays(*(np.asarray(x,dtype=float)
+                                                          for x in (dd,fc,beta,B,d,fy,Ass,As,be,hf)))
+    with np.errstate(divide='ignore',invalid='ignore',over='ignore') :
+        valid=((B>0)&(be>=B)&(hf>0)&(fc>0)&(fy>0)&(beta>0)&(d>0)&(dd>=0)&(Ass>=0)&(As>=0)
+               &np.isfinite(dd+fc+beta+B+be+d+fy+Ass+As)&~np.isnan(hf))
+        no_steel=valid&(As+Ass<=0)
+        #應力達 +-fy 及壓力區達翼板底的中性軸深度
+        k_plus=ES_STRAIN/(ES_STRAIN+fy)
+        k_minus=np.where(fy<ES_STRAIN,ES_STRAIN/(ES_STRAIN-fy),np.inf)
+        breaks=np.sort(np.stack([k_plus*dd,k_minus*dd,k_plus*d,k_minus*d,hf/beta],axis=-1),axis=-1)
+        ex=lambda x: x[...,None]
+        F=_residual(breaks,ex(dd),ex(fc),ex(beta),ex(B),ex(d),ex(fy),ex(Ass),ex(As),ex(be),ex(hf))
+        F=np.where(np.isinf(breaks),np.inf,F)
+        k=np.sum(F<0,axis=-1)
+        bounds=np.concatenate([np.zeros(breaks.shape[:-1]+(1,)),breaks,np.full(breaks.shape[:-1]+(1,),np.inf)],axis=-1)
+        lo=np.take_along_axis(bounds,k[...,None],axis=-1)[...,0]
+        hi=np.take_along_axis(bounds,k[...,None]+1,axis=-1)[...,0]
+        mid=np.where(np.isinf(hi),2*lo+d,0.5*(lo+hi))
+        mid=np.where(np.isfinite(mid)&(mid>0),mid,1.0)
+
+        #區間內各鋼筋的狀態: 0 彈性, 1 依設計方向降伏 (壓筋受壓, 拉筋受拉), -1 反向降伏
+        eps_c=ES_STRAIN*(mid-dd)/mid
+        state_c=np.where(eps_c>=fy,1,np.where(eps_c<=-fy,-1,0))
+        eps_t=ES_STRAIN*(d-mid)/mid
+        state_t=np.where(eps_t>=fy,1,np.where(eps_t<=-fy,-1,0))
+        web=beta*mid>hf
+        #a*c^2+b*c+q=0
+        a=0.85*fc*beta*np.where(web,B,be)
+        b=(Ass*np.where(state_c==0,ES_STRAIN,state_c*fy)-Ass*0.85*fc
+           +As*np.where(state_t==0,ES_STRAIN,-state_t*fy)
+           +np.where(web,0.85*fc*(be-B)*hf,0))
+        q=-ES_STRAIN*(Ass*dd*(state_c==0)+As*d*(state_t==0))
+        root=np.sqrt(np.maximum(b*b-4*a*q,0))
+        #避免相減消去誤差
+        c=np.where(b>0,-2*q/(b+root),(-b+root)/(2*a))
+        c=np.clip(c,lo,hi)
+
+        fs_c=_stress(ES_STRAIN*(c-dd)/c,fy)
+        fs_t=_stress(ES_STRAIN*(d-c)/c,fy)
+        t_shape=(beta*c>hf)&(be>B)
+    status=((np.abs(fs_c)<fy)*STATUS_CS_ELASTIC+(np.abs(fs_t)<fy)*STATUS_TS_ELASTIC
+            +(fs_c<0)*STATUS_CS_IN_TENSION+t_shape*STATUS_T_SHAPE).astype(np.int8)
+    status=np.where(valid,np.where(no_steel,ERROR_NO_STEEL,status),ERROR_INPUT).astype(np.int8)
+    bad=status<0
+    c=np.where(bad,np.nan,c)
+    fs_c=np.where(bad,np.nan,fs_c)
+    fs_t=np.where(bad,np.nan,fs_t)
+    return c,fs_c,fs_t,status
+
+
+def solve_recbeam_c(dd,fc,beta,B,d,fy,Ass,As):
+    """Neutral-axis depth of a rectangular section on arrays. Returns c, fs'
+    (compression steel), fs (tension steel) and status."""
+    return solve_tbeam_c(dd,fc,beta,B,d,fy,Ass,As,B,np.inf)
+
+
+def tbeam_forces(dd,fc,beta,B,d,fy,Ass,As,be,hf):
+    """Neutral axis and section forces of a T section on arrays.
+    Returns c, Cc, Cs, Mn (kgf, tf-m) and status."""
+    [c,fs_c,fs_t,status]=solve_tbeam_c(dd,fc,beta,B,d,fy,Ass,As,be,hf)
+    a=beta*c
+    #翼板外伸部分與腹板分開計算力臂
+    Cf=0.85*fc*(be-B)*np.minimum(a,hf)
+    Cw=0.85*fc*B*a
+    Cs=Ass*(fs_c-0.85*fc)
+    Mn=(Cf*(d-0.5*np.minimum(a,hf))+Cw*(d-0.5*a)+Cs*(d-dd))/100000
+    return c,Cf+Cw,Cs,Mn,status
+
+
+def recbeam_forces(dd,fc,beta,B,d,fy,Ass,As):
+    """Neutral axis and section forces on arrays. Returns c, Cc, Cs, Mn (kgf, tf-m) and status."""
+    return tbeam_forces(dd,fc,beta,B,d,fy,Ass,As,B,np.inf)
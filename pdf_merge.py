@@ -0,0 +1,174 @@
+"""
+Concatenation of the single-page PDFs written by matplotlib.
+
+matplotlib writes PDF 1.4 files with a classic cross-reference table and
+one page tree. PdfMerger copies every object of such a file into its
+output and renumbers the indirect references. Each file's page tree is
+hung under one root page tree, and the file's own catalog and info are
+dropped. Stream data is copied as is, and only the dictionaries in front
+of it are rewritten, so pages stay vector and are never re-rendered.
+
+Objects are written to the output as each file is appended. Only the
+byte offsets and page references are kept, so memory does not grow with
+the size of the pages already written.
+
+Only the output of matplotlib's PDF backend (savefig and PdfPages) is
+supported. The objects are found through the xref table, and references
+are renumbered with a pattern match over the dictionaries, which relies on
+the plain layout matplotlib writes. PDFs from other producers, for example
+with object streams, xref streams or incremental updates, are not
+supported; files without a classic xref table raise ValueError.
+"""
+import io
+import re
+
+_REF=re.compile(rb'(?<![\d.])(\d+) 0 R\b')
+_OBJ=re.compile(rb'\s*(\d+) 0 obj\b')
+_STREAM=re.compile(rb'\bstream\r?\n')
+
+#輸出檔固定的物件編號
+_CATALOG,_PAGES,_INFO=1,2,3
+
+
+def pdf_string(text):
+    """A PDF text string; UTF-16 hex for anything outside ASCII."""
+    if text.isascii() :
+        return b'('+text.replace('\\','\\\\').replace('(','\\(').replace(')','\\)').encode('ascii')+b')'
+    return b'<FEFF'+text.encode('utf-16-be').hex().upper().encode('ascii')+b'>'
+
+
+def _ref(key,data):
+    """Object number referenced by /key in data, None if absent."""
+    match=re.search(rb'/'+key+rb'\s+(\d+) 0 R',data)
+    return int(match.group(1)) if match else None
+
+
+def read_objects(data):
+    """{object number: raw bytes of 'N 0 obj ... endobj'} and the trailer of a PDF."""
+    start=int(data[data.rindex(b'startxref')+9:].split()[0])
+    lines=iter(data[start:].split(b'\n'))
+    if next(lines).strip()!=b'xref' :
+        raise ValueError("PDF without a classic xref table; only matplotlib PDFs can be merged")
+    offsets={}
+    for line in lines :
+        fields=line.split()
+        if fields[0]==b'trailer' :
+            break
+        [first,count]=map(int,fields)
+        for num in range(first,first+count) :
+            [offset,gen,kind]=next(lines).split()
+            if kind==b'n' :
+                offsets[num]=int(offset)
+    trailer=data[data.index(b'trailer',start):]
+    order=sorted(offsets,key=offsets.get)
+    ends=[offsets[num] for num in order[1:]]+[start]
+    return {num: data[offsets[num]:end] for num,end in zip(order,ends)},trailer
+
+
+def _renumber(raw,shift,parent=None):
+    """Object body with every reference shifted; a page tree node gets /Parent."""
+    match=_STREAM.search(raw)
+    head,tail=(raw[:match.start()],raw[match.start():]) if match else (raw,b'')
+    head=_OBJ.sub(lambda m: b'%d 0 obj' % (int(m.group(1))+shift),head,count=1)
+    head=_REF.sub(lambda m: b'%d 0 R' % (int(m.group(1))+shift),head)
+    if parent is not None :
+        head=head.replace(b'/Type /Pages',b'/Type /Pages /Parent %d 0 R' % parent,1)
+    return head.rstrip()+b'\n'+tail if tail else head.rstrip()+b'\n'
+
+
+class PdfMerger:
+    """Writes the pages of several PDFs, in order, as one PDF to fileobj.
+
+    append(data) returns the object numbers of the pages added. With
+    first=True the pages go in front of those already appended, although
+    their objects are written later. Outline entries (title, page object
+    number) added with add_outline are written as a flat list of bookmarks
+    when the merger is closed.
+    """
+
+    def __init__(self,fileobj,info=None):
+        self.file=fileobj
+        self.info=info or {}
+        self.offsets={}
+        self.trees=[]
+        self.pages=[]
+        self.outline=[]
+        self.next_num=_INFO+1
+        self.position=0
+        self._write(b'%PDF-1.4\n%\xac\xdc\xab\xba\n')
+
+    def _write(self,data):
+        self.file.write(data)
+        self.position+=len(data)
+
+    def _write_object(self,num,body):
+        self.offsets[num]=self.position
+        self._write(b'%d 0 obj\n' % num+body+b'\nendobj\n')
+
+    def append(self,data,first=False):
+        [objects,trailer]=read_objects(data)
+        root=_ref(b'Root',trailer)
+        tree=_ref(b'Pages',objects[root])
+        kids=re.search(rb'/Kids\s*\[([^\]]*)\]',objects[tree]).group(1)
+        shift=self.next_num-min(objects)
+        skip={root,_ref(b'Info',trailer)}
+        for num,raw in objects.items() :
+            if num in skip :
+                continue
+            self.offsets[num+shift]=self.position
+            self._write(_renumber(raw,shift,_PAGES if num==tree else None))
+        self.next_num=max(objects)+shift+1
+        self.trees.insert(0 if first else len(self.trees),tree+shift)
+        pages=[int(ref)+shift for ref in _REF.findall(kids)]
+        self.pages.extend(pages)
+        return pages
+
+    def add_outline(self,title,page,first=False):
+        self.outline.insert(0 if first else len(self.outline),(title,page))
+
+    def _new_num(self):
+        self.next_num+=1
+        return self.next_num-1
+
+    def close(self):
+        """Write the page tree, outline, info and cross-reference table."""
+        catalog=b'<< /Type /Catalog /Pages %d 0 R' % _PAGES
+        if self.outline :
+            root=self._new_num()
+            items=[self._new_num() for _ in self.outline]
+            for i,(num,(title,page)) in enumerate(zip(items,self.outline)) :
+                links=b''
+                if i>0 :
+                    links+=b' /Prev %d 0 R' % items[i-1]
+                if i<len(items)-1 :
+                    links+=b' /Next %d 0 R' % items[i+1]
+                self._write_object(num,b'<< /Title '+pdf_string(title)+b' /Parent %d 0 R%s /Dest [%d 0 R /Fit] >>'
+                                   % (root,links,page))
+            self._write_object(root,b'<< /Type /Outlines /First %d 0 R /Last %d 0 R /Count %d >>'
+                               % (items[0],items[-1],len(items)))
+            catalog+=b' /Outlines %d 0 R /PageMode /UseOutlines' % root
+        self._write_object(_CATALOG,catalog+b' >>')
+        self._write_object(_PAGES,b'<< /Type /Pages /Kids ['+b' '.join(b'%d 0 R' % num for num in self.trees)
+                           +b'] /Count %d >>' % len(self.pages))
+        self._write_object(_INFO,b'<< '+b' '.join(b'/'+key.capitalize().encode('ascii')+b' '+pdf_string(value)
+                                                  for key,value in self.info.items())+b' >>')
+        xref=self.position
+        size=self.next_num
+        self._write(b'xref\n0 %d\n0000000000 65535 f \n' % size)
+        for num in range(1,size) :
+            if num in self.offsets :
+                self._write(b'%010d 00000 n \n' % self.offsets[num])
+            else :
+                self._write(b'0000000000 65535 f \n')
+        self._write(b'trailer\n<< /Size %d /Root %d 0 R /Info %d 0 R >>\nstartxref\n%d\n%%%%EOF\n'
+                    % (size,_CATALOG,_INFO,xref))
+
+
+def merge_pdfs(documents,info=None):
+    """One PDF (bytes) with the pages of every document, in order."""
+    buffer=io.BytesIO()
+    merger=PdfMerger(buffer,info)
+    for data in documents :
+        merger.append(data)
+    merger.close()
+    return buffer.getvalue()
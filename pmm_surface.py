@@ -0,0 +1,162 @@
+import math
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+from beam_function import get_beta
+from tracing import traced
+from column_function import RebarLayout,as_rebar_layout,build_column_ord,find_interaction_points, \
+                            modify_interaction_diagram,get_pmmratio_batch
+
+#快取的斷面數量 (每個斷面約 n_alpha*n_c*4 個 float64)
+PMM_SURFACE_CACHE_SIZE=64
+
+
+class PmmSurface:
+    """Biaxial P-M-M interaction surface of one column section.
+
+    Pn, Mnx, Mny and phi are (n_alpha, n_c) arrays over neutral-axis angles
+    alpha (deg, full circle) and depths c (cm). Mnx and Mny follow
+    find_interaction_points, so a positive (Mux, Muy) demand corresponds to
+    (Mnx, -Mny). The arrays are read-only because surfaces are shared
+    through the cache.
+    """
+    __slots__=('alpha','c','Pn','Mnx','Mny','phi','Pno','Pnt','phi_Pnmax')
+
+    def __init__(self,alpha,c,Pn,Mnx,Mny,phi,Pno,Pnt,phi_Pnmax):
+        self.alpha=alpha
+        self.c=c
+        self.Pn=Pn
+        self.Mnx=Mnx
+        self.Mny=Mny
+        self.phi=phi
+        self.Pno=Pno
+        self.Pnt=Pnt
+        self.phi_Pnmax=phi_Pnmax
+        for arr in (alpha,c,Pn,Mnx,Mny,phi):
+            arr.setflags(write=False)
+
+    def meridian(self,theta):
+        """Interpolate the (Mn, Pn) curve whose moment points along theta (deg).
+
+        For every depth c the neutral-axis angle giving a resultant moment at
+        theta is found on the alpha grid and Pn, Mnx, Mny, phi are linearly
+        interpolated there. Returns c, phi, Pn, Mnx, Mny arrays.
+        """
+        Mx=self.Mnx
+        My=-self.Mny
+        #相對 alpha 的彎矩角度偏差, 使角度沿 alpha 單調
+        theta_m=np.degrees(np.arctan2(My,Mx))
+        alpha=self.alpha[:,None]
+        g=_wrap(alpha+_wrap(theta_m-alpha)-theta)
+        g_next=np.roll(g,-1,axis=0)
+        crossing=(g<=0)&(g_next>0)&(g_next-g<180)
+        k=np.where(crossing.any(axis=0),crossing.argmax(axis=0),np.abs(g).argmin(axis=0))
+        k_next=(k+1)%g.shape[0]
+        cols=np.arange(g.shape[1])
+        g0=g[k,cols]
+        g1=g_next[k,cols]
+        w=np.where(crossing[k,cols],np.divide(-g0,g1-g0,out=np.zeros_like(g0),where=g1!=g0),0.0)
+        interp=lambda arr: arr[k,cols]+(arr[k_next,cols]-arr[k,cols])*w
+        return self.c,interp(self.phi),interp(self.Pn),interp(self.Mnx),interp(self.Mny)
+
+    def interaction_diagram(self,theta):
+        """Interaction diagram at moment angle theta in the column check's table format."""
+        [c,phi,Pn,Mnx,Mny]=self.meridian(theta)
+        interaction_diagram=pd.DataFrame(columns=["c","phi","Pn","Mnx","Mny","theta"])
+        interaction_diagram.loc[0]=[None,0.9,self.Pnt,0,0,0]
+        for i in range(c.shape[0]) :
+            interaction_diagram.loc[i+1]=[round(c[i],2),round(phi[i],2),round(Pn[i],2),round(Mnx[i],2),round(Mny[i],2),
+                                          round(theta,1)]
+        return modify_interaction_diagram(interaction_diagram,self.Pno,self.phi_Pnmax)
+
+    def capacity_curve(self,theta):
+        """(phiMn, phiPn) polyline at theta, rounded as in modify_interaction_diagram."""
+        [c,phi,Pn,Mnx,Mny]=self.meridian(theta)
+        phi=np.concatenate([[0.9],np.round(phi,2),[0.65]])
+        Pn=np.concatenate([[self.Pnt],np.round(Pn,2),[self.Pno]])
+        Mn=np.concatenate([[0.0],np.round(np.hypot(np.round(Mnx,2),np.round(Mny,2)),2),[0.0]])
+        phiPn=np.round(np.minimum(phi*Pn,self.phi_Pnmax),1)
+        phiMn=np.round(phi*Mn,2)
+        return phiMn,phiPn
+
+    def capacity(self,Pu,Mux,Muy):
+        """Capacity point (phiMn, phiPn) and PMM ratio for one demand."""
+        theta=math.degrees(math.atan2(Muy,Mux))
+        Mu=math.sqrt(Mux**2+Muy**2)
+        [phiMn,phiPn]=self.capacity_curve(theta)
+        [capacity_Mn,capacity_Pn,pmm_ratio]=get_pmmratio_batch(phiMn,phiPn,Pu,Mu)
+        return [float(capacity_Mn[0]),float(capacity_Pn[0])],round(float(pmm_ratio[0]),3)
+
+
+def _wrap(angle):
+    return (angle+180)%360-180
+
+
+@traced
+def build_pmm_surface(B,D,fc,fy,rebar_layout,Es=2040000,n_alpha=72,n_c=48):
+    """Compute the interaction surface of a B x D section without caching."""
+    rebar_layout=as_rebar_layout(rebar_layout)
+    beta=get_beta(fc)
+    concrete_df=build_column_ord(B,D)
+    Ast=rebar_layout.Ast
+    Pno=round((0.85*fc*(B*D-Ast)+Ast*fy)/1000,1) #tf
+    phi_Pnmax=round(0.65*0.8*Pno,1)
+    Pnt=round(-Ast*fy/1000,2) #tf
+    alpha=np.linspace(0,360,n_alpha,endpoint=False)
+    c=np.linspace(0.05*min(B,D),2*max(B,D),n_c)
+    shape=(n_alpha,n_c)
+    [Pn,Mnx,Mny,phi]=[np.empty(shape),np.empty(shape),np.empty(shape),np.empty(shape)]
+    for i in range(n_alpha) :
+        [Pn[i],Mnx[i],Mny[i],phi[i]]=find_interaction_points(B,D,concrete_df,alpha[i],beta,c,fc,rebar_layout,Es,fy)
+    return PmmSurface(alpha,c,Pn,Mnx,Mny,phi,Pno,Pnt,phi_Pnmax)
+
+
+@lru_cache(maxsize=PMM_SURFACE_CACHE_SIZE)
+def _cached_pmm_surface(B,D,fc,fy,layout_key,Es,n_alpha,n_c):
+    return build_pmm_surface(B,D,fc,fy,RebarLayout.from_key(layout_key),Es,n_alpha,n_c)
+
+
+def get_pmm_surface(B,D,fc,fy,rebar_layout,Es=2040000,n_alpha=72,n_c=48):
+    """Interaction surface for a section, cached on (B, D, fc, fy, bar layout)."""
+    layout_key=as_rebar_layout(rebar_layout).key()
+    return _cached_pmm_surface(float(B),float(D),float(fc),float(fy),layout_key,float(Es),int(n_alpha),int(n_c))
+
+
+@traced
+def check_load_combinations(surface,loads):
+    """Check many (Pu, Mux, Muy) demands against one interaction surface.
+
+    loads is an (n, 3) array-like or a DataFrame with Pu, Mux, Muy columns
+    (tf, tf-m). Returns a DataFrame with the capacity point (phiMn, phiPn),
+    the PMM ratio of every row and a governing flag on the highest ratio.
+    Rows sharing a moment direction share one meridian.
+    """
+    if isinstance(loads,pd.DataFrame) :
+        loads=loads[["Pu","Mux","Muy"]].to_numpy(dtype=float)
+    loads=np.atleast_2d(np.asarray(loads,dtype=float))
+    [Pu,Mux,Muy]=[loads[:,0],loads[:,1],loads[:,2]]
+    theta=np.degrees(np.arctan2(Muy,Mux))
+    Mu=np.hypot(Mux,Muy)
+    phiMn=np.empty(Pu.shape[0])
+    phiPn=np.empty(Pu.shape[0])
+    pmm_ratio=np.empty(Pu.shape[0])
+    [theta_keys,inverse]=np.unique(theta,return_inverse=True)
+    for k in range(theta_keys.shape[0]) :
+        rows=inverse==k
+        curve=surface.capacity_curve(theta_keys[k])
+        [phiMn[rows],phiPn[rows],pmm_ratio[rows]]=get_pmmratio_batch(curve[0],curve[1],Pu[rows],Mu[rows])
+    pmm_ratio=np.round(pmm_ratio,3)
+    result=pd.DataFrame({"Pu":Pu,"Mux":Mux,"Muy":Muy,"Mu":Mu,"theta":theta,
+                         "phiMn":phiMn,"phiPn":phiPn,"pmm_ratio":pmm_ratio})
+    result["governing"]=False
+    if result.shape[0]>0 :
+        result.loc[result["pmm_ratio"].idxmax(),"governing"]=True
+    return result
+
+
+def pmm_surface_cache_info():
+    return _cached_pmm_surface.cache_info()
+
+
+def clear_pmm_surface_cache():
+    _cached_pmm_surface.cache_clear()
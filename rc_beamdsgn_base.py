@@ -1,166 +1,234 @@
 import math
 import numpy as np
-from rc_recbeamcal_base import math2, cal_recbeam_Mn,cal_phi,cal_effectived_beta
+from dataclasses import dataclass
+from rc_recbeamcal_base import math2, cal_recbeam_Mn_status,cal_phi,cal_effectived_beta
 from rc_tbeamcal_base import cal_effective_width,math2
 from language_manager import lang_manager
+from beam_optimizer import optimize_beam_bars
+from rebar_catalog import BAR_DIAMETER,BAR_AREA,bar_ids
+from tracing import traced,report_exception
 
-def beam_dsgn_button_clicked(data):
-    try :
-        B=float(data.width.text())
-        D=float(data.depth.text())
-        hf=float(data.hf.text())
-        length=float(data.length.text())
-        Sn=float(data.Sn.text())
-        BeamCondition=data.beam_condition.currentText()
-        fy=float(data.fy.text())
-        fc=float(data.fc.text())
-        Mu_left_minus=float(data.Mu_left_minus.text())
-        Mu_mid_minus=float(data.Mu_mid_minus.text())
-        Mu_rght_minus=float(data.Mu_rght_minus.text())
-        Mu_left_plus=float(data.Mu_left_plus.text())
-        Mu_mid_plus=float(data.Mu_mid_plus.text())
-        Mu_rght_plus=float(data.Mu_rght_plus.text())
-        Mu=[Mu_left_minus,Mu_left_plus,
-            Mu_mid_minus,Mu_mid_plus,
-            Mu_rght_minus,Mu_rght_plus]
-        Vu_left=float(data.Vg_left.text())
-        Vu_mid=float(data.Vg_mid.text())
-        Vu_rght=float(data.Vg_rght.text())
-        Vg=[Vu_left,Vu_mid,Vu_rght]
-
-        #initial設計參數
-        d=D-7 #cm
-        dd=7 #cm
-        stirrup_num=2
-        stirrup_d=1.27 #cm
-        #計算有效翼寬
-        be=cal_effective_width(BeamCondition,B,Sn,hf,length)
-
-        #配筋設計
-        As_dsgn=[]
-        Ass_dsgn=[]
-        #計算拉筋應變=0.005時所能提供的彎矩
-        [phiMn_rec_tcs,rec_As1]=cal_rec_tensioncontrol_single_Mnmax(B,d,fc,fy)
-        [phiMn_T_tcs,T_As1]=cal_t_tensioncontrol_single_Mnmax(B,d,hf,be,fc,fy)
-        for i in range(6) :
-            if i%2==0 :
-                #負彎矩
+#設計用鋼筋, rebar_catalog 中 CNS 鋼筋的簡稱
+DSGN_BARS=('#3','#4','#5','#6','#7','#8','#9','#10','#11')
+
+@dataclass(frozen=True)
+class BeamDsgnSpec:
+    """Beam design input (cm, kgf/cm2, tf, tf-m).
+
+    Mu is (left-, left+, mid-, mid+, right-, right+) and Vg is the gravity
+    shear at (left, mid, right). CTbeam='yes' designs positive moments as a
+    T-beam.
+    """
+    B: float
+    D: float
+    hf: float
+    length: float
+    Sn: float
+    BeamCondition: str
+    fc: float
+    fy: float
+    Mu: tuple
+    Vg: tuple
+    CTbeam: str='no'
+    cnstrctblty: str='no'
+
+
+@dataclass(frozen=True)
+class BeamDsgnResult:
+    spec: BeamDsgnSpec
+    be: float
+    As_final: list
+    barinfo: dict
+    choose_bar: str
+    dsgn_barnum: list
+    arrange: list
+    phiMn_all: list
+    et_all: list
+    bar_ratio: list
+    Mpr: list
+    Ve: float #塑鉸區剪力需求
+    Vu_nhinge: float #非塑鉸區剪力需求
+    choose_stirrup: list
+    choose_stirrup_num: list
+    s_dsgn_all: list #mm
+    stir_result: list
+    dvlpmnt_length: float
+    bar_options: list=() #鋼筋重量與支數的 Pareto 解, 第一個為採用者
+
+
+@traced
+def design_beam(spec):
+    """Flexural and seismic shear reinforcement design of a beam, without any widgets."""
+    [B,D,hf,length,fc,fy]=[spec.B,spec.D,spec.hf,spec.length,spec.fc,spec.fy]
+    Mu=list(spec.Mu)
+    Vg=list(spec.Vg)
+
+    #initial設計參數
+    d=D-7 #cm
+    dd=7 #cm
+    #計算有效翼寬
+    be=cal_effective_width(spec.BeamCondition,B,spec.Sn,hf,length)
+
+    #配筋設計
+    As_dsgn=[]
+    Ass_dsgn=[]
+    #計算拉筋應變=0.005時所能提供的彎矩
+    [phiMn_rec_tcs,rec_As1]=cal_rec_tensioncontrol_single_Mnmax(B,d,fc,fy)
+    [phiMn_T_tcs,T_As1]=cal_t_tensioncontrol_single_Mnmax(B,d,hf,be,fc,fy)
+    for i in range(6) :
+        if i%2==0 :
+            #負彎矩
+            input=[rec_As1,phiMn_rec_tcs,'矩形']
+        else :
+             #正彎矩
+            if spec.CTbeam=='no' :
                 input=[rec_As1,phiMn_rec_tcs,'矩形']
             else :
-                 #正彎矩
-                if data.CTbeam=='no' :
-                    input=[rec_As1,phiMn_rec_tcs,'矩形']
-                else :
-                    input=[T_As1,phiMn_T_tcs,'T形']
-            [As_dsgn_sg,Ass_dsgn_sg]=dsgn_beam_As(B,d,dd,be,hf,fc,fy,input[0],Mu[i],input[1],input[2])
-            As_dsgn.append(As_dsgn_sg)
-            Ass_dsgn.append(Ass_dsgn_sg)
-        As_final=[]
-        #最小鋼筋量
-        As_min=max(0.8*fc**0.5/fy*B*D,14/fy*B*D) #cm2
-        #考慮耐震梁限制
-        As_seismic1=max(As_dsgn[0],As_dsgn[4])/4
-        for i in range(6) :
-            if i%2==0 :
-                As_final.append(max(As_dsgn[i],Ass_dsgn[i+1],As_min,As_seismic1))
-            else :
-                As_final.append(max(Ass_dsgn[i-1],As_dsgn[i],As_min,As_seismic1))
-        #耐震梁規範
-        As_final[1]=max(As_final[1],As_final[0]/2)
-        As_final[5]=max(As_final[5],As_final[4]/2)
-
-        #根據所需鋼筋量進行配筋
-        ########Design Strategy###########
-        [barchart,barinfo]=BarDsgn(data,max(As_final))
+                input=[T_As1,phiMn_T_tcs,'T形']
+        [As_dsgn_sg,Ass_dsgn_sg]=dsgn_beam_As(B,d,dd,be,hf,fc,fy,input[0],Mu[i],input[1],input[2])
+        As_dsgn.append(As_dsgn_sg)
+        Ass_dsgn.append(Ass_dsgn_sg)
+    As_final=[]
+    #最小鋼筋量
+    As_min=max(0.8*fc**0.5/fy*B*D,14/fy*B*D) #cm2
+    #考慮耐震梁限制
+    As_seismic1=max(As_dsgn[0],As_dsgn[4])/4
+    for i in range(6) :
+        if i%2==0 :
+            As_final.append(max(As_dsgn[i],Ass_dsgn[i+1],As_min,As_seismic1))
+        else :
+            As_final.append(max(Ass_dsgn[i-1],As_dsgn[i],As_min,As_seismic1))
+    #耐震梁規範
+    As_final[1]=max(As_final[1],As_final[0]/2)
+    As_final[5]=max(As_final[5],As_final[4]/2)
+
+    #根據所需鋼筋量進行配筋
+    ########Design Strategy###########
+    [barchart,barinfo]=BarDsgn(B,spec.cnstrctblty,max(As_final))
+    #最少鋼筋重量搜尋, 無可行配置時沿用原本的選筋方式
+    bar_options=optimize_beam_bars(B,D,fc,fy,Mu,barinfo,As_min,length)
+    if bar_options :
+        choose_bar=bar_options[0].bar
+        dsgn_barnum=list(bar_options[0].dsgn_barnum)
+    else :
         if barinfo['#8'][3] <=1.4*barinfo['#8'][2] :
             choose_bar='#8'
         elif barinfo['#9'][3] <= 1.4*barinfo['#9'][2] :
             choose_bar='#9'
         else :
             choose_bar='#10'
+        dsgn_barnum=[math.ceil(As_final[i]/barinfo[choose_bar][1]) for i in range(6)]
 
-        dsgn_barnum=[]
-        arrange=[]
-        for i in range(6) :
-            dsgn_barnum.append(math.ceil(As_final[i]/barinfo[choose_bar][1]))
-            arrange.append(lang_manager.tr('results.double_row')) if dsgn_barnum[i]>barinfo[choose_bar][2] else arrange.append(lang_manager.tr('results.single_row'))
-        
-        #檢核彎矩強度與最外鋼筋拉應變限制
-        [phiMn_all,et_all,bar_ratio]=CheckMratio(barinfo,choose_bar,dsgn_barnum,arrange,B,D,fc,fy)
-
-        #剪力需求計算
-        Mpr=cal_Mpr(barinfo,choose_bar,dsgn_barnum,arrange,B,D,fc,fy) #tf-m
-        Vsway=[(Mpr[0]+Mpr[3])/(length/100),(Mpr[1]+Mpr[2])/((length-B)/100)] #tf 假設柱尺寸=梁寬
-        Ve1=max(abs(Vg[0]+Vsway[0]),abs(Vg[0]-Vsway[1]))
-        Ve2=max(abs(Vg[2]-Vsway[0]),abs(Vg[2]+Vsway[1]))
-        Ve=max(Ve1,Ve2)
-
-        #剪力鋼筋設計(已考慮耐震特別規範)
-        s_dsgn_all=[0,0] #mm
-        choose_stirrup=['#3','#3']
-        stir_result=['none','none']
-        choose_stirrup_num=[2,2]
-        #塑鉸區
-        if max(Vsway) > 0.5*Ve : #假設梁受軸力很小
-            # Av=stirrup_num*math.pi*stirrup_d**2/4 #cm2
-            # s_hinge_req=Av*(fy/1000)*d/(Ve/0.75)*10 #mm  
-            Vc=0.53*fc**0.5*B*d/1000 #tf
-            [choose_stirrup[0],choose_stirrup_num[0],s_hinge_req,stir_result[0]]=Stirrup_Dsgn(Ve+0.75*Vc,fc,fy,B,d,barinfo)
-        else :
-            [choose_stirrup[0],choose_stirrup_num[0],s_hinge_req,stir_result[0]]=Stirrup_Dsgn(Ve,fc,fy,B,d,barinfo)
-        s_min=min(d/4,15,6*barinfo[choose_bar][0]) #cm
-        s_hinge_dsgn=min(s_min*10,s_hinge_req) #mm
-        s_hinge_dsgn=math.floor(s_hinge_dsgn/25)*25 #mm
-        s_dsgn_all[0]=s_hinge_dsgn #mm
-        #非塑鉸區
-        Vu_nhinge=Vg[1]+max(Vsway)
-        [choose_stirrup[1],choose_stirrup_num[1],s_dsgn_all[1],stir_result[1]]=Stirrup_Dsgn(Vu_nhinge,fc,fy,B,d,barinfo)
+    arrange=[]
+    for i in range(6) :
+        arrange.append(lang_manager.tr('results.double_row')) if dsgn_barnum[i]>barinfo[choose_bar][2] else arrange.append(lang_manager.tr('results.single_row'))
+
+    #檢核彎矩強度與最外鋼筋拉應變限制
+    [phiMn_all,et_all,bar_ratio]=CheckMratio(barinfo,choose_bar,dsgn_barnum,arrange,B,D,fc,fy)
+
+    #剪力需求計算
+    Mpr=cal_Mpr(barinfo,choose_bar,dsgn_barnum,arrange,B,D,fc,fy) #tf-m
+    Vsway=[(Mpr[0]+Mpr[3])/(length/100),(Mpr[1]+Mpr[2])/((length-B)/100)] #tf 假設柱尺寸=梁寬
+    Ve1=max(abs(Vg[0]+Vsway[0]),abs(Vg[0]-Vsway[1]))
+    Ve2=max(abs(Vg[2]-Vsway[0]),abs(Vg[2]+Vsway[1]))
+    Ve=max(Ve1,Ve2)
+
+    #剪力鋼筋設計(已考慮耐震特別規範)
+    s_dsgn_all=[0,0] #mm
+    choose_stirrup=['#3','#3']
+    stir_result=['none','none']
+    choose_stirrup_num=[2,2]
+    #塑鉸區
+    if max(Vsway) > 0.5*Ve : #假設梁受軸力很小
+        Vc=0.53*fc**0.5*B*d/1000 #tf
+        [choose_stirrup[0],choose_stirrup_num[0],s_hinge_req,stir_result[0]]=Stirrup_Dsgn(Ve+0.75*Vc,fc,fy,B,d,barinfo)
+    else :
+        [choose_stirrup[0],choose_stirrup_num[0],s_hinge_req,stir_result[0]]=Stirrup_Dsgn(Ve,fc,fy,B,d,barinfo)
+    s_min=min(d/4,15,6*barinfo[choose_bar][0]) #cm
+    s_hinge_dsgn=min(s_min*10,s_hinge_req) #mm
+    s_hinge_dsgn=math.floor(s_hinge_dsgn/25)*25 #mm
+    s_dsgn_all[0]=s_hinge_dsgn #mm
+    #非塑鉸區
+    Vu_nhinge=Vg[1]+max(Vsway)
+    [choose_stirrup[1],choose_stirrup_num[1],s_dsgn_all[1],stir_result[1]]=Stirrup_Dsgn(Vu_nhinge,fc,fy,B,d,barinfo)
+
+    #伸展長度計算
+    dvlpmnt_length=cal_development_length(fc,fy,barinfo,choose_bar)
+    return BeamDsgnResult(spec,be,As_final,barinfo,choose_bar,dsgn_barnum,arrange,phiMn_all,et_all,bar_ratio,Mpr,
+                          Ve,Vu_nhinge,choose_stirrup,choose_stirrup_num,s_dsgn_all,stir_result,dvlpmnt_length,
+                          tuple(bar_options))
 
 
-        #伸展長度計算   
-        dvlpmnt_length=cal_development_length(fc,fy,barinfo,choose_bar)
-        
+def read_beam_dsgn_spec(data):
+    Mu=(float(data.Mu_left_minus.text()),float(data.Mu_left_plus.text()),
+        float(data.Mu_mid_minus.text()),float(data.Mu_mid_plus.text()),
+        float(data.Mu_rght_minus.text()),float(data.Mu_rght_plus.text()))
+    Vg=(float(data.Vg_left.text()),float(data.Vg_mid.text()),float(data.Vg_rght.text()))
+    return BeamDsgnSpec(B=float(data.width.text()),
+                        D=float(data.depth.text()),
+                        hf=float(data.hf.text()),
+                        length=float(data.length.text()),
+                        Sn=float(data.Sn.text()),
+                        BeamCondition=data.beam_condition.currentText(),
+                        fc=float(data.fc.text()),
+                        fy=float(data.fy.text()),
+                        Mu=Mu,
+                        Vg=Vg,
+                        CTbeam=data.CTbeam,
+                        cnstrctblty=data.cnstrctblty)
+
+
+def format_beam_dsgn_result(r):
+    location=[
+        lang_manager.tr('results.left_negative_moment'),
+        lang_manager.tr('results.left_positive_moment'),
+        lang_manager.tr('results.mid_negative_moment'),
+        lang_manager.tr('results.mid_positive_moment'),
+        lang_manager.tr('results.right_negative_moment'),
+        lang_manager.tr('results.right_positive_moment')
+    ]
+    location2=[
+        lang_manager.tr('results.left_end_shear') + ' :',
+        lang_manager.tr('results.mid_shear') + ' :',
+        lang_manager.tr('results.right_end_shear') + ' :'
+    ]
+    result1=''
+    result2=(lang_manager.tr('results.plastic_hinge_shear_demand') + ' Vu= ' + str(round(r.Ve,2)) + ' ' + lang_manager.tr('results.ton_force') + '\n' +
+            lang_manager.tr('results.non_plastic_hinge_shear_demand') + ' Vu= ' + str(round(r.Vu_nhinge,2)) + ' ' + lang_manager.tr('results.ton_force') + '\n')
+    for i in range(6) :
+        result1=(result1+str(i+1)+'. '+location[i]+':  ' + lang_manager.tr('results.flexural_steel_design') + ' ' + str(r.dsgn_barnum[i])+'-'+str(r.choose_bar)+' ('
+                +str(r.arrange[i])+'),  '+'\u03d5 Mn= '+str(round(r.phiMn_all[i],2))+'  ' + lang_manager.tr('results.ton_meter') + ', '
+                +'\u03b5 t= '+str(round(r.et_all[i],5)) +', ' + lang_manager.tr('results.steel_ratio') + ' \u03c1= '+str(round(r.bar_ratio[i],3))+'\n')
+    x=[0,1,0]
+    for i in range(len(x)) :
+        result2=(result2+location2[i]+r.stir_result[x[i]]+'\n')
+    result3=''
+    if len(r.bar_options)>1 :
+        result3=lang_manager.tr('results.bar_alternatives')+'\n'
+        for option in r.bar_options[1:] :
+            result3=(result3+'  '+option.bar+': '+', '.join(str(n) for n in option.dsgn_barnum)+'  ('
+                     +str(round(option.weight,1))+' kg, '+str(option.n_bars)+')\n')
+    return result1+result2+result3
+
+
+def beam_dsgn_button_clicked(data):
+    try :
+        spec=read_beam_dsgn_spec(data)
+        result=design_beam(spec)
 
         #結果輸出
-        location=[
-            lang_manager.tr('results.left_negative_moment'),
-            lang_manager.tr('results.left_positive_moment'),
-            lang_manager.tr('results.mid_negative_moment'),
-            lang_manager.tr('results.mid_positive_moment'),
-            lang_manager.tr('results.right_negative_moment'),
-            lang_manager.tr('results.right_positive_moment')
-        ]
-        location2=[
-            lang_manager.tr('results.left_end_shear') + ' :',
-            lang_manager.tr('results.mid_shear') + ' :',
-            lang_manager.tr('results.right_end_shear') + ' :'
-        ]
-        result1=''
-        result2=(lang_manager.tr('results.plastic_hinge_shear_demand') + ' Vu= ' + str(round(Ve,2)) + ' ' + lang_manager.tr('results.ton_force') + '\n' +
-                lang_manager.tr('results.non_plastic_hinge_shear_demand') + ' Vu= ' + str(round(Vu_nhinge,2)) + ' ' + lang_manager.tr('results.ton_force') + '\n')
-        for i in range(6) :
-            result1=(result1+str(i+1)+'. '+location[i]+':  ' + lang_manager.tr('results.flexural_steel_design') + ' ' + str(dsgn_barnum[i])+'-'+str(choose_bar)+' ('
-                    +str(arrange[i])+'),  '+'\u03d5 Mn= '+str(round(phiMn_all[i],2))+'  ' + lang_manager.tr('results.ton_meter') + ', '
-                    +'\u03b5 t= '+str(round(et_all[i],5)) +', ' + lang_manager.tr('results.steel_ratio') + ' \u03c1= '+str(round(bar_ratio[i],3))+'\n')
-        x=[0,1,0]
-        for i in range(len(x)) :
-            result2=(result2+location2[i]+stir_result[x[i]]+'\n')
-        result=(result1+result2)
-
-        data.textBrowser.setText(result)
+        data.textBrowser.setText(format_beam_dsgn_result(result))
 
         #畫圖
-        data.rcbeamdsgnwidget.rcbeamdsgndraw_info(data,choose_bar,dsgn_barnum,s_dsgn_all,choose_stirrup,choose_stirrup_num,barinfo)
-     
+        data.rcbeamdsgnwidget.rcbeamdsgndraw_info(data,result.choose_bar,result.dsgn_barnum,result.s_dsgn_all,
+                                                  result.choose_stirrup,result.choose_stirrup_num,result.barinfo)
 
     except Exception as e:
         try:
             data.textBrowser.setText(lang_manager.tr('results.please_input_parameters'))
         except:
             data.textBrowser.setText('Please input the parameters')
-        print(f"Error in beam_dsgn_button_clicked: {e}")
-        import traceback
-        traceback.print_exc()
+        report_exception('beam_dsgn_button_clicked',e)
 
 def dsgn_beam_As(B,d,dd,be,hf,fc,fy,As1,Mu,phiMn_tcs,shape) :
     #拉控斷面配筋法
@@ -230,19 +298,17 @@ def cal_t_tensioncontrol_single_Mnmax(B,d,hf,be,fc,fy):
     return phiMn,As
 
 
-def BarDsgn(data,As):
-    B=float(data.width.text())
+def BarDsgn(B,cnstrctblty,As):
     #1st:直徑 2nd:面積 3rd:單排最大容許 4th:需要幾根 
-    barinfo={'#3':[0.953,0.7133,0,0], '#4':[1.27,1.267,0,0], '#5':[1.588,1.986,0,0],
-              '#6':[1.905,2.865,0,0], '#7':[2.223,3.871,0,0],'#8':[2.54,5.067,0,0],
-              '#9':[2.865,6.469,0,0],'#10':[3.226,8.143,0,0],'#11':[3.581,10.07,0,0]}
-    barchart=['#3', '#4','#5','#6','#7', '#8','#9','#10','#11']
+    barchart=list(DSGN_BARS)
+    barinfo={bar:[float(BAR_DIAMETER[i]),float(BAR_AREA[i]),0,0] for bar,i in zip(barchart,bar_ids(barchart))}
     for i in range(len(barchart)) :
-        cleardb_h=1.5*max(2.5,barinfo[barchart[i]][0]) if data.cnstrctblty=='yes'  else max(2.5,barinfo[barchart[i]][0])
+        cleardb_h=1.5*max(2.5,barinfo[barchart[i]][0]) if cnstrctblty=='yes'  else max(2.5,barinfo[barchart[i]][0])
         barinfo[barchart[i]][2]=max(0,math.floor((B-8-2.54+cleardb_h)/(barinfo[barchart[i]][0]+cleardb_h)))
         barinfo[barchart[i]][3]=math.ceil(As/ barinfo[barchart[i]][1])
     return barchart,barinfo
 
+@traced
 def CheckMratio(barinfo,choose_bar,dsgn_barnum,arrange,B,D,fc,fy) :
     phiMn_all=[]
     et_all=[]
@@ -258,13 +324,14 @@ def CheckMratio(barinfo,choose_bar,dsgn_barnum,arrange,B,D,fc,fy) :
             arrange_use=list(reversed(arrange_use))
         [d,dt,dd,beta]=cal_effectived_beta(arrange_use,D,4,bard,bard,fc,barinfo['#4'][0],
                                             BarNumCal,BarNumMax_PerRow)                                 
-        [Asy,result0,c,Cc,Cs,Mn]=cal_recbeam_Mn(dd,fc,beta,B,d,fy,BarNumCal[1]*barA,BarNumCal[0]*barA)
+        [Asy,status,c,Cc,Cs,Mn]=cal_recbeam_Mn_status(dd,fc,beta,B,d,fy,BarNumCal[1]*barA,BarNumCal[0]*barA)
         [es,et,result1,result2,phi]=cal_phi(c,d,dt)
         phiMn_all.append(phi*Mn)
         et_all.append(et)
         bar_ratio.append(dsgn_barnum[i]*barinfo[choose_bar][1]/B/d)
     return  phiMn_all,et_all,bar_ratio
 
+@traced
 def Stirrup_Dsgn(Vu,fc,fy,B,d,barinfo) :
     #無軸壓
     Vc=0.53*fc**0.5*B*d/1000 #tf
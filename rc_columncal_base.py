@@ -1,98 +1,180 @@
 import math
-from beam_function import stirrup_info,get_clear_cover,bar_allowable_num_clicked,cal_shear_strngth,check_stirrup_span_limit
-from column_function import get_column_section_info,get_rebar_df,get_theta,get_alpha, \
-                            build_column_ord,cal_distance_from_point_to_line,find_interaction_point,modify_interaction_diagram,get_pmmratio,\
+from dataclasses import dataclass
+from beam_function import rebar_info,stirrup_info,get_clear_cover,bar_allowable_num_clicked,cal_shear_strngth,check_stirrup_span_limit
+from column_function import get_column_section_info,get_rebar_layout,get_theta,get_alpha, \
+                            build_column_ord,find_interaction_curve,modify_interaction_diagram,get_pmmratio,\
                             get_mm_diagram
 import numpy as np
 import pandas as pd
-from  dataframe_model import  DataFrameModel
 from language_manager import lang_manager
+from tracing import traced,report_exception
+
+#PMM 互制曲線取樣容許誤差 (曲線尺寸的比例)
+PMM_CURVE_TOL=0.01
+
+
+@dataclass(frozen=True)
+class ColumnSpec:
+    """Column check input (cm, kgf/cm2, tf, tf-m). Nx/Ny are bars per face."""
+    B: float
+    D: float
+    fc: float
+    fy: float
+    bar1: str
+    bar2: str
+    Nx: int
+    Ny: int
+    stirrup_size: str
+    stirrup_num: int #箍筋肢數
+    stirrup_span: float
+    Pu: float
+    Mux: float
+    Muy: float
+    Es: float=2040000 #kgf/cm2
+
+
+@dataclass(frozen=True)
+class ColumnResult:
+    spec: ColumnSpec
+    Ast: float
+    Pno: float
+    Pnmax: float
+    phi_Pnmax: float
+    Pnt: float
+    theta: float #彎矩角度
+    alpha: float #中性軸角度
+    Mu: float
+    interaction_diagram: pd.DataFrame
+    mm_diagram: pd.DataFrame
+    capacity_point: list
+    pmm_ratio: float
+    phiVnx: float
+    phiVny: float
+    PrtctT: float
+    db_rebar1: float
+    db_rebar2: float
+    db_stirrup: float
+
+
+def get_column_shear_capacity(B,D,fc,fy,rebar_size1,rebar_size2,stirrup_size,stirrup_num,stirrup_span):
+    """phiVnx, phiVny (tf) of a column section without axial load."""
+    PrtctT=get_clear_cover('Column') #cm
+    [db_rebar1,Ab_rebar1]=rebar_info(rebar_size1)
+    [db_rebar2,Ab_rebar2]=rebar_info(rebar_size2)
+    [db_stirrup,Ab_stirrup]=rebar_info(stirrup_size)
+    eff_d1=D-PrtctT-db_stirrup-db_rebar1/2
+    eff_d2=B-PrtctT-db_stirrup-db_rebar2/2
+    [Av,Vc,phiVny]=cal_shear_strngth(db_stirrup,stirrup_num,stirrup_span,fc,fy,B,eff_d1)
+    [Av,Vc,phiVnx]=cal_shear_strngth(db_stirrup,stirrup_num,stirrup_span,fc,fy,D,eff_d2)
+    return phiVnx,phiVny
+
+
+class CalculationCancelled(Exception):
+    """Raised from a progress callback to abandon a running check."""
+
+
+@traced
+def check_column(spec,progress=None):
+    """Biaxial P-M-M and shear check of a rectangular column, without any widgets.
+
+    progress, if given, is called with the number of interaction points
+    computed so far (P-M curve and MM contour together). It may raise
+    CalculationCancelled to stop the check.
+    """
+    [B,D,fc,fy,Es]=[spec.B,spec.D,spec.fc,spec.fy,spec.Es]
+    [beta,Ec,db_rebar1,Ab_rebar1,db_rebar2,Ab_rebar2,db_stirrup,Ab_stirrup]=get_column_section_info(B,D,fc,fy,spec.bar1,spec.bar2,spec.stirrup_size)
+    PrtctT=get_clear_cover('Column') #cm
+    cover=PrtctT+db_stirrup+db_rebar1
+    rebar_layout=get_rebar_layout(B,D,cover,spec.Nx,spec.Ny,Ab_rebar1,Ab_rebar2)
+    Ast=rebar_layout.Ast
+    theta=get_theta(spec.Mux,spec.Muy)
+    Mu=math.sqrt((spec.Mux)**2+(spec.Muy)**2)
+    Pno=round((0.85*fc*(B*D-Ast)+Ast*fy)/1000,1) #tf
+    Pnmax=0.8*Pno
+    phi_Pnmax=round(0.65*Pnmax,1)
+    Pnt=round(-Ast*fy/1000,2) #tf
+
+    #///////////////////////////////畫PMM互制曲線///////////////////////////////
+    #假設中性軸角度
+    alpha=get_alpha(B,D,rebar_layout,theta,Es,Ec)
+    concrete_df=build_column_ord(B,D)
+    #find interaction diagram
+    report=(lambda n: None) if progress is None else progress
+    [c_trial,Pn,Mnx,Mny,phi,n_eval]=find_interaction_curve(B,D,concrete_df,alpha,beta,fc,rebar_layout,Es,fy,
+                                                           tol=PMM_CURVE_TOL,progress=report)
+    interaction_diagram=pd.DataFrame(columns=["c","phi","Pn","Mnx","Mny","theta"])
+    interaction_diagram.loc[0]=[None,0.9,Pnt,0,0,0]
+    for i in range(c_trial.shape[0]) :
+        theta_trial=round(get_theta(abs(Mnx[i]),abs(Mny[i])),1)
+        interaction_diagram.loc[i+1]=[round(c_trial[i],2),round(phi[i],2),round(Pn[i],2),round(Mnx[i],2),round(Mny[i],2),theta_trial]
+    interaction_diagram=modify_interaction_diagram(interaction_diagram,Pno,phi_Pnmax)
+    capacity_point,pmm_ratio=get_pmmratio(interaction_diagram,spec.Pu,Mu)
+
+    mm_diagram=get_mm_diagram(spec.Pu,Pno,Pnt,B,D,fc,fy,Es,beta,concrete_df,rebar_layout,
+                              progress=lambda n: report(n_eval+n))
+    #剪力強度計算
+    [phiVnx,phiVny]=get_column_shear_capacity(B,D,fc,fy,spec.bar1,spec.bar2,spec.stirrup_size,spec.stirrup_num,
+                                              spec.stirrup_span)
+    return ColumnResult(spec,Ast,Pno,Pnmax,phi_Pnmax,Pnt,theta,alpha,Mu,interaction_diagram,mm_diagram,
+                        capacity_point,pmm_ratio,phiVnx,phiVny,PrtctT,db_rebar1,db_rebar2,db_stirrup)
+
+
+def read_column_spec(data):
+    return ColumnSpec(B=float(data.width.text()), #cm
+                      D=float(data.depth.text()), #cm
+                      fc=float(data.fc.text()), #kgf/cm2
+                      fy=float(data.fy.text()), #kgf/cm2
+                      bar1=data.bar1.currentText(),
+                      bar2=data.bar2.currentText(),
+                      Nx=int(data.barnum1.text()),
+                      Ny=int(data.barnum2.text()),
+                      stirrup_size=data.stirrup_size.currentText(),
+                      stirrup_num=stirrup_info(data.stirrup_num.currentText()),
+                      stirrup_span=float(data.stirrup_span.text()), #cm
+                      Pu=float(data.Pu.text()), #tf
+                      Mux=float(data.Mux.text()), #tf-m
+                      Muy=float(data.Muy.text())) #tf-m
+
+
+def format_column_result(r):
+    spec=r.spec
+    info1='Ast= '+str(round(r.Ast,2))+'  cm^2'
+    info2=lang_manager.tr('results.steel_ratio') + '= '+str(round(r.Ast/(spec.B*spec.D)*100,3))+' %'
+    info3='Pno= '+str(round(r.Pno,1))+'  tonf'
+    info4='Pnmax= '+str(round(r.Pnmax,1))+'  tonf'
+    info5='\u03d5 Pno= '+str(round(0.65*r.Pno,1))+'  tonf'
+    info6='\u03d5 Pnmax= '+str(round(0.65*r.Pnmax,1))+'  tonf'
+    info7=lang_manager.tr('results.theoretical_theta') + ' \u03B8 = '+str(round(r.theta,1))+'  °'
+    info8=lang_manager.tr('results.assumed_alpha') + ' \u03B1 = '+str(round(r.alpha,1))+'  °'
+    result4='PMM ratio= '+str(r.pmm_ratio)
+    result5='\u03d5 Vn= '+str(round(r.phiVny,2)) +'  tf'
+    result6='\u03d5 Vn= '+str(round(r.phiVnx,2)) +'  tf'
+    return (info1+'\n'+info2+'\n'+info3+'\n'+info4+'\n'+info5+'\n'+info6+'\n'
+            +info7+'\n'+info8+'\n'+result4+'\n'+result5+'\n'+result6+'\n')
+
+
+def show_column_result(data,result):
+    spec=result.spec
+    # #結果輸出
+    data.textBrowser.setText(format_column_result(result))
+
+    #畫圖
+    data.rccolumnwidget.rccolumndraw_info(data,spec.Nx,spec.Ny,result.db_stirrup,result.db_rebar1,result.db_rebar2,
+                                          result.PrtctT)
+    data.signal.emit([result.interaction_diagram, result.mm_diagram, result.capacity_point,spec.Mux,spec.Muy,
+                      result.Mu,spec.Pu])
+
 
 def column_cal_button_clicked(data):
     try :
-        # data=self
-        B=float(data.width.text()) #cm
-        D=float(data.depth.text()) #cm
-        fy=float(data.fy.text()) #kgf/cm2
-        fc=float(data.fc.text()) #kgf/cm2
-        rebar_size1=data.bar1.currentText()
-        rebar_size2=data.bar2.currentText()
-        Nx=int(data.barnum1.text())
-        Ny=int(data.barnum2.text())
-        stirrup_size=data.stirrup_size.currentText()
-        stirrup_span=float(data.stirrup_span.text()) #cm
-        stirrup_num=stirrup_info(data.stirrup_num.currentText())
-        cnstrctblty=data.cnstrctblty
-        Mux=float(data.Mux.text()) #tf-m
-        Muy=float(data.Muy.text()) #tf-m
-        Pu=float(data.Pu.text()) #tf
-
-        [beta,Ec,db_rebar1,Ab_rebar1,db_rebar2,Ab_rebar2,db_stirrup,Ab_stirrup]=get_column_section_info(B,D,fc,fy,rebar_size1,rebar_size2,stirrup_size)
-        PrtctT=get_clear_cover('Column') #cm
-        cover=PrtctT+db_stirrup+db_rebar1
-        rebar_df=get_rebar_df(B,D,cover,Nx,Ny,Ab_rebar1,Ab_rebar2)
-        Ast=rebar_df["Ab"].sum()
-        Es=2040000 #kgf/cm2
+        spec=read_column_spec(data)
         bar_allowable_num_clicked(data,'Column')
-        theta=get_theta(Mux,Muy)
-        Mu=math.sqrt((Mux)**2+(Muy)**2)
-        Pno=round((0.85*fc*(B*D-Ast)+Ast*fy)/1000,1) #tf
-        Pnmax=0.8*Pno
-        phi_Pnmax=round(0.65*Pnmax,1)
-        Pnt=round(-Ast*fy/1000,2) #tf
-
-        #///////////////////////////////畫PMM互制曲線///////////////////////////////
-        #假設中性軸角度
-        alpha=get_alpha(B,D,rebar_df,theta,Es,Ec)
-        concrete_df=build_column_ord(B,D)
-        d_max=2*cal_distance_from_point_to_line(concrete_df.loc['p1','x0'],concrete_df.loc['p1','y0'],math.tan(math.radians(alpha)),-1,0)
-        #find interaction diagram
-        c_trial_1=np.linspace(0.05*min(B,D),3/5*max(B,D),15)
-        c_trial_2=np.linspace(3/5*max(B,D),2*max(B,D),15)
-        c_trial=np.concatenate([c_trial_1,c_trial_2])
-        interaction_diagram=pd.DataFrame(columns=["c","phi","Pn","Mnx","Mny","theta"])
-        interaction_diagram.loc[0]=[None,0.9,Pnt,0,0,0]
-        for i in range(c_trial.shape[0]) :
-            [Pn, Mnx, Mny,phi]=find_interaction_point(B,D,concrete_df,alpha,beta,c_trial[i],d_max,fc,rebar_df,Es,fy)
-            theta_trial=round(get_theta(abs(Mnx),abs(Mny)),1)
-            interaction_diagram.loc[i+1]=[round(c_trial[i],2),phi,Pn,Mnx,Mny,theta_trial]
-        interaction_diagram=modify_interaction_diagram(interaction_diagram,Pno,phi_Pnmax)
-        capacity_point,pmm_ratio=get_pmmratio(interaction_diagram,Pu,Mu)
-
-        mm_diagram=get_mm_diagram(Pu,Pno,Pnt,B,D,fc,fy,Es,beta,concrete_df,rebar_df)
-        # print(mm_diagram)
-        #剪力強度計算
-        eff_d1=D-PrtctT-db_stirrup-db_rebar1/2
-        eff_d2=B-PrtctT-db_stirrup-db_rebar2/2
-        [Av,Vc,phiVny]=cal_shear_strngth(db_stirrup,stirrup_num,stirrup_span,fc,fy,B,eff_d1)
-        [Av,Vc,phiVnx]=cal_shear_strngth(db_stirrup,stirrup_num,stirrup_span,fc,fy,D,eff_d2)
-
-
-        # #結果輸出
-        info1='Ast= '+str(round(Ast,2))+'  cm^2'
-        info2=lang_manager.tr('results.steel_ratio') + '= '+str(round(Ast/(B*D)*100,3))+' %'
-        info3='Pno= '+str(round(Pno,1))+'  tonf'
-        info4='Pnmax= '+str(round(Pnmax,1))+'  tonf'
-        info5='\u03d5 Pno= '+str(round(0.65*Pno,1))+'  tonf'
-        info6='\u03d5 Pnmax= '+str(round(0.65*Pnmax,1))+'  tonf'
-        info7=lang_manager.tr('results.theoretical_theta') + ' \u03B8 = '+str(round(theta,1))+'  °'
-        info8=lang_manager.tr('results.assumed_alpha') + ' \u03B1 = '+str(round(alpha,1))+'  °'
-        result4='PMM ratio= '+str(pmm_ratio)
-        result5='\u03d5 Vn= '+str(round(phiVny,2)) +'  tf'
-        result6='\u03d5 Vn= '+str(round(phiVnx,2)) +'  tf'
-        data.textBrowser.setText((info1+'\n'+info2+'\n'+info3+'\n'+info4+'\n'+info5+'\n'+info6+'\n'
-                                +info7+'\n'+info8+'\n'+result4+'\n'+result5+'\n'+result6+'\n'))
-
-        #畫圖
-        data.rccolumnwidget.rccolumndraw_info(data,Nx,Ny,db_stirrup,db_rebar1,db_rebar2,PrtctT)
-        data.signal.emit([interaction_diagram, mm_diagram, capacity_point,Mux,Muy,Mu,Pu])
+        result=check_column(spec)
+        show_column_result(data,result)
 
     except Exception as e:
         try:
             data.textBrowser.setText(lang_manager.tr('results.please_input_parameters'))
         except:
             data.textBrowser.setText('Please input the parameters')
-        print(f"Error in column_cal_button_clicked: {e}")
-        import traceback
-        traceback.print_exc()
-
+        report_exception('column_cal_button_clicked',e)
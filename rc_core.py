@@ -0,0 +1,23 @@
+"""
+Headless entry points of the four calculators.
+
+Each check takes a frozen spec dataclass and returns a result dataclass;
+nothing here touches Qt widgets, so the functions can be called in bulk,
+from worker threads or from other processes:
+
+    from rc_core import RecBeamSpec, check_recbeam
+    result = check_recbeam(RecBeamSpec(B=30, D=60, fc=280, fy=4200, ...))
+    result.phiMn, result.moment_ratio
+
+The GUI handlers (*_button_clicked) read their forms into the same specs
+and format the same results.
+"""
+from rc_recbeamcal_base import RecBeamSpec,RecBeamResult,check_recbeam,format_recbeam_result
+from rc_tbeamcal_base import TBeamSpec,TBeamResult,check_tbeam,format_tbeam_result
+from rc_beamdsgn_base import BeamDsgnSpec,BeamDsgnResult,design_beam,format_beam_dsgn_result
+from rc_columncal_base import ColumnSpec,ColumnResult,check_column,format_column_result,get_column_shear_capacity
+
+__all__=['RecBeamSpec','RecBeamResult','check_recbeam','format_recbeam_result',
+         'TBeamSpec','TBeamResult','check_tbeam','format_tbeam_result',
+         'BeamDsgnSpec','BeamDsgnResult','design_beam','format_beam_dsgn_result',
+         'ColumnSpec','ColumnResult','check_column','format_column_result','get_column_shear_capacity']
@@ -1,77 +1,152 @@
 import math
+from dataclasses import dataclass
 from beam_function import *
 from language_manager import lang_manager
+from tracing import traced,report_exception
 
-def recbeam_cal_button_clicked(data):
-    try :
-        B=float(data.width.text()) #cm
-        D=float(data.depth.text()) #cm
-        fy=float(data.fy.text()) #kgf/cm2
-        fc=float(data.fc.text()) #kgf/cm2
-        rebar_size1=data.bar1.currentText()
-        rebar_size2=data.bar2.currentText()
-        tensilebar_num=int(data.barnum1.text())
-        compressionbar_num=int(data.barnum2.text())
-        stirrup_size=data.stirrup_size.currentText()
-        stirrup_span=float(data.stirrup_span.text()) #cm
-        stirrup_num=stirrup_info(data.stirrup_num.currentText())
-        cnstrctblty=data.cnstrctblty
-        Mux=float(data.Mux.text()) #tf-m
-        Vuy=float(data.Vuy.text()) #tf
-        
-        PrtctT=get_clear_cover('Beam') #cm
-        bar_allowable_num_clicked(data,'Beam')
 
-        
-        [beta,Ec,bard1,Ab_rebar1,bard2,Ab_rebar2,As,Ass,d,dt,dd,db_stirrup,Ab_stirrup,\
-            RebarAllowabelNumPerRow1,RebarAllowabelNumPerRow2]=get_section_info(B,D,fc,fy,\
-            rebar_size1,rebar_size2,tensilebar_num,compressionbar_num,stirrup_size,PrtctT,cnstrctblty,"Beam")
+@dataclass(frozen=True)
+class RecBeamSpec:
+    """Rectangular beam check input (cm, kgf/cm2, tf, tf-m)."""
+    B: float
+    D: float
+    fc: float
+    fy: float
+    bar1: str
+    bar2: str
+    tensilebar_num: int
+    compressionbar_num: int
+    stirrup_size: str
+    stirrup_num: int #箍筋肢數
+    stirrup_span: float
+    Mux: float
+    Vuy: float
+    cnstrctblty: str='no'
+
+
+@dataclass(frozen=True)
+class RecBeamResult:
+    spec: RecBeamSpec
+    beta: float
+    bard1: float
+    bard2: float
+    db_stirrup: float
+    As: float
+    Ass: float
+    Asy: float
+    d: float
+    dt: float
+    dd: float
+    c: float
+    Cc: float #kgf
+    Cs: float #kgf
+    es: float
+    et: float
+    phi: float
+    Mn: float #tf-m
+    Av: float
+    Vc: float
+    phiVn: float
+    s_max: str #mm
+    RebarAllowabelNumPerRow1: int
+    RebarAllowabelNumPerRow2: int
+    status: int #neutral_axis 鋼筋狀態碼
+    control_msg: str #拉力/壓力控制
+    strain_msg: str #最外拉筋應變檢核
+
+    @property
+    def yield_msg(self):
+        #壓筋是否降伏, 輸出時才翻譯
+        return steel_state_text(self.status)
+
+    @property
+    def phiMn(self):
+        return self.phi*self.Mn
+
+    @property
+    def moment_ratio(self):
+        return self.spec.Mux/self.phi/self.Mn
+
+    @property
+    def shear_ratio(self):
+        return self.spec.Vuy/self.phiVn
+
+
+@traced
+def check_recbeam(spec):
+    """Flexure and shear check of a rectangular beam, without any widgets."""
+    PrtctT=get_clear_cover('Beam') #cm
+    [beta,Ec,bard1,Ab_rebar1,bard2,Ab_rebar2,As,Ass,d,dt,dd,db_stirrup,Ab_stirrup,\
+        RebarAllowabelNumPerRow1,RebarAllowabelNumPerRow2]=get_section_info(spec.B,spec.D,spec.fc,spec.fy,\
+        spec.bar1,spec.bar2,spec.tensilebar_num,spec.compressionbar_num,spec.stirrup_size,PrtctT,spec.cnstrctblty,"Beam")
+
+    #檢核壓筋是否降伏
+    [Asy,status,c,Cc,Cs,Mn]=cal_recbeam_Mn_status(dd,spec.fc,beta,spec.B,d,spec.fy,Ass,As)
+    [es,et,result1,result2,phi]=cal_phi(c,d,dt)
+
+    #剪力強度計算
+    [Av,Vc,phiVn]=cal_shear_strngth(db_stirrup,spec.stirrup_num,spec.stirrup_span,spec.fc,spec.fy,spec.B,d)
+    [s_max,s_max1,s_max2]=check_stirrup_span_limit(spec.Vuy,Vc,spec.fc,spec.fy,spec.B,d,Av)
+    s_max=s_max[0]
+    return RecBeamResult(spec,beta,bard1,bard2,db_stirrup,As,Ass,Asy,d,dt,dd,c,Cc,Cs,es,et,phi,Mn,Av,Vc,phiVn,s_max,
+                         RebarAllowabelNumPerRow1,RebarAllowabelNumPerRow2,status,result1,result2)
 
-        #檢核壓筋是否降伏
-        [Asy,result0,c,Cc,Cs,Mn]=cal_recbeam_Mn(dd,fc,beta,B,d,fy,Ass,As)
-        [es,et,result1,result2,phi]=cal_phi(c,d,dt)
 
-        #剪力強度計算
-        [Av,Vc,phiVn]=cal_shear_strngth(db_stirrup,stirrup_num,stirrup_span,fc,fy,B,d)
-        [s_max]=check_stirrup_span_limit(Vuy,Vc,fc,fy,B,d,Av)
+def read_recbeam_spec(data):
+    return RecBeamSpec(B=float(data.width.text()), #cm
+                       D=float(data.depth.text()), #cm
+                       fc=float(data.fc.text()), #kgf/cm2
+                       fy=float(data.fy.text()), #kgf/cm2
+                       bar1=data.bar1.currentText(),
+                       bar2=data.bar2.currentText(),
+                       tensilebar_num=int(data.barnum1.text()),
+                       compressionbar_num=int(data.barnum2.text()),
+                       stirrup_size=data.stirrup_size.currentText(),
+                       stirrup_num=stirrup_info(data.stirrup_num.currentText()),
+                       stirrup_span=float(data.stirrup_span.text()), #cm
+                       Mux=float(data.Mux.text()), #tf-m
+                       Vuy=float(data.Vuy.text()), #tf
+                       cnstrctblty=data.cnstrctblty)
+
+
+def format_recbeam_result(r):
+    info1='d= '+str(round(r.d,2))+'  cm'
+    info2='d\'= '+str(round(r.dd,2))+'  cm'
+    info3='dt= '+str(round(r.dt,2))+'  cm'
+    info4='As= '+str(round(r.As,2))+'  cm^2'
+    info5='As\'= '+str(round(r.Ass,2))+'  cm^2'
+    info6='Asy= '+str(round(r.Asy,2))+'  cm^2'
+    info7='c= '+str(round(r.c,2))+'  cm'
+    info8='\u03b5 s= '+str(round(r.es,5))
+    info9='\u03b5 t= '+str(round(r.et,5))
+    info10='Cc= '+str(round(r.Cc/1000,2))+'  tonf'
+    info11='Cs= '+str(round(r.Cs/1000,2))+'  tonf'
+    result3='\u03d5 Mn= '+str(round(r.phi,3))+'x'+str(round(r.Mn,2))+'= '+str(round(r.phiMn,2))+'  tf-m'
+    result4=lang_manager.tr('results.moment_ratio') + '= '+str(round(r.moment_ratio,3))
+    result5='\u03d5 Vn= '+str(round(r.phiVn,2)) +'  tf'
+    result6=lang_manager.tr('results.shear_ratio') + '= '+str(round(r.shear_ratio,3))
+    result7=lang_manager.tr('results.max_stirrup_spacing') + '= '+str(r.s_max) +'  mm'
+    return (r.yield_msg+'\n'+r.control_msg+'\n'+info1+'\n'+info2+'\n'+info3+'\n'+info4+'\n'+info5+'\n'+info6+'\n'+
+            info7+'\n'+info8+'\n'+info9+'\n'+r.strain_msg+'\n'+info10+'\n'+info11+'\n'+result3+'\n'+result4+'\n'
+            +result5+'\n'+result6+'\n'+result7+'\n' )
+
+
+def recbeam_cal_button_clicked(data):
+    try :
+        spec=read_recbeam_spec(data)
+        bar_allowable_num_clicked(data,'Beam')
+        result=check_recbeam(spec)
 
         #結果輸出
-        info1='d= '+str(round(d,2))+'  cm'
-        info2='d\'= '+str(round(dd,2))+'  cm'
-        info3='dt= '+str(round(dt,2))+'  cm'
-        info4='As= '+str(round(As,2))+'  cm^2'
-        info5='As\'= '+str(round(Ass,2))+'  cm^2'
-        info6='Asy= '+str(round(Asy,2))+'  cm^2'
-        info7='c= '+str(round(c,2))+'  cm'
-        info8='\u03b5 s= '+str(round(es,5))
-        info9='\u03b5 t= '+str(round(et,5))
-        info10='Cc= '+str(round(Cc/1000,2))+'  tonf'
-        info11='Cs= '+str(round(Cs/1000,2))+'  tonf'
-        result3='\u03d5 Mn= '+str(round(phi,3))+'x'+str(round(Mn,2))+'= '+str(round(phi*Mn,2))+'  tf-m'
-        result4=lang_manager.tr('results.moment_ratio') + '= '+str(round(Mux/phi/Mn,3))
-        result5='\u03d5 Vn= '+str(round(phiVn,2)) +'  tf'
-        result6=lang_manager.tr('results.shear_ratio') + '= '+str(round(Vuy/phiVn,3))
-        result7=lang_manager.tr('results.max_stirrup_spacing') + '= '+str(s_max) +'  mm'
-        data.textBrowser.setText((result0+'\n'+result1+'\n'+info1+'\n'+info2+'\n'+info3+'\n'+info4+'\n'+info5+'\n'+info6+'\n'+
-                                    info7+'\n'+info8+'\n'+info9+'\n'+result2+'\n'+info10+'\n'+info11+'\n'+result3+'\n'+result4+'\n'
-                                    +result5+'\n'+result6+'\n'+result7+'\n' ))
+        data.textBrowser.setText(format_recbeam_result(result))
         #畫圖
-        BarAllowabelNumPerRow=[RebarAllowabelNumPerRow1,RebarAllowabelNumPerRow1]
-        BarNum=[tensilebar_num,compressionbar_num]
-        data.rcrecbeamwidget.rcrecbeamdraw_info(data,BarNum,BarAllowabelNumPerRow,db_stirrup,bard1,bard2)
+        BarAllowabelNumPerRow=[result.RebarAllowabelNumPerRow1,result.RebarAllowabelNumPerRow1]
+        BarNum=[spec.tensilebar_num,spec.compressionbar_num]
+        data.rcrecbeamwidget.rcrecbeamdraw_info(data,BarNum,BarAllowabelNumPerRow,result.db_stirrup,result.bard1,result.bard2)
     except Exception as e:
         try:
             data.textBrowser.setText(lang_manager.tr('results.please_input_parameters'))
         except:
             # Fallback if translation fails
             data.textBrowser.setText('Please input the parameters')
-        # Print error for debugging
-        print(f"Error in recbeam_cal_button_clicked: {e}")
-        import traceback
-        traceback.print_exc()
-
-
-
-
-
-
+        report_exception('recbeam_cal_button_clicked',e)
@@ -0,0 +1,76 @@
+"""
+Rebar catalogue shared by the beam and column modules.
+
+Every bar has an integer id into the read-only arrays BAR_DIAMETER (cm)
+and BAR_AREA (cm2), so batch code can carry int arrays instead of strings:
+
+    ids = bar_ids(['#8(D25)', '#6(D19)', 'DB20'])
+    BAR_AREA[ids] * counts
+
+Series:
+    CNS   '#3(D10)' .. '#11(D36)', the sizes used throughout the program
+    ASTM  '#3' .. '#18' (A615, inch sizes), looked up with series='ASTM'
+    TIS   'RB6', 'RB9', 'DB10' .. 'DB40' (Thai TIS 20 / TIS 24)
+
+Areas are pi*d^2/4 of the tabulated nominal diameter. The short CNS names
+'#3' .. '#11' (as in BarDsgn) and 'D10' .. 'D36' resolve to the CNS bars.
+"""
+import numpy as np
+
+REBAR_DTYPE=np.dtype([("series","U4"),("name","U8"),("d","f8"),("A","f8")])
+
+#(系列, 名稱, 標稱直徑 cm)
+_BARS=[('CNS','#3(D10)',0.953),('CNS','#4(D13)',1.27),('CNS','#5(D16)',1.588),('CNS','#6(D19)',1.905),
+       ('CNS','#7(D22)',2.223),('CNS','#8(D25)',2.54),('CNS','#9(D29)',2.865),('CNS','#10(D32)',3.226),
+       ('CNS','#11(D36)',3.581),
+       ('ASTM','#3',0.9525),('ASTM','#4',1.27),('ASTM','#5',1.5875),('ASTM','#6',1.905),('ASTM','#7',2.2225),
+       ('ASTM','#8',2.54),('ASTM','#9',2.8651),('ASTM','#10',3.2258),('ASTM','#11',3.5814),('ASTM','#14',4.3002),
+       ('ASTM','#18',5.7328),
+       ('TIS','RB6',0.6),('TIS','RB9',0.9),('TIS','DB10',1.0),('TIS','DB12',1.2),('TIS','DB16',1.6),
+       ('TIS','DB20',2.0),('TIS','DB22',2.2),('TIS','DB25',2.5),('TIS','DB28',2.8),('TIS','DB32',3.2),
+       ('TIS','DB36',3.6),('TIS','DB40',4.0)]
+
+REBAR_TABLE=np.array([(series,name,d,np.pi*d**2/4) for series,name,d in _BARS],dtype=REBAR_DTYPE)
+REBAR_TABLE.flags.writeable=False
+BAR_DIAMETER=REBAR_TABLE["d"]
+BAR_AREA=REBAR_TABLE["A"]
+SERIES=('CNS','ASTM','TIS')
+
+_BY_SERIES={(str(row["series"]),str(row["name"])): i for i,row in enumerate(REBAR_TABLE)}
+_BY_NAME={}
+for (series,name),i in sorted(_BY_SERIES.items(),key=lambda item: SERIES.index(item[0][0])) :
+    _BY_NAME.setdefault(name,i)
+    if series=='CNS' :
+        #'#8(D25)' 也可寫成 '#8' 或 'D25'
+        [short,metric]=name[:-1].split('(')
+        _BY_NAME.setdefault(short,i)
+        _BY_NAME.setdefault(metric,i)
+
+
+def bar_id(name,series=None):
+    """Integer id of a bar name. Raises KeyError for an unknown bar."""
+    if series is None :
+        return _BY_NAME[name]
+    return _BY_SERIES[(series,name)]
+
+
+def find_bar_id(name,series=None):
+    """bar_id, or None for an unknown bar."""
+    try :
+        return bar_id(name,series)
+    except (KeyError,TypeError) :
+        return None
+
+
+def bar_ids(names,series=None):
+    """Integer ids of a sequence of bar names (ids pass through), as an int16 array."""
+    return np.array([bar_id(name,series) if isinstance(name,str) else int(name) for name in names],dtype=np.int16)
+
+
+def bar_name(i):
+    return str(REBAR_TABLE["name"][i])
+
+
+def series_ids(series):
+    """Ids of one series, smallest bar first."""
+    return tuple(int(i) for i in np.flatnonzero(REBAR_TABLE["series"]==series))
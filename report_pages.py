@@ -0,0 +1,110 @@
+"""
+Parallel rendering of the multi-page beam report.
+
+Each page builder (ImprovedRCBeamCalculator.create_pdf_page_1/2/3) runs in
+a worker process started with the spawn method. The workers use the Agg
+backend and return the page as a single-page vector PDF. pdf_merge joins
+those pages into one file without re-rendering them. An export therefore
+takes about as long as its slowest page.
+
+The worker pool is created on first use and kept for later exports, so
+the start-up and import cost is paid once per session. progress(done,
+total) is called while waiting. It may raise RenderCancelled to abandon
+an export. Pages already running finish in the background, and their
+results are discarded.
+"""
+import io
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor,wait,FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
+
+from pdf_merge import merge_pdfs
+
+PAGE_BUILDERS=('create_pdf_page_1','create_pdf_page_2','create_pdf_page_3')
+PDF_DPI=300
+#等待工作程序時回報進度的間隔 (s)
+POLL_INTERVAL=0.1
+PDF_INFO={'title': 'รายงานการคำนวณคาน RC ตามมาตรฐาน ACI 318',
+          'author': 'RC Beam Analysis Program',
+          'subject': 'การวิเคราะห์และออกแบบคาน RC',
+          'keywords': 'RC Beam, ACI 318, Concrete Design',
+          'creator': 'RC Beam Analysis Program v.1.0',
+          'producer': 'Enhanced PDF Generator'}
+
+_executor=None
+
+
+class RenderCancelled(Exception):
+    """Raised from a progress callback to abandon a running export."""
+
+
+def init_worker():
+    """Pool initializer: workers only draw off screen."""
+    import matplotlib
+    matplotlib.use('Agg')
+
+
+def render_page(builder,results,dpi=PDF_DPI):
+    """Draw one report page in a worker and return it as PDF bytes."""
+    import matplotlib.pyplot as plt
+    from demo_improved_gui import ImprovedRCBeamCalculator,setup_font_for_pdf
+    fig=getattr(ImprovedRCBeamCalculator,builder)(results,setup_font_for_pdf())
+    if fig is None :
+        raise RuntimeError(f"{builder} did not produce a page")
+    try :
+        buffer=io.BytesIO()
+        fig.savefig(buffer,format='pdf',dpi=dpi,bbox_inches='tight')
+        return buffer.getvalue()
+    finally :
+        plt.close(fig)
+
+
+def get_executor(workers=None):
+    """The shared spawn-based worker pool."""
+    global _executor
+    if _executor is None :
+        workers=workers or min(len(PAGE_BUILDERS),os.cpu_count() or 1)
+        _executor=ProcessPoolExecutor(max_workers=workers,
+                                      mp_context=multiprocessing.get_context('spawn'),
+                                      initializer=init_worker)
+    return _executor
+
+
+def shutdown_executor():
+    global _executor
+    if _executor is not None :
+        _executor.shutdown(wait=False,cancel_futures=True)
+        _executor=None
+
+
+def render_pages(results,builders=PAGE_BUILDERS,dpi=PDF_DPI,progress=None):
+    """PDF bytes of every page, in builder order, rendered in parallel."""
+    pages=[None]*len(builders)
+    pending=set()
+    try :
+        executor=get_executor()
+        futures={executor.submit(render_page,builder,results,dpi): i for i,builder in enumerate(builders)}
+        pending=set(futures)
+        while pending :
+            if progress is not None :
+                progress(len(builders)-len(pending),len(builders))
+            done,pending=wait(pending,timeout=POLL_INTERVAL,return_when=FIRST_COMPLETED)
+            for future in done :
+                pages[futures[future]]=future.result()
+    except BrokenProcessPool :
+        #工作程序異常結束, 下次重建
+        shutdown_executor()
+        raise
+    except BaseException :
+        for future in pending :
+            future.cancel()
+        raise
+    if progress is not None :
+        progress(len(builders),len(builders))
+    return pages
+
+
+def render_report_pdf(results,builders=PAGE_BUILDERS,dpi=PDF_DPI,progress=None):
+    """Render the report pages in parallel and return the assembled PDF bytes."""
+    return merge_pdfs(render_pages(results,builders,dpi,progress),PDF_INFO)
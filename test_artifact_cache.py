@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit Tests for Report Artefact Memoization
+Test coverage for cached_artifact of the rectangular beam window, without widgets
+"""
+
+import unittest
+import sys
+import os
+import types
+
+# Add current directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+try:
+    from PyQt5 import QtCore
+    from demo_improved_gui import ImprovedRCBeamCalculator
+    # test_gui_components replaces PyQt5 with mocks when it is imported first
+    HAS_QT = isinstance(QtCore, types.ModuleType)
+except ImportError:
+    HAS_QT = False
+
+
+@unittest.skipUnless(HAS_QT, "PyQt5 not available")
+class TestArtifactCache(unittest.TestCase):
+    """Test that artefacts are built once per distinct result"""
+
+    def setUp(self):
+        class Window:
+            results_key = ImprovedRCBeamCalculator.results_key
+            cached_artifact = ImprovedRCBeamCalculator.cached_artifact
+        self.window = Window()
+        self.window.last_results = {'B': 300.0, 'D': 600.0, 'moment_ratio': float('inf')}
+        self.window.report_cache = {}
+        self.builds = []
+
+    def build(self, results):
+        self.builds.append(dict(results))
+        return len(self.builds)
+
+    def test_same_result_is_reused(self):
+        self.assertEqual(self.window.cached_artifact(('tab', 0), self.build), 1)
+        self.assertEqual(self.window.cached_artifact(('tab', 0), self.build), 1)
+        self.assertEqual(self.window.cached_artifact('pdf', self.build), 2)
+        self.assertEqual(len(self.builds), 2)
+
+    def test_new_result_rebuilds(self):
+        self.window.cached_artifact(('tab', 0), self.build)
+        self.window.last_results = dict(self.window.last_results, D=650.0)
+        self.assertEqual(self.window.cached_artifact(('tab', 0), self.build), 2)
+        self.assertEqual(self.builds[-1]['D'], 650.0)
+
+    def test_cleared_cache_rebuilds_same_result(self):
+        """After Clear the same inputs draw into the emptied widgets again"""
+        self.window.cached_artifact(('tab', 2), self.build)
+        self.window.report_cache.clear()
+        self.assertEqual(self.window.cached_artifact(('tab', 2), self.build), 2)
+
+    def test_failed_build_is_not_stored(self):
+        """A build that raises or returns None is retried on the next call"""
+        def fail(results):
+            raise RuntimeError('no canvas')
+        with self.assertRaises(RuntimeError):
+            self.window.cached_artifact(('tab', 1), fail)
+        self.assertNotIn(('tab', 1), self.window.report_cache)
+        self.assertIsNone(self.window.cached_artifact(('tab', 1), lambda results: None))
+        self.assertNotIn(('tab', 1), self.window.report_cache)
+        self.assertEqual(self.window.cached_artifact(('tab', 1), self.build), 1)
+        self.assertEqual(self.window.cached_artifact(('tab', 1), self.build), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit Tests for the Batch Beam Schedule
+Test coverage for the batch_beam module
+"""
+
+import unittest
+import sys
+import os
+import tempfile
+
+import pandas as pd
+
+# Add current directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from batch_beam import run_batch, get_beam_spec, main, BAR_COLUMNS
+from rc_core import design_beam
+
+
+def make_table():
+    beam = {'B': 40, 'D': 70, 'hf': 15, 'length': 700, 'Sn': 300, 'BeamCondition': 'Interior Beam',
+            'fc': 280, 'fy': 4200, 'Mu_left_minus': 40, 'Mu_left_plus': 20, 'Mu_mid_minus': 5,
+            'Mu_mid_plus': 25, 'Mu_rght_minus': 45, 'Mu_rght_plus': 22,
+            'Vg_left': 15, 'Vg_mid': 3, 'Vg_rght': 16}
+    rows = [
+        dict(beam, id='B1'),
+        dict(beam, id='B2', B=30, D=60, Mu_left_minus=25, Mu_rght_minus=28),
+        dict(beam, id='B3', BeamCondition='Exterior Beam', CTbeam='yes'),
+        dict(beam, id='B4', fc='n/a'),
+    ]
+    return pd.DataFrame(rows)
+
+
+class TestBatchBeam(unittest.TestCase):
+    """Test the batch beam schedule"""
+
+    def test_serial_matches_design_beam(self):
+        """Each schedule row holds the single-beam design"""
+        table = make_table()
+        schedule = run_batch(table, workers=1)
+        self.assertEqual(len(schedule), len(table))
+        result = design_beam(get_beam_spec(table.loc[0]))
+        for col, n in zip(BAR_COLUMNS, result.dsgn_barnum):
+            self.assertEqual(schedule.loc[0, col], f'{n}-{result.choose_bar}')
+        self.assertAlmostEqual(schedule.loc[0, 'Ve'], round(result.Ve, 2))
+        self.assertLessEqual(schedule.loc[0, 'flexure_ratio'], 1)
+
+    def test_bad_row_is_reported(self):
+        """A beam that cannot be read is marked and the rest are designed"""
+        schedule = run_batch(make_table(), workers=1)
+        self.assertNotEqual(schedule.loc[3, 'error'], '')
+        self.assertTrue((schedule.loc[:2, 'error'] == '').all())
+
+    def test_blank_cell_is_reported(self):
+        """A beam with a blank moment is not designed"""
+        table = make_table()
+        table.loc[1, 'Mu_mid_plus'] = float('nan')
+        schedule = run_batch(table, workers=1)
+        self.assertEqual(schedule.loc[1, 'error'], 'ValueError: missing Mu_mid_plus')
+        self.assertTrue(schedule.loc[1, BAR_COLUMNS].isna().all())
+        self.assertTrue(pd.isna(schedule.loc[1, 'flexure_ratio']))
+        self.assertEqual(schedule.loc[0, 'error'], '')
+
+    def test_pool_matches_serial_and_streams_progress(self):
+        """The process pool gives the serial schedule and reports every beam"""
+        table = make_table()
+        serial = run_batch(table, workers=1)
+        seen = []
+        pooled = run_batch(table, workers=2, progress=lambda done, total, beam_id, error: seen.append((done, total, beam_id)))
+        pd.testing.assert_frame_equal(serial, pooled)
+        self.assertEqual([s[0] for s in seen], [1, 2, 3, 4])
+        self.assertEqual(sorted(s[2] for s in seen), ['B1', 'B2', 'B3', 'B4'])
+
+    def test_cli_writes_schedule(self):
+        """The command line reads a CSV and writes the schedule CSV"""
+        with tempfile.TemporaryDirectory() as tmp:
+            src = os.path.join(tmp, 'beams.csv')
+            dst = os.path.join(tmp, 'schedule.csv')
+            make_table().to_csv(src, index=False)
+            self.assertEqual(main([src, '-o', dst, '--workers', '1', '--quiet']), 0)
+            schedule = pd.read_csv(dst)
+            self.assertEqual(len(schedule), 4)
+            self.assertIn('hinge_stirrup', schedule.columns)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit Tests for the Batch Column Runner
+Test coverage for the batch_column module
+"""
+
+import unittest
+import sys
+import os
+import tempfile
+
+import pandas as pd
+
+# Add current directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from batch_column import run_batch, check_column_section, main, SECTION_COLUMNS
+from column_function import get_column_rebar_layout
+from pmm_surface import get_pmm_surface
+
+
+def make_table():
+    section_a = {'B': 50, 'D': 60, 'fc': 280, 'fy': 4200, 'bar1': '#8(D25)', 'bar2': '#8(D25)',
+                 'Nx': 4, 'Ny': 5, 'stirrup_size': '#4(D13)', 'stirrup_num': 2, 'stirrup_span': 15}
+    section_b = dict(section_a, B=40, D=40, Nx=3, Ny=3)
+    rows = [
+        dict(section_a, id='C1', case='1.4D', Pu=150, Mux=20, Muy=10),
+        dict(section_a, id='C1', case='1.2D+1.6L', Pu=400, Mux=-25, Muy=10),
+        dict(section_b, id='C2', case='1.4D', Pu=100, Mux=5, Muy=5),
+        dict(section_b, id='C2', case='0.9D+E', Pu=20, Mux=15, Muy=-8),
+        dict(section_a, id='C3', case='1.4D', Pu=-50, Mux=5, Muy=30),
+    ]
+    return pd.DataFrame(rows)
+
+
+class TestBatchColumn(unittest.TestCase):
+    """Test the batch column check"""
+
+    def test_serial_matches_single_section(self):
+        """Each row gives the ratio of the single-section surface check"""
+        table = make_table()
+        results = run_batch(table, workers=1)
+        self.assertEqual(len(results), len(table))
+        layout = get_column_rebar_layout(50, 60, '#8(D25)', '#8(D25)', 4, 5, '#4(D13)')
+        surface = get_pmm_surface(50, 60, 280, 4200, layout)
+        capacity_point, ratio = surface.capacity(150, 20, 10)
+        self.assertAlmostEqual(results.loc[0, 'pmm_ratio'], ratio)
+        self.assertAlmostEqual(results.loc[0, 'phiMn'], capacity_point[0])
+
+    def test_pool_matches_serial(self):
+        """The process pool returns the same table as the serial run"""
+        table = make_table()
+        serial = run_batch(table, workers=1)
+        pooled = run_batch(table, workers=2, chunksize=1)
+        pd.testing.assert_frame_equal(serial, pooled)
+
+    def test_governing_case_per_column(self):
+        """Every column id has exactly one governing load case"""
+        results = run_batch(make_table(), workers=1)
+        counts = results.groupby('id')['governing'].sum()
+        self.assertTrue((counts == 1).all())
+        c1 = results[results['id'] == 'C1']
+        governing = c1[c1['governing']].iloc[0]
+        self.assertEqual(governing['pmm_ratio'], c1['pmm_ratio'].max())
+        self.assertTrue((c1['governing_case'] == governing['case']).all())
+
+    def test_bad_rows_are_reported(self):
+        """An unknown bar or a blank cell fails only its own rows"""
+        table = make_table()
+        table.loc[2, 'bar2'] = 'D20'
+        table.loc[4, 'stirrup_num'] = float('nan')
+        results = run_batch(table, workers=1)
+        self.assertTrue(results.loc[2, 'error'].startswith('ValueError'))
+        self.assertEqual(results.loc[4, 'error'], 'ValueError: missing stirrup_num')
+        self.assertTrue(results.loc[[2, 4], 'pmm_ratio'].isna().all())
+        self.assertTrue((results.loc[[0, 1, 3], 'error'] == '').all())
+        self.assertEqual(results.loc[3, 'pmm_ratio'], run_batch(make_table(), workers=1).loc[3, 'pmm_ratio'])
+        # 控制組合只取有比值的列, 全部失敗的柱沒有控制組合
+        self.assertTrue(results.loc[3, 'governing'])
+        self.assertEqual(results.loc[2, 'governing_case'], '0.9D+E')
+        self.assertFalse(results.loc[4, 'governing'])
+        self.assertTrue(pd.isna(results.loc[4, 'governing_case']))
+
+    def test_shear_capacity(self):
+        """Shear strength follows the column check's effective depths"""
+        table = make_table()
+        section = table.loc[0, SECTION_COLUMNS].to_dict()
+        result = check_column_section(section, table.loc[[0]])
+        Av = 2 * 3.14159265 * 1.27 ** 2 / 4
+        d1 = 60 - 4 - 1.27 - 2.54 / 2
+        phiVny = 0.75 * (0.53 * 280 ** 0.5 * 50 * d1 + Av / 15 * 4200 * d1) / 1000
+        self.assertAlmostEqual(result['phiVny'].iloc[0], phiVny, places=1)
+
+    def test_cli_writes_results(self):
+        """The command line reads a CSV and writes the results CSV"""
+        with tempfile.TemporaryDirectory() as tmp:
+            src = os.path.join(tmp, 'columns.csv')
+            dst = os.path.join(tmp, 'results.csv')
+            make_table().to_csv(src, index=False)
+            self.assertEqual(main([src, '-o', dst, '--workers', '1']), 0)
+            results = pd.read_csv(dst)
+            self.assertEqual(len(results), 5)
+            self.assertIn('pmm_ratio', results.columns)
+            self.assertIn('phiVnx', results.columns)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -17,8 +17,10 @@ from beam_function import (
     get_EandG_vaule, rebar_info, stirrup_info, get_clear_cover,
     get_beta, cal_bar_allowable_num, cal_d_eff, cal_shear_strngth,
     cal_recbeam_Mn, cal_effective_width, check_stirrup_span_limit,
-    math2
+    math2, get_section_info, cal_effectived_beta,
+    section_cache_info, clear_section_cache, set_section_cache_size, SECTION_CACHE_SIZE
 )
+from language_manager import lang_manager
 from rc_recbeamcal_base import recbeam_cal_button_clicked
 from rc_beamdsgn_base import (
     dsgn_recbeam_single_As, dsgn_tbeam_single_As, 
@@ -413,6 +415,46 @@ class TestBeamDesignIntegration(unittest.TestCase):
             self.fail(f"Complete beam calculation flow failed: {e}")
 
 
+class TestSectionCache(unittest.TestCase):
+    """Test the section-property caches"""
+
+    def setUp(self):
+        clear_section_cache()
+
+    def tearDown(self):
+        set_section_cache_size(SECTION_CACHE_SIZE)
+
+    def test_repeated_section_hits_cache(self):
+        """An identical section is computed once"""
+        args = (30, 60, 280, 4200, '#8(D25)', '#6(D19)', 4, 2, '#4(D13)', 4, 'no', 'Beam')
+        first = get_section_info(*args)
+        second = get_section_info(*args)
+        self.assertEqual(first, second)
+        info = section_cache_info()['get_section_info']
+        self.assertEqual((info.hits, info.misses), (1, 1))
+        self.assertEqual(section_cache_info()['cal_d_eff'].misses, 2)
+
+    def test_effectived_beta_ignores_language(self):
+        """The row arrangement is keyed by meaning, not by its translated text"""
+        single = lang_manager.tr('results.single_row')
+        double = lang_manager.tr('results.double_row')
+        d_single = cal_effectived_beta([single, single], 60, 4, 2.54, 2.54, 280, 1.27, [3, 2], [4, 4])
+        d_double = cal_effectived_beta([double, single], 60, 4, 2.54, 2.54, 280, 1.27, [6, 2], [4, 4])
+        self.assertAlmostEqual(d_single[0], 60 - 4 - 1.27 - 1.27)
+        self.assertLess(d_double[0], d_single[0])
+        cal_effectived_beta([single, single], 60, 4, 2.54, 2.54, 280, 1.27, [3, 2], [4, 4])
+        self.assertEqual(section_cache_info()['cal_effectived_beta'].hits, 1)
+
+    def test_cache_size_is_bounded(self):
+        """The cache keeps at most maxsize sections"""
+        set_section_cache_size(2)
+        for B in (30, 35, 40, 45):
+            get_section_info(B, 60, 280, 4200, '#8(D25)', '#6(D19)', 4, 2, '#4(D13)', 4, 'no', 'Beam')
+        info = section_cache_info()['get_section_info']
+        self.assertEqual(info.maxsize, 2)
+        self.assertEqual(info.currsize, 2)
+
+
 if __name__ == '__main__':
     # Create test suite
     test_loader = unittest.TestLoader()
@@ -421,6 +463,7 @@ if __name__ == '__main__':
     # Add test classes
     test_suite.addTests(test_loader.loadTestsFromTestCase(TestBeamCalculationFunctions))
     test_suite.addTests(test_loader.loadTestsFromTestCase(TestBeamDesignIntegration))
+    test_suite.addTests(test_loader.loadTestsFromTestCase(TestSectionCache))
     
     # Run tests with detailed output
     runner = unittest.TextTestRunner(verbosity=2, buffer=True)
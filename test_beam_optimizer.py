@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit Tests for the Beam Reinforcement Optimizer
+Test coverage for the beam_optimizer module
+"""
+
+import unittest
+import sys
+import os
+
+# Add current directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from beam_optimizer import optimize_beam_bars, design_bars, ET_MIN
+from rc_beamdsgn_base import BarDsgn, CheckMratio
+
+
+class TestBeamOptimizer(unittest.TestCase):
+    """Test the minimum-steel search against CheckMratio"""
+
+    def setUp(self):
+        self.B, self.D, self.fc, self.fy = 40, 70, 280, 4200
+        self.Mu = (40, 20, 5, 25, 45, 22)
+        self.As_min = max(0.8 * self.fc ** 0.5 / self.fy * self.B * self.D, 14 / self.fy * self.B * self.D)
+        [barchart, self.barinfo] = BarDsgn(self.B, 'no', 10)
+        self.options = optimize_beam_bars(self.B, self.D, self.fc, self.fy, self.Mu, self.barinfo, self.As_min, 700)
+
+    def test_capacity_matches_check(self):
+        """Reported phiMn and et are those of CheckMratio for the same bars"""
+        self.assertTrue(self.options)
+        for option in self.options:
+            arrange = ['double' if r == 2 else 'single' for r in option.rows]
+            [phiMn_all, et_all, bar_ratio] = CheckMratio(self.barinfo, option.bar, list(option.dsgn_barnum), arrange,
+                                                         self.B, self.D, self.fc, self.fy)
+            for a, b in zip(option.phiMn, phiMn_all):
+                self.assertAlmostEqual(a, b, places=6)
+            for a, b in zip(option.et, et_all):
+                self.assertAlmostEqual(a, b, places=9)
+
+    def test_constraints_hold(self):
+        """Strength, strain, minimum steel, rows and seismic ratios"""
+        for option in self.options:
+            [bard, barA, n_per_row] = self.barinfo[option.bar][:3]
+            n = option.dsgn_barnum
+            for i in range(6):
+                self.assertGreaterEqual(option.phiMn[i], self.Mu[i])
+                self.assertGreaterEqual(option.et[i], ET_MIN)
+                self.assertGreaterEqual(n[i] * barA, self.As_min - 1e-9)
+                self.assertLessEqual(n[i], 2 * n_per_row)
+                self.assertGreaterEqual(4 * n[i], max(n[0], n[4]))
+            self.assertGreaterEqual(2 * n[1], n[0])
+            self.assertGreaterEqual(2 * n[5], n[4])
+
+    def test_pareto_front(self):
+        """No option is dominated and the pruned search finds the same front"""
+        for o in self.options:
+            for p in self.options:
+                if p is not o:
+                    self.assertFalse(p.weight <= o.weight and p.n_bars <= o.n_bars)
+        full = [design_bars(self.B, self.D, self.fc, self.fy, self.Mu, self.barinfo, bar, self.As_min, 700)
+                for bar in ('#5', '#6', '#7', '#8', '#9', '#10', '#11')]
+        lightest = min((o for o in full if o is not None), key=lambda o: o.weight)
+        self.assertAlmostEqual(self.options[0].weight, lightest.weight)
+
+    def test_infeasible_returns_empty(self):
+        """A moment no layout can carry gives no option"""
+        options = optimize_beam_bars(25, 40, 280, 4200, (200, 0, 0, 0, 0, 0), BarDsgn(25, 'no', 10)[1],
+                                     self.As_min, 600)
+        self.assertEqual(options, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
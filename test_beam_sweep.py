@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit Tests for the Beam Design-Space Sweep
+Test coverage for the beam_sweep module
+"""
+
+import unittest
+import sys
+import os
+
+import numpy as np
+
+# Add current directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from beam_function import (
+    get_section_info, cal_recbeam_Mn, cal_phi, cal_shear_strngth, cal_bar_allowable_num, rebar_info
+)
+from beam_sweep import sweep_recbeam, BAR_SIZES, STIRRUP_SIZES
+
+
+class TestBeamSweep(unittest.TestCase):
+    """Test the vectorized sweep against the scalar beam functions"""
+
+    def setUp(self):
+        self.result = sweep_recbeam([25, 30, 40], [50, 60, 75], [280, 350], 4200, comp_nums=(0, 2, 4))
+
+    def test_grid_size(self):
+        """One record per combination of the axes"""
+        n = 3 * 3 * 2 * 1 * len(BAR_SIZES) * 19 * 3 * len(STIRRUP_SIZES) * 3
+        self.assertEqual(len(self.result), n)
+
+    def test_matches_scalar_functions(self):
+        """Constructable points agree with get_section_info / cal_recbeam_Mn / cal_phi"""
+        ok = self.result[self.result['constructable']]
+        rng = np.random.default_rng(1)
+        for row in ok[rng.choice(len(ok), 100, replace=False)]:
+            bar = BAR_SIZES[row['bar']]
+            stirrup = STIRRUP_SIZES[row['stirrup']]
+            [beta, Ec, bard1, Ab1, bard2, Ab2, As, Ass, d, dt, dd, db_stirrup, Ab_stirrup, n1, n2] = get_section_info(
+                row['B'], row['D'], row['fc'], row['fy'], bar, bar, int(row['bar_num']), int(row['comp_num']),
+                stirrup, 4, 'no', 'Beam')
+            [Asy, result0, c, Cc, Cs, Mn] = cal_recbeam_Mn(dd, row['fc'], beta, row['B'], d, row['fy'], Ass, As)
+            [es, et, result1, result2, phi] = cal_phi(c, d, dt)
+            [Av, Vc, phiVn] = cal_shear_strngth(db_stirrup, 2, row['stirrup_span'], row['fc'], row['fy'], row['B'], d)
+            self.assertAlmostEqual(row['d'], d)
+            self.assertAlmostEqual(row['c'], c)
+            self.assertAlmostEqual(row['phiMn'], phi * Mn)
+            self.assertAlmostEqual(row['et'], et)
+            self.assertAlmostEqual(row['phiVn'], phiVn)
+
+    def test_constructability(self):
+        """Points needing more than two rows are flagged"""
+        result = sweep_recbeam(30, 60, 280, 4200, bar_sizes=['#8(D25)'], stirrup_sizes=['#4(D13)'],
+                               stirrup_spans=15, cnstrctblty='yes')
+        n_per_row, cleardb_h = cal_bar_allowable_num(30, 4, rebar_info('#8(D25)')[0], 1.27, 'yes', 'Beam')
+        np.testing.assert_array_equal(result['n_per_row'], n_per_row)
+        np.testing.assert_array_equal(result['constructable'], result['bar_num'] <= 2 * n_per_row)
+
+
+if __name__ == '__main__':
+    unittest.main()
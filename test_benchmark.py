@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit Tests for the Benchmark Harness
+Test coverage for timing, baseline storage and the regression check
+"""
+
+import unittest
+import sys
+import os
+import io
+import tempfile
+import contextlib
+
+# Add current directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from benchmark import (Benchmark, default_benchmarks, run_benchmarks, compare_results,
+                       save_results, load_results, main)
+
+
+def fake_results(best_ms):
+    return {'meta': {}, 'results': {name: {'best_ms': ms} for name, ms in best_ms.items()}}
+
+
+class TestBenchmarkHarness(unittest.TestCase):
+    """Test the benchmark runner and baseline comparison"""
+
+    def test_compare_results(self):
+        """Only cases slower than the threshold are regressions"""
+        baseline = fake_results({'a/typical': 10.0, 'a/worst': 20.0, 'b/worst': 1.0})
+        current = fake_results({'a/typical': 11.0, 'a/worst': 30.0, 'c/new': 5.0})
+        regressions = compare_results(current, baseline, threshold=20)
+        self.assertEqual([r[0] for r in regressions], ['a/worst'])
+        self.assertAlmostEqual(regressions[0][3], 50.0)
+        self.assertEqual(compare_results(current, baseline, threshold=60), [])
+
+    def test_run_and_round_trip(self):
+        """Results are timed per call and survive a JSON round trip"""
+        calls = []
+        benchmarks = [Benchmark('count/typical', lambda: calls.append(1), number=3),
+                      Benchmark('other/worst', lambda: None)]
+        results = run_benchmarks(benchmarks, pattern='count', repeat=2)
+        self.assertEqual(list(results['results']), ['count/typical'])
+        self.assertEqual(len(calls), 1 + 2 * 3)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'bench.json')
+            save_results(results, path)
+            self.assertEqual(load_results(path), results)
+
+    def test_default_cases_run(self):
+        """Every engine has a typical and a worst case, and the beam kernels run"""
+        names = [bench.name for bench in default_benchmarks()]
+        for engine in ['recbeam_Mn', 'tbeam_Mn', 'beam_design', 'bar_optimizer', 'interaction_point',
+                       'mm_diagram', 'column_check']:
+            self.assertIn(engine + '/typical', names)
+            self.assertIn(engine + '/worst', names)
+        results = run_benchmarks(pattern='*beam_Mn/*', repeat=1)
+        self.assertEqual(len(results['results']), 4)
+
+    def test_main_fails_on_regression(self):
+        """The command line exits 1 when a case exceeds the threshold"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'baseline.json')
+            save_results(fake_results({'recbeam_Mn/typical': 1e-9}), path)
+            with contextlib.redirect_stdout(io.StringIO()) as out:
+                status = main(['-k', 'recbeam_Mn/typical', '--repeat', '1', '--baseline', path])
+            self.assertEqual(status, 1)
+            self.assertIn('REGRESSION recbeam_Mn/typical', out.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
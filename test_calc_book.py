@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit Tests for the Calculation Book
+Test coverage for reading member tables and writing the indexed PDF
+"""
+
+import unittest
+import sys
+import os
+import re
+import tempfile
+
+# Add current directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd
+
+from calc_book import BEAM_COLUMNS, COLUMN_COLUMNS, read_members, beam_member, build_book
+from pdf_merge import read_objects
+
+
+BEAMS = pd.DataFrame([
+    {'id': 'B1', 'B': 30, 'D': 60, 'fc': 280, 'fy': 4200, 'bar1': '#8(D25)', 'bar2': '#6(D19)',
+     'tensilebar_num': 4, 'compressionbar_num': 2, 'stirrup_size': '#3(D10)', 'stirrup_num': 2,
+     'stirrup_span': 15, 'Mux': 30, 'Vuy': 20},
+    # 8 根 D32 排不下, 檢核失敗
+    {'id': 'B2', 'B': 30, 'D': 50, 'fc': 280, 'fy': 4200, 'bar1': '#10(D32)', 'bar2': '#10(D32)',
+     'tensilebar_num': 8, 'compressionbar_num': 4, 'stirrup_size': '#4(D13)', 'stirrup_num': 2,
+     'stirrup_span': 15, 'Mux': 40, 'Vuy': 20},
+])
+COLUMNS = pd.DataFrame([
+    {'B': 40, 'D': 40, 'fc': 280, 'fy': 4200, 'bar1': '#6(D19)', 'bar2': '#6(D19)', 'Nx': 3, 'Ny': 3,
+     'stirrup_size': '#3(D10)', 'stirrup_num': 2, 'stirrup_span': 15, 'Pu': 250, 'Mux': 25, 'Muy': 20},
+])
+
+
+class TestCalcBook(unittest.TestCase):
+    """Test the batch calculation book"""
+
+    def test_read_members(self):
+        """Rows become members with ids, and missing columns are reported"""
+        members = read_members(COLUMNS, 'column', COLUMN_COLUMNS, 'C')
+        self.assertEqual([(kind, member_id) for kind, member_id, row in members], [('column', 'C1')])
+        [spec, label] = beam_member(dict(BEAMS.iloc[0], stirrup_num='เหล็กปลอกสองขา'))
+        self.assertEqual((spec.stirrup_num, label), (2, 'เหล็กปลอกสองขา'))
+        with self.assertRaises(ValueError):
+            read_members(COLUMNS, 'beam', BEAM_COLUMNS, 'B')
+
+    def test_build_book(self):
+        """Members are written in order behind the contents page, each with a bookmark"""
+        members = (read_members(BEAMS, 'beam', BEAM_COLUMNS, 'B')
+                   + read_members(COLUMNS, 'column', COLUMN_COLUMNS, 'C'))
+        written = []
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'book.pdf')
+            entries = build_book(members, path, workers=1,
+                                 progress=lambda index, kind, member_id, summary: written.append(member_id))
+            with open(path, 'rb') as f:
+                data = f.read()
+        self.assertEqual(written, ['B1', 'B2', 'C1'])
+        [b1, b2, c1] = entries
+        self.assertEqual(b1[2], {'ratio': b1[2]['ratio'], 'ok': True})
+        self.assertEqual(b1[3], 2)
+        self.assertIsNone(b2[2])
+        self.assertEqual(c1[3], 5)
+        self.assertFalse(c1[2]['ok'])
+        objects, trailer = read_objects(data)
+        pages = [raw for raw in objects.values() if re.search(rb'/Type /Page\b', raw)]
+        self.assertEqual(len(pages), 1 + 3 + 1)
+        titles = [raw for raw in objects.values() if b'/Title <FEFF' in raw and b'/Dest' in raw]
+        self.assertEqual(len(titles), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,385 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit Tests for RC Column Calculation Functions
+Test coverage for the column_function module
+"""
+
+import unittest
+import sys
+import os
+import math
+
+import numpy as np
+
+# Add current directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from beam_function import get_clear_cover, get_phi
+from column_function import (
+    get_column_section_info, get_rebar_df, get_theta, get_alpha,
+    build_column_ord, cal_distance_from_point_to_line,
+    cal_Fs_T, cal_Fs_T_batch, RebarLayout, get_rebar_layout,
+    clip_compression_zone, cal_area, cal_centroid, cal_d_max,
+    find_interaction_point, find_interaction_points, find_interaction_curve,
+    get_mm_diagram, brent_root, bracket_root, get_pmmratio, get_pmmratio_batch
+)
+from rc_columncal_base import column_cal_button_clicked, ColumnSpec, check_column, CalculationCancelled
+
+try:
+    from PyQt5 import QtCore
+    from column_worker import ColumnCalWorker
+except ImportError:
+    QtCore = None
+
+
+class TestColumnRebarForces(unittest.TestCase):
+    """Test the batched steel force engine against the pandas path"""
+
+    def setUp(self):
+        """Set up a 50x60 cm column with 4x5 #8 bars"""
+        self.B = 50
+        self.D = 60
+        self.fc = 280
+        self.fy = 4200
+        self.Es = 2040000
+        [self.beta, self.Ec, db1, Ab1, db2, Ab2, dbs, Abs] = get_column_section_info(
+            self.B, self.D, self.fc, self.fy, '#8(D25)', '#8(D25)', '#4(D13)')
+        cover = get_clear_cover('Column') + dbs + db1
+        self.rebar_df = get_rebar_df(self.B, self.D, cover, 4, 5, Ab1, Ab2)
+        self.alpha = get_alpha(self.B, self.D, self.rebar_df, get_theta(20, 10), self.Es, self.Ec)
+        concrete_df = build_column_ord(self.B, self.D)
+        self.d_max = 2 * cal_distance_from_point_to_line(
+            concrete_df.loc['p1', 'x0'], concrete_df.loc['p1', 'y0'],
+            math.tan(math.radians(self.alpha)), -1, 0)
+        self.c_trial = np.linspace(0.05 * min(self.B, self.D), 2 * max(self.B, self.D), 30)
+
+    def test_batch_matches_pandas_path(self):
+        """Batched forces agree with cal_Fs_T within the documented rounding tolerance"""
+        x0 = self.rebar_df['x0'].to_numpy(dtype=float)
+        y0 = self.rebar_df['y0'].to_numpy(dtype=float)
+        Ab = self.rebar_df['Ab'].to_numpy(dtype=float)
+        epsilon, fs, FsandT, Fs, Mnx_s, Mny_s = cal_Fs_T_batch(
+            x0, y0, Ab, self.alpha, self.d_max, self.c_trial, self.beta, self.Es, self.fc, self.fy)
+
+        n_bars = len(x0)
+        self.assertEqual(epsilon.shape, (n_bars, len(self.c_trial)))
+        self.assertEqual(Fs.shape, (len(self.c_trial),))
+
+        tol_F = n_bars * 0.005
+        tol_M = n_bars * 0.005 * max(np.abs(x0).max(), np.abs(y0).max()) / 100
+        for j, c in enumerate(self.c_trial):
+            df, Fs_ref, Mnx_ref, Mny_ref = cal_Fs_T(
+                self.rebar_df.copy(), self.alpha, self.d_max, c, self.beta, self.Es, self.fc, self.fy)
+            self.assertLessEqual(abs(Fs[j] - Fs_ref), tol_F)
+            self.assertLessEqual(abs(Mnx_s[j] - Mnx_ref), tol_M)
+            self.assertLessEqual(abs(Mny_s[j] - Mny_ref), tol_M)
+            np.testing.assert_allclose(epsilon[:, j], df['epsilon'].to_numpy(dtype=float))
+
+    def test_stress_is_capped_at_yield(self):
+        """Steel stress never exceeds fy in tension or compression"""
+        x0 = self.rebar_df['x0'].to_numpy(dtype=float)
+        y0 = self.rebar_df['y0'].to_numpy(dtype=float)
+        Ab = self.rebar_df['Ab'].to_numpy(dtype=float)
+        _, fs, _, _, _, _ = cal_Fs_T_batch(
+            x0, y0, Ab, self.alpha, self.d_max, self.c_trial, self.beta, self.Es, self.fc, self.fy)
+        self.assertLessEqual(np.abs(fs).max(), self.fy)
+
+
+class TestRebarLayout(unittest.TestCase):
+    """Test the array-backed column bar layout"""
+
+    def test_perimeter_bar_coordinates(self):
+        """Bars are placed bottom row, top row, then left and right sides"""
+        layout = get_rebar_layout(40, 60, 6, 3, 4, 5.0, 3.0)
+        self.assertEqual(len(layout), 10)
+        np.testing.assert_allclose(layout.x0, [-14, 0, 14, -14, 0, 14, -14, -14, 14, 14])
+        np.testing.assert_allclose(layout.y0, [-24, -24, -24, 24, 24, 24, -8, 8, -8, 8])
+        np.testing.assert_allclose(layout.Ab, [5.0] * 6 + [3.0] * 4)
+        np.testing.assert_allclose(layout.y0_sq_Ab, layout.y0 ** 2 * layout.Ab)
+        self.assertAlmostEqual(layout.Ast, 42.0)
+
+    def test_arrays_are_contiguous_float64(self):
+        """Layout arrays are contiguous float64 and the type has no __dict__"""
+        layout = get_rebar_layout(120, 120, 7, 12, 12, 8.143, 8.143)
+        self.assertEqual(len(layout), 44)
+        for arr in (layout.x0, layout.y0, layout.Ab, layout.x0_sq_Ab, layout.y0_sq_Ab):
+            self.assertEqual(arr.dtype, np.float64)
+            self.assertTrue(arr.flags['C_CONTIGUOUS'])
+        self.assertFalse(hasattr(layout, '__dict__'))
+
+    def test_dataframe_round_trip(self):
+        """to_dataframe keeps the get_rebar_df columns and converts back"""
+        layout = get_rebar_layout(50, 60, 7, 4, 5, 5.067, 5.067)
+        df = layout.to_dataframe()
+        self.assertEqual(list(df.columns)[:5], ["x0", "y0", "Ab", "x0^2Ab", "y0^2Ab"])
+        self.assertEqual(list(df.index), list(range(1, len(layout) + 1)))
+        layout2 = RebarLayout.from_dataframe(df)
+        np.testing.assert_allclose(layout2.x0, layout.x0)
+        np.testing.assert_allclose(layout2.x0_sq_Ab, layout.x0_sq_Ab)
+
+
+class TestCompressionZoneClipping(unittest.TestCase):
+    """Test the half-plane clipper used for the concrete stress block"""
+
+    def setUp(self):
+        self.rect = build_column_ord(40, 60)
+
+    def test_horizontal_cut_of_rectangle(self):
+        """A horizontal cut keeps a strip at the top of the section"""
+        area, xc, yc = clip_compression_zone(self.rect[["x0", "y0"]].to_numpy(), 0, 10)
+        self.assertAlmostEqual(area[0], 40 * 20)
+        self.assertAlmostEqual(xc[0], 0)
+        self.assertAlmostEqual(yc[0], 20)
+
+    def test_inclined_cut_matches_gauss_formula(self):
+        """An inclined cut agrees with cal_area/cal_centroid on the clipped polygon"""
+        alpha = 30.0
+        offset = 5.0
+        area, xc, yc = clip_compression_zone(self.rect[["x0", "y0"]].to_numpy(), alpha, offset)
+        # 手算: y = tan(a)*x + offset/cos(a) 與矩形的交點
+        m = math.tan(math.radians(alpha))
+        n = offset / math.cos(math.radians(alpha))
+        points = np.array([[-20, 30], [-20, -20 * m + n], [20, 20 * m + n], [20, 30]])
+        self.assertAlmostEqual(area[0], cal_area(points), places=6)
+        xr, yr = cal_centroid(points)
+        self.assertAlmostEqual(xc[0], xr, places=6)
+        self.assertAlmostEqual(yc[0], yr, places=6)
+
+    def test_vectorized_offsets_and_limits(self):
+        """Many offsets are handled in one call, from empty to the full section"""
+        hexagon = np.array([[30, 0], [15, 26], [-15, 26], [-30, 0], [-15, -26], [15, -26]], dtype=float)
+        full = cal_area(hexagon)
+        area, xc, yc = clip_compression_zone(hexagon, 45, [100, 0, -100])
+        self.assertAlmostEqual(area[0], 0)
+        self.assertAlmostEqual(area[1], full / 2)
+        self.assertAlmostEqual(area[2], full)
+        self.assertAlmostEqual(xc[2], 0)
+        self.assertAlmostEqual(yc[2], 0)
+        self.assertLess(xc[1], 0)
+        self.assertGreater(yc[1], 0)
+
+    def test_batch_points_match_single_points(self):
+        """find_interaction_points returns the same values as the per-point call"""
+        fc, fy, Es, beta = 280, 4200, 2040000, 0.85
+        layout = get_rebar_layout(40, 60, 7, 3, 4, 5.067, 5.067)
+        c = np.array([3.0, 15.0, 35.0, 80.0])
+        Pn, Mnx, Mny, phi = find_interaction_points(40, 60, self.rect, 20, beta, c, fc, layout, Es, fy)
+        d_max = cal_d_max(self.rect, 20)
+        for i in range(len(c)):
+            single = find_interaction_point(40, 60, self.rect, 20, beta, c[i], d_max, fc, layout, Es, fy)
+            self.assertEqual(single, (round(Pn[i], 2), round(Mnx[i], 2), round(Mny[i], 2), round(phi[i], 2)))
+
+    def test_phi_arrays_match_scalars(self):
+        """get_phi gives the same factor for an array as element by element"""
+        et = np.array([0.0, 0.001, 0.002, 0.0035, 0.005, 0.01])
+        phi = get_phi(et)
+        self.assertEqual([get_phi(e) for e in et], list(phi))
+        self.assertEqual(list(phi[[0, 2, 4, 5]]), [0.65, 0.65, 0.9, 0.9])
+
+
+class TestAdaptiveInteractionCurve(unittest.TestCase):
+    """Test the adaptive neutral-axis sampler"""
+
+    def setUp(self):
+        self.B, self.D, self.fc, self.fy, self.Es, self.beta = 50, 60, 280, 4200, 2040000, 0.85
+        self.layout = get_rebar_layout(self.B, self.D, 7.08, 4, 5, 5.067, 5.067)
+        self.rect = build_column_ord(self.B, self.D)
+        self.alpha = 35.7
+
+    def test_fewer_evaluations_than_fixed_grid(self):
+        """The default tolerance needs fewer than the old 30 trial depths"""
+        c, Pn, Mnx, Mny, phi, n_eval = find_interaction_curve(
+            self.B, self.D, self.rect, self.alpha, self.beta, self.fc, self.layout, self.Es, self.fy)
+        self.assertLess(n_eval, 30)
+        self.assertEqual(len(c), n_eval)
+        self.assertTrue(np.all(np.diff(c) > 0))
+        self.assertAlmostEqual(c[0], 0.05 * min(self.B, self.D))
+        self.assertAlmostEqual(c[-1], 2 * max(self.B, self.D))
+
+    def test_curve_within_tolerance_of_dense_reference(self):
+        """Dense reference points stay close to the adaptive polyline"""
+        tol = 0.005
+        c, Pn, Mnx, Mny, phi, n_eval = find_interaction_curve(
+            self.B, self.D, self.rect, self.alpha, self.beta, self.fc, self.layout, self.Es, self.fy, tol=tol)
+        c_ref = np.linspace(c[0], c[-1], 500)
+        P_ref, X_ref, Y_ref, _ = find_interaction_points(
+            self.B, self.D, self.rect, self.alpha, self.beta, c_ref, self.fc, self.layout, self.Es, self.fy)
+        Mn, Mn_ref = np.hypot(Mnx, Mny), np.hypot(X_ref, Y_ref)
+        # 以 c 線性內插比較, 以曲線尺寸正規化
+        P_int = np.interp(c_ref, c, Pn)
+        M_int = np.interp(c_ref, c, Mn)
+        error = np.hypot((P_int - P_ref) / (Pn.max() - Pn.min()), (M_int - Mn_ref) / Mn.max())
+        self.assertLess(error.max(), 0.05)
+        self.assertLessEqual(n_eval, 200)
+
+
+class TestMMDiagramSolver(unittest.TestCase):
+    """Test the root finder used for the MM contour"""
+
+    def test_brent_root_on_cubic(self):
+        """Brent's method converges on a smooth function in few evaluations"""
+        f = lambda x: x ** 3 - 2 * x - 5
+        root, f_root, num = brent_root(f, 2.0, 3.0, f(2.0), f(3.0), 1e-10)
+        self.assertAlmostEqual(root, 2.0945514815, places=8)
+        self.assertLess(num, 12)
+
+    def test_bracket_root_expands_from_warm_start(self):
+        """The bracket grows from the warm start until the sign changes"""
+        f = lambda x: x - 7.3
+        a, b, fa, fb, num = bracket_root(f, 1.0, 0.0, 10.0, 0.5)
+        self.assertLessEqual(a, 7.3)
+        self.assertGreaterEqual(b, 7.3)
+        self.assertLessEqual(fa * fb, 0)
+
+    def test_mm_diagram_meets_tolerance(self):
+        """Every angle reaches Pu within the tolerance with few evaluations"""
+        B, D, fc, fy, Es, beta = 50, 60, 280, 4200, 2040000, 0.85
+        layout = get_rebar_layout(B, D, 7.08, 4, 5, 5.067, 5.067)
+        mm = get_mm_diagram(150, 995.1, -297.9, B, D, fc, fy, Es, beta, build_column_ord(B, D), layout)
+        self.assertEqual(len(mm), 21)
+        self.assertTrue((mm['error'] <= 0.01).all())
+        self.assertLess(mm['iter'].sum(), 21 * 5)
+
+    def test_mm_diagram_load_beyond_capacity(self):
+        """A Pu above the section's capacity does not raise"""
+        B, D, fc, fy, Es, beta = 40, 40, 280, 4200, 2040000, 0.85
+        layout = get_rebar_layout(B, D, 7.08, 3, 3, 5.067, 5.067)
+        mm = get_mm_diagram(5000, 550.0, -170.0, B, D, fc, fy, Es, beta, build_column_ord(B, D), layout)
+        self.assertEqual(len(mm), 21)
+        self.assertTrue((mm['error'] > 0.01).all())
+
+
+class TestPmmRatio(unittest.TestCase):
+    """Test the exact ray-polyline capacity lookup"""
+
+    def setUp(self):
+        self.phiMn = np.array([0.0, 50.0, 0.0])
+        self.phiPn = np.array([-100.0, 0.0, 100.0])
+
+    def test_exact_intersection(self):
+        """Ratios are exact on a straight-sided diagram, for many demands at once"""
+        Mn, Pn, ratio = get_pmmratio_batch(self.phiMn, self.phiPn, [0, 10, -50], [25, 10, 0])
+        np.testing.assert_allclose(ratio, [0.5, 0.3, 0.5])
+        np.testing.assert_allclose(Mn, [50, 100 / 3, 0], atol=1e-12)
+        np.testing.assert_allclose(Pn, [0, 100 / 3, -100], atol=1e-12)
+
+    def test_zero_demand(self):
+        """A zero demand has a zero ratio"""
+        _, _, ratio = get_pmmratio_batch(self.phiMn, self.phiPn, [0], [0])
+        self.assertEqual(ratio[0], 0)
+
+    def test_demand_outside_angular_range(self):
+        """A ray that misses the curve uses the nearest vertex instead of raising"""
+        Mn, Pn, ratio = get_pmmratio_batch([50.0, 0.0], [0.0, 100.0], [-10], [10])
+        self.assertAlmostEqual(ratio[0], math.sqrt(200) / 50)
+        self.assertAlmostEqual(Mn[0], 50 / math.sqrt(2))
+        self.assertAlmostEqual(Pn[0], -50 / math.sqrt(2))
+
+    def test_dataframe_wrapper(self):
+        """get_pmmratio keeps its (capacity point, rounded ratio) interface"""
+        import pandas as pd
+        diagram = pd.DataFrame({'phiMn': self.phiMn, 'phiPn': self.phiPn})
+        answer, ratio = get_pmmratio(diagram, 10, 10)
+        self.assertEqual(ratio, 0.3)
+        self.assertAlmostEqual(answer[0], 100 / 3)
+
+
+class TestColumnCalButton(unittest.TestCase):
+    """Run the column check handler with a stand-in for the Qt form"""
+
+    class _Field:
+        def __init__(self, value):
+            self.value = str(value)
+
+        def text(self):
+            return self.value
+
+        def currentText(self):
+            return self.value
+
+        def setText(self, value):
+            self.value = value
+
+        def append(self, value):
+            self.value += value
+
+    class _Widget:
+        def rccolumndraw_info(self, *args):
+            pass
+
+    class _Signal:
+        def emit(self, value):
+            self.value = value
+
+    def test_column_check_runs_headless(self):
+        """The handler writes the PMM ratio and emits the diagrams"""
+        form = type('Form', (), {})()
+        inputs = dict(width=50, depth=60, fy=4200, fc=280, bar1='#8(D25)', bar2='#8(D25)',
+                      barnum1=4, barnum2=5, stirrup_size='#4(D13)', stirrup_span=10,
+                      stirrup_num='Two-leg Stirrup', Mux=20, Muy=10, Pu=150)
+        for key, value in inputs.items():
+            setattr(form, key, self._Field(value))
+        form.cnstrctblty = 'no'
+        form.textBrowser = self._Field('')
+        form.barallowtext = self._Field('')
+        form.rccolumnwidget = self._Widget()
+        form.signal = self._Signal()
+
+        column_cal_button_clicked(form)
+
+        self.assertIn('PMM ratio= 0.4', form.textBrowser.text())
+        interaction_diagram, mm_diagram = form.signal.value[0], form.signal.value[1]
+        self.assertEqual(len(mm_diagram), 21)
+        self.assertGreater(len(interaction_diagram), 10)
+
+
+class TestColumnProgress(unittest.TestCase):
+    """Test progress reporting and cancellation of the column check"""
+
+    def setUp(self):
+        self.spec = ColumnSpec(B=50, D=60, fc=280, fy=4200, bar1='#8(D25)', bar2='#8(D25)', Nx=4, Ny=5,
+                               stirrup_size='#4(D13)', stirrup_num=2, stirrup_span=15,
+                               Pu=150, Mux=20, Muy=10)
+
+    def test_progress_counts_interaction_points(self):
+        """Progress counts increase steadily through the PMM and MM stages"""
+        counts = []
+        result = check_column(self.spec, progress=counts.append)
+        self.assertGreater(len(counts), 21)
+        self.assertTrue(all(b > a for a, b in zip(counts, counts[1:])))
+        self.assertEqual(result.pmm_ratio, check_column(self.spec).pmm_ratio)
+
+    def test_progress_can_cancel(self):
+        """Raising CalculationCancelled from progress stops the check"""
+        def cancel(n_points):
+            if n_points > 10:
+                raise CalculationCancelled()
+        with self.assertRaises(CalculationCancelled):
+            check_column(self.spec, progress=cancel)
+
+    @unittest.skipIf(QtCore is None, "PyQt5 not available")
+    def test_worker_thread(self):
+        """The worker emits progress and the result, or stops on interruption"""
+        app = QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+        worker = ColumnCalWorker(self.spec)
+        progress, results = [], []
+        worker.progressed.connect(progress.append, QtCore.Qt.DirectConnection)
+        worker.succeeded.connect(results.append, QtCore.Qt.DirectConnection)
+        worker.start()
+        self.assertTrue(worker.wait(60000))
+        self.assertGreater(len(progress), 0)
+        self.assertAlmostEqual(results[0].pmm_ratio, 0.475, delta=0.01)
+
+        worker = ColumnCalWorker(self.spec)
+        events = []
+        worker.progressed.connect(lambda n: worker.requestInterruption(), QtCore.Qt.DirectConnection)
+        worker.succeeded.connect(lambda r: events.append('succeeded'), QtCore.Qt.DirectConnection)
+        worker.cancelled.connect(lambda: events.append('cancelled'), QtCore.Qt.DirectConnection)
+        worker.start()
+        self.assertTrue(worker.wait(60000))
+        self.assertEqual(events, ['cancelled'])
+
+
+if __name__ == '__main__':
+    unittest.main()
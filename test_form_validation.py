@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit Tests for Input Validation Scheduling
+Test coverage for the debounced, incremental ValidationScheduler
+"""
+
+import unittest
+import sys
+import os
+import types
+
+# Add current directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+try:
+    from PyQt5 import QtCore
+    from input_validation import ValidationScheduler
+    # test_gui_components replaces PyQt5 with mocks when it is imported first
+    HAS_QT = isinstance(QtCore, types.ModuleType)
+except ImportError:
+    HAS_QT = False
+
+
+@unittest.skipUnless(HAS_QT, "PyQt5 not available")
+class TestValidationScheduler(unittest.TestCase):
+    """Test debouncing, parsed-value caching and incremental checks"""
+
+    def setUp(self):
+        self.app = QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+        self.texts = {'fc': '280', 'fy': '4200', 'n': '4'}
+        self.calls = []
+        self.scheduler = ValidationScheduler(delay_ms=10)
+        self.scheduler.add_field('fc', lambda: self.texts['fc'])
+        self.scheduler.add_field('fy', lambda: self.texts['fy'])
+        self.scheduler.add_field('n', lambda: self.texts['n'], int)
+        self.scheduler.add_check('material', ['fc', 'fy'], self.check_material)
+        self.scheduler.add_check('bars', ['n'], self.check_bars)
+        self.emitted = []
+        self.scheduler.validated.connect(lambda ok, msg: self.emitted.append((ok, msg)))
+
+    def check_material(self, fc, fy):
+        self.calls.append('material')
+        try:
+            return float(fc) >= 150 and float(fy) >= 2400, 'material'
+        except ValueError:
+            return False, 'not a number'
+
+    def check_bars(self, n):
+        self.calls.append('bars')
+        return n >= 2, 'bars'
+
+    def test_first_pass_runs_everything(self):
+        self.assertEqual(self.scheduler.flush(), (True, ''))
+        self.assertEqual(sorted(self.calls), ['bars', 'material'])
+        self.assertEqual(self.scheduler.value('fy'), 4200.0)
+        self.assertEqual(self.scheduler.value('n'), 4)
+
+    def test_keystrokes_are_coalesced(self):
+        """A burst of edits costs one pass once the timer fires"""
+        self.scheduler.flush()
+        self.calls.clear()
+        for text in ['2', '28', '280', '2800']:
+            self.texts['fy'] = text
+            self.scheduler.schedule('fy')
+        self.assertTrue(self.scheduler.is_pending())
+        self.assertEqual(self.calls, [])
+        deadline = QtCore.QDeadlineTimer(2000)
+        while self.scheduler.is_pending() and not deadline.hasExpired():
+            self.app.processEvents(QtCore.QEventLoop.AllEvents, 20)
+        self.assertEqual(self.calls, ['material'])
+        self.assertEqual(self.emitted[-1], (True, ''))
+
+    def test_only_changed_fields_rerun(self):
+        """Unchanged text and unrelated checks are not re-evaluated"""
+        self.scheduler.flush()
+        self.calls.clear()
+        self.scheduler.schedule('fc')
+        self.scheduler.flush()
+        self.assertEqual(self.calls, [])
+        self.texts['n'] = '1'
+        self.scheduler.schedule('n')
+        self.assertEqual(self.scheduler.flush(), (False, 'bars'))
+        self.assertEqual(self.calls, ['bars'])
+
+    def test_revalidate_emits_once(self):
+        """revalidate reports the status once, whether or not anything changed"""
+        self.scheduler.revalidate()
+        self.scheduler.revalidate()
+        self.assertEqual(self.emitted, [(True, ''), (True, '')])
+        self.texts['n'] = '1'
+        self.scheduler.schedule('n')
+        self.assertEqual(self.scheduler.revalidate(), (False, 'bars'))
+        self.assertEqual(self.emitted[-1], (False, 'bars'))
+        self.assertEqual(len(self.emitted), 3)
+
+    def test_unparsable_field_passes_text(self):
+        """A field that does not parse reaches the check as its raw text"""
+        self.texts['fc'] = 'abc'
+        self.assertEqual(self.scheduler.flush(), (False, 'not a number'))
+        self.assertIsNone(self.scheduler.value('fc'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit Tests for the Neutral-Axis Solver
+Test coverage for the neutral_axis module
+"""
+
+import unittest
+import sys
+import os
+
+import numpy as np
+
+# Add current directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from neutral_axis import (
+    solve_recbeam_c, recbeam_forces, solve_tbeam_c, tbeam_forces, ES_STRAIN,
+    STATUS_CS_ELASTIC, STATUS_TS_ELASTIC, STATUS_CS_IN_TENSION, STATUS_T_SHAPE, ERROR_INPUT, ERROR_NO_STEEL
+)
+from beam_function import cal_recbeam_Mn, cal_tbeam_Mn, cal_phi, cal_effective_width, steel_state_text
+from beam_sweep import tbeam_phiMn_grid, effective_width_grid
+from language_manager import lang_manager
+
+
+def residual(c, dd, fc, beta, B, d, fy, Ass, As):
+    fs_c = np.clip(ES_STRAIN * (c - dd) / c, -fy, fy)
+    fs_t = np.clip(ES_STRAIN * (d - c) / c, -fy, fy)
+    return 0.85 * fc * beta * B * c + Ass * (fs_c - 0.85 * fc) - As * fs_t
+
+
+class TestNeutralAxis(unittest.TestCase):
+    """Test the vectorized neutral-axis solve"""
+
+    def test_equilibrium_on_random_sections(self):
+        """Forces balance to round-off over a wide range of sections"""
+        rng = np.random.default_rng(0)
+        n = 20000
+        B = rng.uniform(15, 100, n)
+        d = rng.uniform(20, 140, n)
+        dd = rng.uniform(3, 10, n)
+        fc = rng.uniform(140, 700, n)
+        fy = rng.choice([2800, 4200, 5000, 5600], n)
+        beta = np.where(fc <= 280, 0.85, np.maximum(0.65, 0.85 - 0.05 / 70 * (fc - 280)))
+        As = rng.uniform(0.5, 200, n)
+        Ass = rng.uniform(0, 200, n)
+        c, fs_c, fs_t, status = solve_recbeam_c(dd, fc, beta, B, d, fy, Ass, As)
+        self.assertTrue((status >= 0).all())
+        scale = 0.85 * fc * B * d + (As + Ass) * fy
+        self.assertLess(np.max(np.abs(residual(c, dd, fc, beta, B, d, fy, Ass, As)) / scale), 1e-12)
+        self.assertTrue((np.abs(fs_c) <= fy).all() and (np.abs(fs_t) <= fy).all())
+
+    def test_steel_states(self):
+        """Status flags follow the steel stresses"""
+        # under-reinforced, compression steel yields
+        c, fs_c, fs_t, status = solve_recbeam_c(5, 280, 0.85, 30, 55, 4200, 2, 30)
+        self.assertEqual(status, 0)
+        self.assertEqual(fs_c, 4200)
+        # over-reinforced: tension steel stays elastic
+        c, fs_c, fs_t, status = solve_recbeam_c(5, 280, 0.85, 30, 55, 4200, 0, 150)
+        self.assertTrue(status & STATUS_TS_ELASTIC)
+        self.assertAlmostEqual(fs_t, ES_STRAIN * (55 - c) / c)
+        # lightly reinforced with heavy compression bars: neutral axis above dd
+        c, fs_c, fs_t, status = solve_recbeam_c(8, 280, 0.85, 60, 55, 4200, 40, 4)
+        self.assertTrue(status & STATUS_CS_ELASTIC)
+        self.assertTrue(status & STATUS_CS_IN_TENSION)
+        self.assertLess(c, 8)
+
+    def test_error_codes(self):
+        """Bad input and sections without steel give codes, not exceptions"""
+        c, fs_c, fs_t, status = solve_recbeam_c(5, 280, 0.85, [30, -30, 30, np.nan], 55, 4200, 0, [10, 10, 0, 10])
+        self.assertGreaterEqual(status[0], 0)
+        np.testing.assert_array_equal(status[1:], [ERROR_INPUT, ERROR_NO_STEEL, ERROR_INPUT])
+        self.assertTrue(np.isnan(c[1:]).all())
+
+    def test_scalar_wrapper(self):
+        """cal_recbeam_Mn returns the solver's forces and keeps its messages"""
+        Asy, result0, c, Cc, Cs, Mn = cal_recbeam_Mn(5, 280, 0.85, 30, 55, 4200, 2, 20)
+        c2, Cc2, Cs2, Mn2, status = recbeam_forces(5, 280, 0.85, 30, 55, 4200, 2, 20)
+        self.assertAlmostEqual(c, c2)
+        self.assertAlmostEqual(Mn, Mn2)
+        self.assertIsInstance(result0, str)
+        with self.assertRaises(ValueError):
+            cal_recbeam_Mn(5, 280, 0.85, 30, 55, 4200, 0, 0)
+
+
+class TestTBeamKernel(unittest.TestCase):
+    """Test the vectorized T-beam kernel"""
+
+    def test_no_overhang_is_rectangular(self):
+        """be = B gives the rectangular solve"""
+        args = (6, 280, 0.85, 30, 55, 4200, 3, [10, 30, 60])
+        c1, Cc1, Cs1, Mn1, status1 = recbeam_forces(*args)
+        c2, Cc2, Cs2, Mn2, status2 = tbeam_forces(*args, 30, 12)
+        np.testing.assert_allclose(c1, c2)
+        np.testing.assert_allclose(Mn1, Mn2)
+        np.testing.assert_array_equal(status1, status2)
+
+    def test_flange_equilibrium(self):
+        """The block enters the web only when the flange cannot balance As*fy"""
+        As = np.array([10.0, 40.0, 120.0])
+        c, fs_c, fs_t, status = solve_tbeam_c(6, 280, 0.85, 30, 60, 4200, 0, As, 120, 10)
+        a = 0.85 * c
+        Ac = 120 * np.minimum(a, 10) + 30 * np.maximum(a - 10, 0)
+        np.testing.assert_allclose(0.85 * 280 * Ac, As * fs_t, rtol=1e-12)
+        np.testing.assert_array_equal(status & STATUS_T_SHAPE > 0, a > 10)
+        self.assertFalse(status[0] & STATUS_T_SHAPE)
+        self.assertTrue(status[2] & STATUS_T_SHAPE)
+
+    def test_grid_matches_scalar(self):
+        """tbeam_phiMn_grid agrees with cal_tbeam_Mn and cal_phi"""
+        rng = np.random.default_rng(3)
+        n = 200
+        B = rng.uniform(20, 60, n)
+        be = B + rng.uniform(0, 200, n)
+        hf = rng.uniform(8, 20, n)
+        d = rng.uniform(40, 100, n)
+        dt = d + rng.uniform(0, 4, n)
+        As = rng.uniform(5, 80, n)
+        Ass = rng.uniform(0, 30, n)
+        phiMn, c, et, status = tbeam_phiMn_grid(6, 280, 0.85, B, d, dt, 4200, Ass, As, be, hf)
+        for i in range(n):
+            Asy, result0, c1, Cc, Cs, Mn = cal_tbeam_Mn(6, 0.85, hf[i], 280, 4200, B[i], d[i], be[i], Ass[i], As[i])
+            es, et1, result1, result2, phi = cal_phi(c1, d[i], dt[i])
+            self.assertAlmostEqual(c[i], c1)
+            self.assertAlmostEqual(phiMn[i], phi * Mn)
+            self.assertEqual(result0, steel_state_text(status[i], tbeam=True))
+
+    def test_status_text_at_presentation(self):
+        """Status codes become the translated messages"""
+        text = steel_state_text(STATUS_T_SHAPE | STATUS_CS_ELASTIC, tbeam=True)
+        self.assertEqual(text, lang_manager.tr('results.compression_area_t_shape') + '\n'
+                         + lang_manager.tr('results.compression_not_yielding'))
+        self.assertEqual(steel_state_text(STATUS_TS_ELASTIC),
+                         lang_manager.tr('results.compression_yielding_tension_not_yielding'))
+
+    def test_effective_width_grid(self):
+        """Vectorized effective width agrees with cal_effective_width"""
+        B = np.array([30, 40, 50])
+        be = effective_width_grid(np.array([True, False, True]), B, 300, 12, 800)
+        self.assertAlmostEqual(be[0], cal_effective_width('Interior Beam', 30, 300, 12, 800))
+        self.assertAlmostEqual(be[1], cal_effective_width('Exterior Beam', 40, 300, 12, 800))
+        self.assertAlmostEqual(be[2], cal_effective_width('Interior Beam', 50, 300, 12, 800))
+
+
+if __name__ == '__main__':
+    unittest.main()
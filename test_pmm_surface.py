@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit Tests for the P-M-M Interaction Surface
+Test coverage for the pmm_surface module
+"""
+
+import unittest
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+# Add current directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from column_function import (
+    get_rebar_layout, build_column_ord, find_interaction_points, get_column_rebar_layout
+)
+from pmm_surface import (
+    build_pmm_surface, get_pmm_surface, pmm_surface_cache_info, clear_pmm_surface_cache,
+    check_load_combinations
+)
+
+
+class TestPmmSurface(unittest.TestCase):
+    """Test surface generation, meridian interpolation and caching"""
+
+    def setUp(self):
+        """Set up a 50x60 cm column with 4x5 #8 bars"""
+        self.B, self.D, self.fc, self.fy = 50, 60, 280, 4200
+        self.layout = get_rebar_layout(self.B, self.D, 7.08, 4, 5, 5.067, 5.067)
+        clear_pmm_surface_cache()
+
+    def test_surface_shape(self):
+        """Surface arrays span the alpha x c grid and are read-only"""
+        surface = build_pmm_surface(self.B, self.D, self.fc, self.fy, self.layout, n_alpha=36, n_c=20)
+        self.assertEqual(surface.Pn.shape, (36, 20))
+        self.assertEqual(surface.phi.shape, (36, 20))
+        self.assertFalse(surface.Pn.flags.writeable)
+
+    def test_meridian_matches_direct_slice(self):
+        """The interpolated meridian reproduces a directly computed slice"""
+        surface = get_pmm_surface(self.B, self.D, self.fc, self.fy, self.layout)
+        Pn, Mnx, Mny, _ = find_interaction_points(
+            self.B, self.D, build_column_ord(self.B, self.D), 35.7, 0.85, surface.c,
+            self.fc, self.layout, 2040000, self.fy)
+        theta = np.degrees(np.arctan2(-Mny, Mnx))
+        P_range = Pn.max() - Pn.min()
+        M_max = np.hypot(Mnx, Mny).max()
+        for j in (5, 12, 20, 30):
+            c, phi, Pn_m, Mnx_m, Mny_m = surface.meridian(theta[j])
+            self.assertLess(abs(Pn_m[j] - Pn[j]) / P_range, 0.005)
+            self.assertLess(abs(Mnx_m[j] - Mnx[j]) / M_max, 0.005)
+            self.assertLess(abs(Mny_m[j] - Mny[j]) / M_max, 0.005)
+
+    def test_symmetric_section_uniaxial_meridian(self):
+        """At theta=0 a symmetric section gives the alpha=0 slice with Mny=0"""
+        surface = get_pmm_surface(self.B, self.D, self.fc, self.fy, self.layout)
+        c, phi, Pn, Mnx, Mny = surface.meridian(0.0)
+        np.testing.assert_allclose(Pn, surface.Pn[0], atol=1e-6)
+        np.testing.assert_allclose(Mny, 0.0, atol=1e-6)
+
+    def test_cache_reuses_surface(self):
+        """Equal sections hit the cache and return the same surface"""
+        s1 = get_pmm_surface(self.B, self.D, self.fc, self.fy, self.layout)
+        s2 = get_pmm_surface(self.B, self.D, self.fc, self.fy,
+                             get_rebar_layout(self.B, self.D, 7.08, 4, 5, 5.067, 5.067))
+        s3 = get_pmm_surface(self.B, self.D, 350, self.fy, self.layout)
+        self.assertIs(s1, s2)
+        self.assertIsNot(s1, s3)
+        info = pmm_surface_cache_info()
+        self.assertEqual(info.hits, 1)
+        self.assertEqual(info.misses, 2)
+
+    def test_capacity_ratio(self):
+        """The surface PMM ratio agrees with the single-section check"""
+        surface = get_pmm_surface(self.B, self.D, self.fc, self.fy, self.layout)
+        capacity_point, ratio = surface.capacity(150, 20, 10)
+        self.assertAlmostEqual(ratio, 0.475, delta=0.01)
+
+
+class TestLoadCombinationCheck(unittest.TestCase):
+    """Test the batch load-combination checker"""
+
+    def setUp(self):
+        layout = get_column_rebar_layout(50, 60, '#8(D25)', '#8(D25)', 4, 5, '#4(D13)')
+        self.surface = get_pmm_surface(50, 60, 280, 4200, layout)
+
+    def test_rows_match_single_capacity(self):
+        """Each row gives the same ratio as a single capacity lookup"""
+        loads = [[150, 20, 10], [-50, 5, 30], [400, -25, 10], [0, 40, -40]]
+        result = check_load_combinations(self.surface, loads)
+        self.assertEqual(len(result), 4)
+        for i, (Pu, Mux, Muy) in enumerate(loads):
+            capacity_point, ratio = self.surface.capacity(Pu, Mux, Muy)
+            self.assertAlmostEqual(result.loc[i, 'pmm_ratio'], ratio)
+            self.assertAlmostEqual(result.loc[i, 'phiMn'], capacity_point[0])
+            self.assertAlmostEqual(result.loc[i, 'phiPn'], capacity_point[1])
+
+    def test_governing_combination(self):
+        """Exactly one row, the one with the highest ratio, governs"""
+        loads = pd.DataFrame({'Pu': [100, 100, 100], 'Mux': [5, 40, 20], 'Muy': [0, 0, 0]})
+        result = check_load_combinations(self.surface, loads)
+        self.assertEqual(result['governing'].sum(), 1)
+        self.assertTrue(result.loc[1, 'governing'])
+        self.assertEqual(result.loc[1, 'pmm_ratio'], result['pmm_ratio'].max())
+
+
+if __name__ == '__main__':
+    unittest.main()
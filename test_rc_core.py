@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit Tests for the Headless Calculator API
+Test coverage for rc_core and the GUI handlers built on it
+"""
+
+import unittest
+import sys
+import os
+import dataclasses
+
+# Add current directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from rc_core import (
+    RecBeamSpec, check_recbeam, TBeamSpec, check_tbeam,
+    BeamDsgnSpec, design_beam, ColumnSpec, check_column
+)
+from rc_recbeamcal_base import recbeam_cal_button_clicked
+from beam_function import rebar_info
+
+
+class _Field:
+    def __init__(self, value):
+        self.value = str(value)
+
+    def text(self):
+        return self.value
+
+    def currentText(self):
+        return self.value
+
+    def setText(self, value):
+        self.value = value
+
+    def append(self, value):
+        self.value += value
+
+
+class TestRecBeamCheck(unittest.TestCase):
+    """Test the rectangular beam check"""
+
+    def setUp(self):
+        self.spec = RecBeamSpec(B=30, D=60, fc=280, fy=4200, bar1='#8(D25)', bar2='#6(D19)',
+                                tensilebar_num=4, compressionbar_num=2, stirrup_size='#4(D13)',
+                                stirrup_num=2, stirrup_span=15, Mux=20, Vuy=12)
+
+    def test_force_equilibrium(self):
+        """Concrete and compression steel balance the yielded tension steel"""
+        result = check_recbeam(self.spec)
+        self.assertAlmostEqual((result.Cc + result.Cs) / 1000, result.As * 4200 / 1000, places=2)
+        self.assertAlmostEqual(result.phiMn, result.phi * result.Mn)
+        self.assertAlmostEqual(result.moment_ratio, 20 / result.phiMn)
+
+    def test_spec_is_frozen(self):
+        """Specs are immutable and hashable, so they can key caches"""
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            self.spec.B = 40
+        self.assertEqual(hash(self.spec), hash(dataclasses.replace(self.spec)))
+
+    def test_handler_renders_result(self):
+        """The GUI handler writes the core result into the text browser"""
+        class Form:
+            pass
+        form = Form()
+        for name, value in dict(width=30, depth=60, fy=4200, fc=280, bar1='#8(D25)', bar2='#6(D19)',
+                                barnum1=4, barnum2=2, stirrup_size='#4(D13)', stirrup_span=15,
+                                stirrup_num='2', Mux=20, Vuy=12).items():
+            setattr(form, name, _Field(value))
+        form.cnstrctblty = 'no'
+        form.textBrowser = _Field('')
+        form.barallowtext = _Field('')
+        drawn = []
+        form.rcrecbeamwidget = type('W', (), {'rcrecbeamdraw_info': lambda self, *args: drawn.append(args)})()
+        recbeam_cal_button_clicked(form)
+        result = check_recbeam(self.spec)
+        self.assertIn('= ' + str(round(result.moment_ratio, 3)), form.textBrowser.text())
+        self.assertEqual(len(drawn), 1)
+
+
+class TestTBeamCheck(unittest.TestCase):
+    """Test the T-beam check"""
+
+    def test_effective_width_and_equilibrium(self):
+        """Interior beam flange width and force balance"""
+        spec = TBeamSpec(B=30, D=60, hf=15, length=600, Sn=300, BeamCondition='Interior Beam',
+                         fc=280, fy=4200, bar1='#8(D25)', bar2='#6(D19)', tensilebar_num=4,
+                         compressionbar_num=2, stirrup_size='#4(D13)', stirrup_num=2,
+                         stirrup_span=15, Mux=20, Vuy=12)
+        result = check_tbeam(spec)
+        self.assertAlmostEqual(result.be, min(600 / 4, 30 + 300, 30 + 16 * 15))
+        self.assertAlmostEqual((result.Cc + result.Cs) / 1000, result.As * 4200 / 1000, places=2)
+        self.assertLess(result.moment_ratio, 1)
+
+
+class TestBeamDesign(unittest.TestCase):
+    """Test the headless beam design"""
+
+    def test_bars_carry_moments(self):
+        """Each location carries its moment with at least the minimum steel"""
+        spec = BeamDsgnSpec(B=40, D=70, hf=15, length=700, Sn=300, BeamCondition='Interior Beam',
+                            fc=280, fy=4200, Mu=(40, 20, 5, 25, 45, 22), Vg=(15, 3, 16))
+        result = design_beam(spec)
+        Ab = result.barinfo[result.choose_bar][1]
+        As_min = max(0.8 * 280 ** 0.5 / 4200 * 40 * 70, 14 / 4200 * 40 * 70)
+        for n in result.dsgn_barnum:
+            self.assertGreaterEqual(n * Ab, As_min)
+        for Mu, phiMn in zip(spec.Mu, result.phiMn_all):
+            self.assertGreaterEqual(phiMn, Mu)
+        self.assertEqual(result.choose_bar, result.bar_options[0].bar)
+
+
+class TestColumnCheck(unittest.TestCase):
+    """Test the headless column check"""
+
+    def test_reference_section(self):
+        """50x60 cm column with 4x5 #8 bars"""
+        spec = ColumnSpec(B=50, D=60, fc=280, fy=4200, bar1='#8(D25)', bar2='#8(D25)', Nx=4, Ny=5,
+                          stirrup_size='#4(D13)', stirrup_num=2, stirrup_span=15, Pu=150, Mux=20, Muy=10)
+        result = check_column(spec)
+        self.assertAlmostEqual(result.Ast, 14 * rebar_info('#8(D25)')[1], places=6)
+        self.assertAlmostEqual(result.pmm_ratio, 0.475, delta=0.01)
+        self.assertGreater(result.phiVny, result.phiVnx)
+
+
+if __name__ == '__main__':
+    unittest.main()
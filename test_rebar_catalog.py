@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit Tests for the Rebar Catalogue
+Test coverage for the rebar_catalog module and its users
+"""
+
+import unittest
+import sys
+import os
+import math
+
+import numpy as np
+
+# Add current directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from rebar_catalog import (
+    REBAR_TABLE, BAR_DIAMETER, BAR_AREA, bar_id, find_bar_id, bar_ids, bar_name, series_ids
+)
+from beam_function import rebar_info, BAR_SIZES
+from rc_beamdsgn_base import BarDsgn
+
+
+class TestRebarCatalog(unittest.TestCase):
+    """Test the array-backed rebar catalogue"""
+
+    def test_table_is_read_only(self):
+        """The catalogue cannot be changed after import"""
+        with self.assertRaises(ValueError):
+            BAR_AREA[0] = 1.0
+        with self.assertRaises(ValueError):
+            REBAR_TABLE['d'][0] = 1.0
+
+    def test_vectorized_lookup(self):
+        """Name lists become id arrays that index the property arrays"""
+        ids = bar_ids(['#8(D25)', 'D25', '#8', 'DB20', 5])
+        self.assertEqual(ids.dtype, np.int16)
+        self.assertEqual(len(set(ids[:3].tolist() + [5])), 1)
+        np.testing.assert_allclose(BAR_AREA[ids[:2]], math.pi * 2.54 ** 2 / 4)
+        self.assertAlmostEqual(BAR_DIAMETER[ids[3]], 2.0)
+
+    def test_series(self):
+        """ASTM, CNS and Thai sizes are kept apart"""
+        self.assertEqual(bar_name(bar_id('#8', series='ASTM')), '#8')
+        self.assertNotEqual(bar_id('#8', series='ASTM'), bar_id('#8'))
+        self.assertEqual([bar_name(i) for i in series_ids('CNS')], list(BAR_SIZES))
+        self.assertIn('DB40', [bar_name(i) for i in series_ids('TIS')])
+        self.assertIsNone(find_bar_id('#99'))
+        with self.assertRaises(KeyError):
+            bar_id('#99')
+
+    def test_modules_share_one_table(self):
+        """rebar_info and BarDsgn read the same diameters and areas"""
+        [barchart, barinfo] = BarDsgn(40, 'no', 10)
+        for bar in barchart:
+            d, A = rebar_info(bar)
+            self.assertEqual(barinfo[bar][:2], [d, A])
+            self.assertEqual(rebar_info(bar_id(bar)), (d, A))
+        self.assertEqual(rebar_info('invalid'), ('none', 'none'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit Tests for Report Page Rendering
+Test coverage for merging matplotlib PDF pages and cancelling a parallel export
+"""
+
+import unittest
+import sys
+import os
+import io
+import re
+
+# Add current directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+
+import report_pages
+from pdf_merge import PdfMerger, merge_pdfs, read_objects
+
+try:
+    import pypdf
+    HAS_PYPDF = True
+except ImportError:
+    HAS_PYPDF = False
+
+
+def figure_pdf(text):
+    fig = plt.figure(figsize=(8.27, 11.69))
+    fig.text(0.5, 0.5, text)
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='pdf')
+    plt.close(fig)
+    return buffer.getvalue()
+
+
+class TestPdfMerge(unittest.TestCase):
+    """Test joining single-page PDFs"""
+
+    def check_xref(self, data):
+        objects, trailer = read_objects(data)
+        for num, raw in objects.items():
+            self.assertTrue(raw.startswith(b'%d 0 obj' % num), num)
+        return objects, trailer
+
+    def test_merge_pages(self):
+        """Pages keep their order and every xref offset points at its object"""
+        merged = merge_pdfs([figure_pdf('page one'), figure_pdf('page two'), figure_pdf('page three')],
+                            report_pages.PDF_INFO)
+        objects, trailer = self.check_xref(merged)
+        pages = [raw for raw in objects.values() if re.search(rb'/Type /Page\b', raw)]
+        self.assertEqual(len(pages), 3)
+        self.assertIn(b'/Count 3', objects[2])
+        trees = [raw for raw in objects.values() if b'/Type /Pages /Parent 2 0 R' in raw]
+        self.assertEqual(len(trees), 3)
+        self.assertIn(b'<FEFF', objects[3])
+
+    def test_outline(self):
+        """Outline entries point at the appended pages"""
+        buffer = io.BytesIO()
+        merger = PdfMerger(buffer, {'title': 'Calculation book'})
+        first = merger.append(figure_pdf('B1'))
+        second = merger.append(figure_pdf('B2'))
+        merger.add_outline('B1', first[0])
+        merger.add_outline('B2', second[0])
+        merger.close()
+        objects, trailer = self.check_xref(buffer.getvalue())
+        self.assertIn(b'/Outlines', objects[1])
+        self.assertTrue(any(b'/Title (B2)' in raw and b'/Dest [%d 0 R' % second[0] in raw
+                            for raw in objects.values()))
+
+    @unittest.skipUnless(HAS_PYPDF, "pypdf not available")
+    def test_report_pages_read_back(self):
+        """Merged report pages open in an independent PDF reader"""
+        from rc_recbeamcal_base import RecBeamSpec
+        from demo_improved_gui import beam_report_results
+        spec = RecBeamSpec(B=30, D=60, fc=280, fy=4200, bar1='#8(D25)', bar2='#6(D19)', tensilebar_num=4,
+                           compressionbar_num=2, stirrup_size='#3(D10)', stirrup_num=2, stirrup_span=15,
+                           Mux=30, Vuy=20)
+        results = beam_report_results(spec, 'เหล็กปลอกสองขา')
+        buffer = io.BytesIO()
+        merger = PdfMerger(buffer, report_pages.PDF_INFO)
+        first = merger.append(report_pages.render_page('create_pdf_page_1', results, dpi=72))
+        second = merger.append(report_pages.render_page('create_pdf_page_2', results, dpi=72), first=True)
+        merger.add_outline('page 1', first[0])
+        merger.add_outline('page 2', second[0])
+        merger.close()
+        reader = pypdf.PdfReader(io.BytesIO(buffer.getvalue()), strict=True)
+        self.assertEqual(len(reader.pages), 2)
+        self.assertEqual([(item.title, reader.get_destination_page_number(item)) for item in reader.outline],
+                         [('page 1', 1), ('page 2', 0)])
+        self.assertEqual(reader.metadata.title, report_pages.PDF_INFO['title'])
+
+
+class TestRenderPages(unittest.TestCase):
+    """Test the worker pool used by export_pdf"""
+
+    def tearDown(self):
+        report_pages.shutdown_executor()
+
+    def test_cancel(self):
+        """A progress callback can abandon the export"""
+        def cancel(done, total):
+            raise report_pages.RenderCancelled()
+        with self.assertRaises(report_pages.RenderCancelled):
+            report_pages.render_pages({}, progress=cancel)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unit Tests for Tracing
+Test coverage for the tracing module and the traced calculation functions
+"""
+
+import unittest
+import sys
+import os
+import io
+import json
+import tempfile
+import contextlib
+
+# Add current directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import tracing
+from beam_function import cal_effectived_beta, clear_section_cache
+from rc_recbeamcal_base import RecBeamSpec, check_recbeam
+
+
+def read_records(path):
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+
+class TestTracing(unittest.TestCase):
+    """Test the JSON-lines trace log"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'trace.jsonl')
+        self.spec = RecBeamSpec(B=30, D=60, fc=280, fy=4200, bar1='#8(D25)', bar2='#6(D19)',
+                                tensilebar_num=4, compressionbar_num=2, stirrup_size='#3(D10)',
+                                stirrup_num=2, stirrup_span=15, Mux=30, Vuy=20)
+
+    def tearDown(self):
+        tracing.disable()
+        self.tmpdir.cleanup()
+
+    def test_disabled_by_default(self):
+        """Without RC_TRACE nothing is recorded"""
+        self.assertFalse(tracing.is_enabled())
+        check_recbeam(self.spec)
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_call_timing(self):
+        """Traced functions write one timed record per call, nested calls deeper"""
+        tracing.enable(self.path)
+        self.assertEqual(os.environ[tracing.TRACE_ENV], os.path.abspath(self.path))
+        check_recbeam(self.spec)
+        tracing.disable()
+        self.assertNotIn(tracing.TRACE_ENV, os.environ)
+        records = read_records(self.path)
+        outer = [r for r in records if r['fn'] == 'check_recbeam']
+        self.assertEqual(len(outer), 1)
+        self.assertEqual(outer[0]['depth'], 0)
+        self.assertTrue(outer[0]['ok'])
+        self.assertGreaterEqual(outer[0]['ms'], 0)
+        self.assertNotIn('args', outer[0])
+        inner = [r for r in records if r['fn'] == 'cal_recbeam_Mn_status']
+        self.assertEqual(inner[0]['depth'], 1)
+
+    def test_value_capture(self):
+        """Captured runs record arguments, results and intermediate values"""
+        clear_section_cache()
+        tracing.enable(self.path, capture=True)
+        cal_effectived_beta(['single', 'double'], 60, 4, 2.54, 1.905, 280, 0.953, [4, 6], [4, 4])
+        tracing.disable()
+        records = read_records(self.path)
+        values = [r for r in records if r['kind'] == 'value' and r['fn'] == 'cal_effectived_beta']
+        self.assertEqual(values[0]['values']['row'], 2)
+        call = [r for r in records if r['kind'] == 'call'][0]
+        self.assertEqual(call['args'][7], [4, 6])
+        self.assertEqual(len(call['result']), 4)
+
+    def test_failed_call(self):
+        """A raising call is recorded and the exception propagates"""
+        @tracing.traced
+        def fail():
+            raise ValueError('bad input')
+        tracing.enable(self.path)
+        with self.assertRaises(ValueError):
+            fail()
+        tracing.disable()
+        [record] = read_records(self.path)
+        self.assertFalse(record['ok'])
+        self.assertEqual(record['error'], 'ValueError: bad input')
+
+    def test_report_exception(self):
+        """Caught exceptions keep their traceback only in the trace log"""
+        try:
+            raise RuntimeError('widget missing')
+        except RuntimeError as e:
+            with self.assertLogs('rc_design', level='WARNING'):
+                tracing.report_exception('handler', e)
+            tracing.enable(self.path)
+            stderr = io.StringIO()
+            with contextlib.redirect_stderr(stderr):
+                tracing.report_exception('handler', e)
+        tracing.disable()
+        self.assertEqual(stderr.getvalue(), '')
+        [record] = read_records(self.path)
+        self.assertEqual(record['kind'], 'error')
+        self.assertIn('RuntimeError: widget missing', record['traceback'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,168 @@
+"""
+Opt-in tracing of the calculation functions to a JSON-lines log.
+
+Tracing is off by default and then costs one flag test per call. Turn it
+on with the environment variable
+
+    RC_TRACE=trace.jsonl          (RC_TRACE=1 writes rc_trace.jsonl)
+    RC_TRACE_VALUES=1             also record arguments, results and values
+
+or from code with enable(path, capture=True) / disable(). enable() also
+sets the variables, so worker processes started afterwards trace into the
+same file. Each line is one JSON record:
+
+    {"ts": ..., "pid": ..., "kind": "call", "fn": "design_beam", "depth": 0,
+     "ms": 4.1, "ok": true, "args": [...], "result": ...}
+    {"kind": "value", "fn": "cal_effectived_beta", "values": {"row": 2, ...}}
+    {"kind": "error", "fn": "beam_dsgn_button_clicked", "error": "...", "traceback": "..."}
+
+Functions are traced with the @traced decorator, intermediate values with
+trace_value(), and caught exceptions with report_exception().
+"""
+import dataclasses
+import functools
+import json
+import logging
+import os
+import threading
+import time
+import traceback
+
+import numpy as np
+
+TRACE_ENV='RC_TRACE'
+TRACE_VALUES_ENV='RC_TRACE_VALUES'
+DEFAULT_TRACE_FILE='rc_trace.jsonl'
+#記錄陣列與序列時最多保留的元素數
+MAX_ITEMS=32
+
+logger=logging.getLogger('rc_design')
+
+
+class _TraceState:
+    def __init__(self):
+        self.enabled=False
+        self.capture=False
+        self.path=None
+        self.file=None
+        self.lock=threading.Lock()
+        self.local=threading.local()
+
+
+_state=_TraceState()
+
+
+def enable(path=None,capture=False):
+    """Start writing trace records to path (default rc_trace.jsonl)."""
+    disable()
+    _state.path=path or DEFAULT_TRACE_FILE
+    _state.file=open(_state.path,'a',encoding='utf-8',buffering=1)
+    _state.capture=bool(capture)
+    _state.enabled=True
+    os.environ[TRACE_ENV]=os.path.abspath(_state.path)
+    os.environ[TRACE_VALUES_ENV]='1' if capture else '0'
+
+
+def disable():
+    """Stop tracing and close the log."""
+    _state.enabled=False
+    if _state.file is not None :
+        with _state.lock :
+            _state.file.close()
+        _state.file=None
+    os.environ.pop(TRACE_ENV,None)
+    os.environ.pop(TRACE_VALUES_ENV,None)
+
+
+def is_enabled():
+    return _state.enabled
+
+
+def _summarize(value,depth=0):
+    #轉成可寫入 JSON 的簡短形式
+    if value is None or isinstance(value,(bool,int,float,str)) :
+        return value
+    if isinstance(value,np.generic) :
+        return value.item()
+    if isinstance(value,np.ndarray) :
+        if value.size<=MAX_ITEMS :
+            return value.tolist()
+        return {'array':list(value.shape),'dtype':str(value.dtype)}
+    if depth>=3 :
+        return repr(value)[:200]
+    if dataclasses.is_dataclass(value) and not isinstance(value,type) :
+        return {'type':type(value).__name__,
+                **{f.name:_summarize(getattr(value,f.name),depth+1) for f in dataclasses.fields(value)}}
+    if isinstance(value,dict) :
+        return {str(k):_summarize(v,depth+1) for k,v in list(value.items())[:MAX_ITEMS]}
+    if isinstance(value,(list,tuple)) :
+        return [_summarize(v,depth+1) for v in value[:MAX_ITEMS]]
+    return repr(value)[:200]
+
+
+def _write(record):
+    record['ts']=time.time()
+    record['pid']=os.getpid()
+    line=json.dumps(record,ensure_ascii=False,default=repr)
+    with _state.lock :
+        if _state.file is not None :
+            _state.file.write(line+'\n')
+
+
+def traced(func):
+    """Time each call of func into the trace log while tracing is enabled."""
+    name=func.__qualname__
+
+    @functools.wraps(func)
+    def wrapper(*args,**kwargs):
+        if not _state.enabled :
+            return func(*args,**kwargs)
+        depth=getattr(_state.local,'depth',0)
+        _state.local.depth=depth+1
+        record={'kind':'call','fn':name,'depth':depth}
+        start=time.perf_counter()
+        try :
+            result=func(*args,**kwargs)
+        except BaseException as e :
+            record.update(ms=(time.perf_counter()-start)*1000,ok=False,error=f'{type(e).__name__}: {e}')
+            raise
+        else :
+            record.update(ms=(time.perf_counter()-start)*1000,ok=True)
+            if _state.capture :
+                record['result']=_summarize(result)
+            return result
+        finally :
+            _state.local.depth=depth
+            if _state.capture :
+                record['args']=_summarize(args)
+                if kwargs :
+                    record['kwargs']=_summarize(kwargs)
+            _write(record)
+    return wrapper
+
+
+def trace_value(fn,**values):
+    """Record intermediate values of fn when value capture is on."""
+    if _state.enabled and _state.capture :
+        _write({'kind':'value','fn':fn,'values':_summarize(values)})
+
+
+def report_exception(fn,exc):
+    """Log an exception caught in fn.
+
+    The full traceback goes to the trace log when tracing is on; otherwise
+    a one-line warning is logged.
+    """
+    if _state.enabled :
+        _write({'kind':'error','fn':fn,'error':f'{type(exc).__name__}: {exc}',
+                'traceback':''.join(traceback.format_exception(type(exc),exc,exc.__traceback__))})
+    else :
+        logger.warning('Error in %s: %s',fn,exc)
+
+
+def _enable_from_environment():
+    path=os.environ.get(TRACE_ENV,'')
+    if path and path!='0' :
+        enable(DEFAULT_TRACE_FILE if path=='1' else path,capture=os.environ.get(TRACE_VALUES_ENV,'0')=='1')
+
+_enable_from_environment()
@@ -577,6 +577,13 @@ class Ui_RcRecBeamCalImproved(object):
         self.btn_calculate.setStyleSheet(self.btn_calculate.styleSheet() + "font-size: 16px; font-weight: bold;")
         layout.addWidget(self.btn_calculate)
         
+        # Live what-if mode - อัปเดตเฉพาะตัวเลขผลลัพธ์ขณะแก้ไขข้อมูล
+        self.chk_live = QtWidgets.QCheckBox("⚡ คำนวณสด (What-if)")
+        self.chk_live.setToolTip("คำนวณกำลังรับโมเมนต์และแรงเฉือนใหม่ทุกครั้งที่แก้ไขข้อมูล\n"
+                                 "แผนภาพและรายงานจะสร้างเมื่อกดปุ่มคำนวณ")
+        self.chk_live.setStyleSheet("QCheckBox { color: #2c3e50; font-size: 13px; padding: 4px 0px; }")
+        layout.addWidget(self.chk_live)
+        
         # สร้าง horizontal layout สำหรับปุ่มรอง
         row1_layout = QtWidgets.QHBoxLayout()
         row1_layout.setSpacing(8)
@@ -656,6 +663,22 @@ class Ui_RcRecBeamCalImproved(object):
         layout.setSpacing(20)
         layout.setContentsMargins(20, 20, 20, 20)
         
+        # Numeric summary updated by live mode
+        summary_layout = QtWidgets.QGridLayout()
+        summary_layout.setHorizontalSpacing(16)
+        self.live_labels = {}
+        live_items = [
+            ('phiMn', "ϕMn (ตัน-เมตร)"), ('moment_ratio', "Mu/ϕMn"), ('et', "εt"),
+            ('phiVn', "ϕVn (ตัน)"), ('shear_ratio', "Vu/ϕVn"), ('c', "c (ซม.)")
+        ]
+        for i, (key, title) in enumerate(live_items):
+            row, col = divmod(i, 3)
+            summary_layout.addWidget(ModernLabel(title), row, 2 * col)
+            self.live_labels[key] = ModernLabel("-")
+            self.live_labels[key].setStyleSheet(self.live_labels[key].styleSheet() + "QLabel { font-weight: bold; }")
+            summary_layout.addWidget(self.live_labels[key], row, 2 * col + 1)
+        layout.addLayout(summary_layout)
+        
         # Results text area with modern styling
         self.results_text = QtWidgets.QTextEdit()
         self.results_text.setStyleSheet("""